@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Asynchronous RHACS API Client
+
+asyncio counterpart of RHACSClient for workloads that issue many independent
+requests, e.g. one alerts query per chunk of policy IDs or one create per
+policy. All requests run on one event loop and an adaptive in-flight limit
+bounds how many are outstanding, so hundreds of round trips to a remote
+Central overlap instead of queueing. Like RHACSClient, 429/503 responses are
+retried with backoff and lower the limit until Central recovers.
+
+httpx is used as the transport when it is installed (``pip install httpx``).
+Without it, requests go through the pooled ``requests`` session of a regular
+RHACSClient on a bounded thread pool, so the async API works with the base
+requirements too.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from rhacs_client import (
+    RHACSClient, DEFAULT_TIMEOUT, DEFAULT_PAGE_SIZE, RETRY_METHODS,
+    POLICY_CREATED, POLICY_EXISTS, POLICY_FAILED, import_outcomes
+)
+from policy_deployer import (
+    DeploymentResult, DeploymentSummary, DEFAULT_MAX_WORKERS, DEFAULT_IMPORT_BATCH_SIZE, POLICY_SKIPPED,
+    schema_failures
+)
+from policy_hash import stamp_policy
+from rate_limiter import (
+    AdaptiveConcurrency, TokenBucket, backoff_delay,
+    THROTTLE_STATUS_CODES, DEFAULT_THROTTLE_RETRIES
+)
+
+try:
+    import httpx
+except ImportError:  # optional dependency
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# Requests in flight at once against Central
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+class AsyncRHACSClient:
+    """RHACS API client with coroutine methods and bounded request concurrency."""
+
+    def __init__(self, central_url: str, api_token: str, verify_ssl: bool = False,
+                 timeout=DEFAULT_TIMEOUT, page_size: int = DEFAULT_PAGE_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 rate_limit: Optional[float] = None,
+                 throttle_retries: int = DEFAULT_THROTTLE_RETRIES):
+        self.central_url = central_url.rstrip('/')
+        self.timeout = timeout
+        self.page_size = page_size
+        self.max_concurrency = max(1, max_concurrency)
+        self.throttle_retries = throttle_retries
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.concurrency = AdaptiveConcurrency(self.max_concurrency)
+
+        if httpx is not None:
+            self._http = httpx.AsyncClient(
+                base_url=self.central_url,
+                timeout=self._httpx_timeout(timeout),
+                transport=httpx.AsyncHTTPTransport(
+                    verify=verify_ssl,
+                    retries=3,
+                    limits=httpx.Limits(max_connections=self.max_concurrency,
+                                        max_keepalive_connections=self.max_concurrency)
+                ),
+                headers={
+                    'Authorization': f'Bearer {api_token}',
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json'
+                }
+            )
+            self._sync = None
+            self._executor = None
+        else:
+            self._http = None
+            self._sync = RHACSClient(central_url, api_token, verify_ssl=verify_ssl, timeout=timeout,
+                                     pool_size=self.max_concurrency, page_size=page_size)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+
+    @classmethod
+    def from_client(cls, client: RHACSClient, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> 'AsyncRHACSClient':
+        """Build an async client with the same Central, token and settings as ``client``."""
+        return cls(client.central_url, client.api_token, verify_ssl=client.verify_ssl,
+                   timeout=client.timeout, page_size=client.page_size,
+                   max_concurrency=max_concurrency, rate_limit=client.rate_limit,
+                   throttle_retries=client.throttle_retries)
+
+    @staticmethod
+    def _httpx_timeout(timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    async def aclose(self):
+        """Release connections and worker threads."""
+        if self._http is not None:
+            await self._http.aclose()
+        else:
+            self._executor.shutdown(wait=False)
+            self._sync.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def _send(self, method: str, endpoint: str, data: Dict = None,
+                    params: Dict = None, timeout=None):
+        """Send one request attempt within the rate and concurrency limits; returns (generation, response)."""
+        if self.bucket:
+            await self.bucket.acquire_async()
+        generation = await self.concurrency.acquire_async()
+        try:
+            if self._http is not None:
+                return generation, await self._http.request(
+                    method, endpoint, json=data, params=params,
+                    timeout=self._httpx_timeout(timeout) if timeout else httpx.USE_CLIENT_DEFAULT
+                )
+
+            loop = asyncio.get_running_loop()
+            return generation, await loop.run_in_executor(self._executor, lambda: self._sync.session.request(
+                method=method,
+                url=urljoin(self.central_url, endpoint),
+                json=data,
+                params=params,
+                timeout=timeout or self.timeout
+            ))
+        finally:
+            self.concurrency.release()
+
+    async def _request(self, method: str, endpoint: str, data: Dict = None,
+                       params: Dict = None, timeout=None):
+        """Send a request, retrying throttled responses; returns the last response unchecked."""
+        attempt = 0
+        while True:
+            generation, response = await self._send(method, endpoint, data, params, timeout)
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                self.concurrency.succeeded()
+                return response
+
+            if self.concurrency.throttled(generation):
+                logger.warning(f"RHACS Central is throttling requests, reducing concurrency to {self.concurrency.limit}")
+            retryable = response.status_code == 429 or method.upper() in RETRY_METHODS
+            if not retryable or attempt >= self.throttle_retries:
+                return response
+
+            await asyncio.sleep(backoff_delay(attempt, response.headers.get('Retry-After')))
+            attempt += 1
+
+    async def _make_request(self, method: str, endpoint: str, data: Dict = None,
+                            params: Dict = None, timeout=None):
+        """Send a request and raise on HTTP errors."""
+        response = await self._request(method, endpoint, data, params, timeout)
+        response.raise_for_status()
+        return response
+
+    async def paginate(self, endpoint: str, key: str, params: Dict = None,
+                       page_size: int = None) -> List[Dict[str, Any]]:
+        """
+        Fetch every record from a list endpoint.
+
+        Pages of one listing are fetched in order (the total is not known up
+        front); run several listings with ``asyncio.gather`` to overlap them.
+        Request errors are raised rather than silently truncating the results.
+        """
+        page_size = page_size or self.page_size
+        offset = 0
+        records = []
+        while True:
+            page_params = dict(params or {})
+            page_params['pagination.limit'] = page_size
+            page_params['pagination.offset'] = offset
+            response = await self._make_request('GET', endpoint, params=page_params)
+            page = response.json().get(key, [])
+            # An endpoint ignoring the offset returns the previous page again
+            if offset and page and page[0] == records[offset - page_size]:
+                logger.warning(f"{endpoint} ignored pagination.offset; stopping after {offset} records")
+                return records
+            records.extend(page)
+
+            # A short page is the last one; an oversized page means the
+            # endpoint ignored pagination and already returned everything.
+            if len(page) != page_size:
+                return records
+            offset += page_size
+
+    async def list_deployments(self, query: str = None) -> List[Dict[str, Any]]:
+        """Fetch deployments, optionally filtered by a search query."""
+        return await self.paginate('/v1/deployments', 'deployments', {'query': query} if query else None)
+
+    async def list_alerts(self, query: str = None) -> List[Dict[str, Any]]:
+        """Fetch alerts, optionally filtered by a search query."""
+        return await self.paginate('/v1/alerts', 'alerts', {'query': query} if query else None)
+
+    async def list_policies(self, query: str = None) -> List[Dict[str, Any]]:
+        """Fetch policies, optionally filtered by a search query."""
+        return await self.paginate('/v1/policies', 'policies', {'query': query} if query else None)
+
+    async def export_policies(self, policy_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch full policy definitions for many policies in one request."""
+        if not policy_ids:
+            return []
+        response = await self._make_request('POST', '/v1/policies/export', {'policyIds': list(policy_ids)})
+        return response.json().get('policies', [])
+
+    async def test_connection(self) -> bool:
+        """Test connection to RHACS Central."""
+        try:
+            response = await self._make_request('GET', '/v1/metadata')
+            metadata = response.json()
+            logger.info(f"Successfully connected to RHACS Central (version: {metadata.get('version', 'unknown')})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to RHACS Central: {e}")
+            return False
+
+    async def submit_policy(self, policy: Dict[str, Any], timeout=None) -> Tuple[str, str]:
+        """Create a security policy; returns the same (status, detail) as RHACSClient.submit_policy."""
+        try:
+            response = await self._request('POST', '/v1/policies', policy, timeout=timeout)
+        except Exception as e:
+            logger.error(f"Failed to create policy {policy['name']}: {e}")
+            return POLICY_FAILED, str(e)
+
+        if response.status_code == 200:
+            policy_id = response.json().get('id', 'unknown')
+            logger.info(f"Successfully created policy: {policy['name']} (ID: {policy_id})")
+            return POLICY_CREATED, policy_id
+        if response.status_code == 409 or 'already exists' in response.text:
+            logger.warning(f"Policy '{policy['name']}' already exists in RHACS")
+            return POLICY_EXISTS, 'Policy already exists'
+
+        logger.error(f"Failed to create policy {policy['name']}. Status: {response.status_code}, Response: {response.text[:500]}")
+        return POLICY_FAILED, f"Error: {response.status_code} - {response.text}"
+
+    async def import_policies(self, policies: List[Dict[str, Any]], timeout=None) -> List[Tuple[str, str]]:
+        """Create many policies with one /v1/policies/import request; see RHACSClient.import_policies."""
+        response = await self._make_request('POST', '/v1/policies/import',
+                                            {'policies': policies, 'metadata': {'overwrite': False}},
+                                            timeout=timeout)
+        return import_outcomes(policies, response.json())
+
+    async def update_policy(self, policy_id: str, policy: Dict[str, Any], timeout=None) -> bool:
+        """Replace an existing policy's definition."""
+        try:
+            await self._make_request('PUT', f'/v1/policies/{policy_id}', dict(policy, id=policy_id), timeout=timeout)
+            logger.info(f"Successfully updated policy: {policy['name']} (ID: {policy_id})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update policy {policy['name']}: {e}")
+            return False
+
+    async def delete_policy(self, policy_id: str) -> bool:
+        """Delete a single policy by its ID."""
+        try:
+            await self._make_request('DELETE', f'/v1/policies/{policy_id}')
+            logger.info(f"Successfully deleted policy with ID: {policy_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete policy {policy_id}: {e}")
+            return False
+
+
+async def deploy_policies_async(client: AsyncRHACSClient, policies: List[Dict[str, Any]],
+                                existing_names: Optional[Iterable[str]] = None,
+                                skip_existing: bool = True,
+                                timeout=None, validate: bool = True,
+                                batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+                                allow_unknown_fields: bool = False) -> DeploymentSummary:
+    """
+    Async counterpart of policy_deployer.deploy_policies.
+
+    Every create is scheduled at once and the client's semaphore bounds how
+    many are in flight. With ``batch_size`` > 0 policies are first sent
+    through /v1/policies/import in concurrent batches, and only entries a
+    batch fails to create are retried with single creates. Results keep the
+    order of ``policies``.
+    """
+    existing_names = set(existing_names or ())
+    pending = [index for index, policy in enumerate(policies)
+               if not (skip_existing and policy['name'] in existing_names)]
+    failures = {}
+    if pending and validate:
+        failures = {pending[position]: result
+                    for position, result in schema_failures([policies[index] for index in pending],
+                                                                   allow_unknown_fields).items()}
+
+    imported = {}
+    sendable = [index for index in pending if index not in failures]
+    if sendable and batch_size > 0:
+        imported = await _import_batches(client, policies, sendable, batch_size, timeout)
+
+    async def _deploy(index: int, policy: Dict[str, Any]) -> DeploymentResult:
+        if skip_existing and policy['name'] in existing_names:
+            logger.info(f"Policy '{policy['name']}' already exists, skipping")
+            return DeploymentResult(policy['name'], POLICY_SKIPPED, 'Policy already exists')
+        if index in failures:
+            return failures[index]
+        if index in imported:
+            return imported[index]
+        status, detail = await client.submit_policy(stamp_policy(policy), timeout=timeout)
+        return DeploymentResult(policy['name'], status, detail)
+
+    remaining = len(sendable) - len(imported)
+    if remaining:
+        logger.info(f"Deploying {remaining} policies with up to {client.max_concurrency} concurrent requests")
+    return DeploymentSummary(list(await asyncio.gather(*(_deploy(index, policy) for index, policy in enumerate(policies)))))
+
+
+async def _import_batches(client: AsyncRHACSClient, policies: List[Dict[str, Any]], pending: List[int],
+                          batch_size: int, timeout) -> Dict[int, DeploymentResult]:
+    """
+    Create ``pending`` policies through concurrent bulk imports.
+
+    Returns the results by index of the entries the imports settled; the
+    rest (failed entries, or every entry of a failed batch) need a single create.
+    """
+    batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+    logger.info(f"Importing {len(pending)} policies in {len(batches)} batches with up to {client.max_concurrency} concurrent requests")
+
+    async def _import(batch: List[int]):
+        try:
+            return await client.import_policies([stamp_policy(policies[index]) for index in batch], timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Bulk import of {len(batch)} policies failed, falling back to single creates: {e}")
+            return None
+
+    results = {}
+    for batch, outcomes in zip(batches, await asyncio.gather(*(_import(batch) for batch in batches))):
+        for index, (status, detail) in zip(batch, outcomes or ()):
+            name = policies[index]['name']
+            if status == POLICY_FAILED:
+                logger.warning(f"Import of policy '{name}' failed ({detail}), retrying with a single create")
+                continue
+            if status == POLICY_CREATED:
+                logger.info(f"Successfully imported policy: {name} (ID: {detail})")
+            else:
+                logger.warning(f"Policy '{name}' already exists in RHACS")
+            results[index] = DeploymentResult(name, status, detail)
+    return results
+
+
+def deploy_policies_concurrently(client: RHACSClient, policies: List[Dict[str, Any]],
+                                 existing_names: Optional[Iterable[str]] = None,
+                                 skip_existing: bool = True,
+                                 max_concurrency: int = DEFAULT_MAX_WORKERS,
+                                 timeout=None, validate: bool = True,
+                                 batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+                                 allow_unknown_fields: bool = False) -> DeploymentSummary:
+    """Run deploy_policies_async on a fresh event loop with ``client``'s connection settings."""
+    async def _run():
+        async with AsyncRHACSClient.from_client(client, max_concurrency) as async_client:
+            return await deploy_policies_async(async_client, policies, existing_names, skip_existing,
+                                               timeout, validate, batch_size, allow_unknown_fields)
+    return asyncio.run(_run())
@@ -1,78 +1,159 @@
+import argparse
 import os
+import sys
+import hashlib
 import json
+import re
 import logging
 import requests
-import schedule
 import time
-from typing import Dict, Any, List
-
-# --- RHACS Client (from existing script) ---
-class RHACSClient:
-    def __init__(self, central_url: str, api_token: str):
-        self.central_url = central_url.rstrip('/')
-        self.api_token = api_token
-        self.headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json"
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        self.session.verify = False  # Consider using proper certificate validation in production
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
 
-    def get_existing_policies(self) -> List[str]:
-        """Fetches the names of all existing policies in RHACS."""
-        url = f"{self.central_url}/v1/policies"
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return [policy['name'] for policy in response.json().get('policies', [])]
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Failed to get existing policies: {e}")
-            return []
+from rhacs_client import RHACSClient
+from policy_hash import policy_cves
+from job_scheduler import JobScheduler, CronSchedule, IntervalSchedule, DEFAULT_SHUTDOWN_GRACE
 
-    def create_policy(self, policy: Dict[str, Any]) -> bool:
-        """Creates a single policy in RHACS."""
-        url = f"{self.central_url}/v1/policies"
-        try:
-            response = self.session.post(url, json=policy)
-            if response.status_code == 200:
-                logging.info(f"Successfully created policy: {policy.get('name')}")
-                return True
-            elif response.status_code == 409 or "already exists" in response.text:
-                 logging.warning(f"Policy '{policy.get('name')}' already exists in RHACS.")
-                 return False
-            else:
-                logging.error(f"Failed to create policy '{policy.get('name')}'. Status: {response.status_code}, Response: {response.text}")
-                response.raise_for_status()
-                return False
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Exception while creating policy '{policy.get('name')}': {e}")
-            return False
+# Minutes between runs when no cron expression is configured
+DEFAULT_KEV_INTERVAL_MINUTES = 24 * 60
+
+# Local copy of the KEV feed and its ETag/Last-Modified validators
+DEFAULT_KEV_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'rhacs-kev')
+
+# Outcomes of a conditional KEV feed fetch
+FETCH_MODIFIED = 'modified'
+FETCH_NOT_MODIFIED = 'not_modified'
+FETCH_FAILED = 'failed'
 
 # --- CISA KEV Client ---
 class CisaKevClient:
-    def __init__(self):
+    def __init__(self, cache_dir: str = DEFAULT_KEV_CACHE_DIR):
         self.url = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
         self.session = requests.Session()
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.catalog_file = os.path.join(self.cache_dir, 'known_exploited_vulnerabilities.json')
+        self.meta_file = os.path.join(self.cache_dir, 'known_exploited_vulnerabilities.meta.json')
+        self._pending = None
+
+    def _load_meta(self) -> Dict[str, Any]:
+        """Validators of the locally stored feed, or {} if there is no usable copy."""
+        if not os.path.exists(self.catalog_file):
+            return {}
+        try:
+            with open(self.meta_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load_cached_catalog(self) -> Optional[Dict[str, Any]]:
+        """The last feed stored with save_catalog(), or None."""
+        try:
+            with open(self.catalog_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def fetch_catalog(self, conditional: bool = True) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Conditionally fetches the KEV catalog.
+
+        Returns (outcome, catalog): (FETCH_MODIFIED, catalog) for a new feed,
+        (FETCH_NOT_MODIFIED, None) on 304 Not Modified without parsing
+        anything, and (FETCH_FAILED, None) after logging a download or decode
+        error. A changed feed is only stored locally once the caller has
+        processed it and calls save_catalog().
+        """
+        meta = self._load_meta() if conditional else {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
 
-    def get_known_exploited_vulnerabilities(self) -> List[Dict[str, Any]]:
-        """Fetches the CISA Known Exploited Vulnerabilities (KEV) catalog."""
         logging.info("Fetching vulnerabilities from the CISA KEV catalog.")
         try:
-            response = self.session.get(self.url)
+            response = self.session.get(self.url, headers=headers, timeout=60)
+            if response.status_code == 304:
+                logging.info(f"CISA KEV catalog not modified since {meta.get('last_modified') or meta.get('fetched')}.")
+                return FETCH_NOT_MODIFIED, None
             response.raise_for_status()
             data = response.json()
-            logging.info(f"Found {data.get('count', 0)} total vulnerabilities in the CISA KEV catalog.")
-            return data.get('vulnerabilities', [])
         except requests.exceptions.RequestException as e:
             logging.error(f"Failed to fetch vulnerabilities from CISA KEV catalog: {e}")
-            return []
+            return FETCH_FAILED, None
         except json.JSONDecodeError as e:
             logging.error(f"Failed to decode JSON from CISA KEV response: {e}")
-            return []
+            return FETCH_FAILED, None
+
+        self._pending = {
+            'body': response.content,
+            'meta': {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'fetched': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'catalogVersion': data.get('catalogVersion')
+            }
+        }
+        logging.info(f"Found {data.get('count', 0)} total vulnerabilities in the CISA KEV catalog.")
+        return FETCH_MODIFIED, data
+
+    def save_catalog(self):
+        """Stores the last fetched feed and its validators for the next conditional request."""
+        if not self._pending:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for path, content in ((self.catalog_file, self._pending['body']),
+                                  (self.meta_file, json.dumps(self._pending['meta']).encode('utf-8'))):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(content)
+                os.replace(tmp_path, path)
+            self._pending = None
+        except OSError as e:
+            logging.warning(f"Could not store the CISA KEV catalog in {self.cache_dir}: {e}")
+
+    def get_known_exploited_vulnerabilities(self) -> List[Dict[str, Any]]:
+        """Fetches the CISA Known Exploited Vulnerabilities (KEV) catalog."""
+        outcome, data = self.fetch_catalog()
+        if outcome == FETCH_NOT_MODIFIED:
+            data = self.load_cached_catalog() if self._load_meta() else None
+        return (data or {}).get('vulnerabilities', [])
 
 # --- Policy Transformer ---
+# How KEV entries map to policies: one policy per CVE, one per vendor/product,
+# or fixed-size buckets of CVEs
+CONSOLIDATE_NONE = 'none'
+CONSOLIDATE_VENDOR_PRODUCT = 'vendor_product'
+CONSOLIDATE_BUCKET = 'bucket'
+CONSOLIDATE_MODES = (CONSOLIDATE_NONE, CONSOLIDATE_VENDOR_PRODUCT, CONSOLIDATE_BUCKET)
+
+# CVEs per policy in bucket mode
+DEFAULT_KEV_BUCKET_SIZE = 50
+
+KEV_GROUP_PREFIX = "CISA KEV Group: "
+KEV_BUCKET_PREFIX = "CISA KEV Bucket "
+_BUCKET_NAME = re.compile(r'^CISA KEV Bucket (\d+)$')
+
+KEV_CATALOG_URL = "https://www.cisa.gov/known-exploited-vulnerabilities-catalog"
+
 class PolicyTransformer:
+    @staticmethod
+    def _cve_sections(cve_ids: List[str]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "sectionName": "Vulnerabilities",
+                "policyGroups": [
+                    {
+                        "fieldName": "CVE",
+                        "booleanOperator": "OR",
+                        "negate": False,
+                        "values": [{"value": cve_id} for cve_id in cve_ids]
+                    }
+                ]
+            }
+        ]
+
     def from_kev_to_rhacs(self, vulnerability: Dict[str, Any]) -> Dict[str, Any]:
         """Transforms a CISA KEV entry into a RHACS policy format."""
         cve_id = vulnerability.get("cveID")
@@ -88,25 +169,120 @@ class PolicyTransformer:
             "severity": "CRITICAL_SEVERITY",
             "lifecycleStages": ["DEPLOY"],
             "categories": ["Vulnerability Management", "Threat Intelligence"],
-            "policySections": [
-                {
-                    "sectionName": "Vulnerabilities",
-                    "policyGroups": [
-                        {
-                            "fieldName": "CVE",
-                            "booleanOperator": "OR",
-                            "negate": False,
-                            "values": [{"value": cve_id}]
-                        }
-                    ]
-                }
-            ],
+            "policySections": self._cve_sections([cve_id]),
             "exclusions": [],
             "enforcementActions": ["FAIL_DEPLOYMENT"],
             "notifiers": []
         }
         return policy
 
+    def from_kev_group_to_rhacs(self, name: str, cve_ids: List[str], scope: str = "") -> Dict[str, Any]:
+        """Transforms a group of CISA KEV CVEs into one RHACS policy matching any of them."""
+        cve_ids = sorted(set(cve_ids))
+        scope = f" in {scope}" if scope else ""
+        return {
+            "name": name,
+            "description": f"Consolidated policy for {len(cve_ids)} known exploited vulnerabilities{scope} listed in the CISA KEV catalog.",
+            "rationale": "These vulnerabilities are listed by CISA as actively exploited in the wild. Remediation is strongly advised.",
+            "remediation": f"Apply the required action listed for each CVE in the CISA KEV catalog: {KEV_CATALOG_URL}",
+            "severity": "CRITICAL_SEVERITY",
+            "lifecycleStages": ["DEPLOY"],
+            "categories": ["Vulnerability Management", "Threat Intelligence"],
+            "policySections": self._cve_sections(cve_ids),
+            "exclusions": [],
+            "enforcementActions": ["FAIL_DEPLOYMENT"],
+            "notifiers": []
+        }
+
+def group_vulnerabilities(vulnerabilities: List[Dict[str, Any]], mode: str, bucket_size: int,
+                          grouped: Dict[str, List[str]]) -> Dict[str, Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Assigns KEV entries to consolidated policies.
+
+    Returns {policy name: (scope, entries)}. ``grouped`` holds the CVEs of
+    the existing consolidated policies by name; in bucket mode, CVEs already
+    in a bucket stay there, the last bucket is filled up first and further
+    buckets are numbered after it.
+    """
+    groups = {}
+    if mode == CONSOLIDATE_VENDOR_PRODUCT:
+        for vuln in vulnerabilities:
+            vendor, product = vuln.get('vendorProject') or 'Unknown', vuln.get('product') or 'Unknown'
+            scope = product if product.lower().startswith(vendor.lower()) else f"{vendor} {product}"
+            groups.setdefault(f"{KEV_GROUP_PREFIX}{scope}", (scope, []))[1].append(vuln)
+        return groups
+
+    bucketed = {cve_id for cve_ids in grouped.values() for cve_id in cve_ids}
+    numbers = sorted(int(_BUCKET_NAME.match(name).group(1)) for name in grouped if _BUCKET_NAME.match(name))
+    number = numbers[-1] if numbers else 1
+    room = bucket_size - len(grouped.get(f"{KEV_BUCKET_PREFIX}{number:03d}", []))
+    for vuln in vulnerabilities:
+        if vuln.get('cveID') in bucketed:
+            continue
+        if room <= 0:
+            number += 1
+            room = bucket_size
+        groups.setdefault(f"{KEV_BUCKET_PREFIX}{number:03d}", ("", []))[1].append(vuln)
+        bucketed.add(vuln.get('cveID'))
+        room -= 1
+    return groups
+
+def deploy_consolidated_policies(rhacs_client: RHACSClient, transformer: PolicyTransformer,
+                                 vulnerabilities: List[Dict[str, Any]], existing_policies: List[Dict[str, Any]],
+                                 mode: str, bucket_size: int = DEFAULT_KEV_BUCKET_SIZE) -> Tuple[int, int, List[Dict[str, Any]]]:
+    """
+    Adds KEV entries to consolidated policies.
+
+    The existing group policies involved are exported in one request; a
+    group is only written when it gains CVEs, with a PUT that keeps any
+    exclusions, notifiers or enforcement changes made in Central. Returns
+    (created, updated, failed entries).
+    """
+    vulnerabilities = [vuln for vuln in vulnerabilities if vuln.get('cveID')]
+    prefix = KEV_BUCKET_PREFIX if mode == CONSOLIDATE_BUCKET else KEV_GROUP_PREFIX
+    existing_ids = {policy['name']: policy['id'] for policy in existing_policies
+                    if policy.get('name', '').startswith(prefix) and policy.get('id')}
+
+    if mode == CONSOLIDATE_VENDOR_PRODUCT:
+        wanted = group_vulnerabilities(vulnerabilities, mode, bucket_size, {})
+        export_ids = [existing_ids[name] for name in wanted if name in existing_ids]
+    else:
+        export_ids = list(existing_ids.values())
+    try:
+        current = {policy['name']: policy for policy in rhacs_client.export_policies(export_ids)}
+    except Exception as e:
+        logging.error(f"Failed to fetch existing consolidated KEV policies: {e}")
+        return 0, 0, vulnerabilities
+
+    groups = group_vulnerabilities(vulnerabilities, mode, bucket_size,
+                                   {name: policy_cves(policy) for name, policy in current.items()})
+
+    created_count = updated_count = 0
+    failed = []
+    for name, (scope, members) in groups.items():
+        existing = current.get(name)
+        known = set(policy_cves(existing)) if existing else set()
+        new_cves = {vuln['cveID'] for vuln in members} - known
+        if not new_cves:
+            logging.info(f"Policy '{name}' already covers its {len(members)} CVEs.")
+            continue
+
+        policy = transformer.from_kev_group_to_rhacs(name, known | new_cves, scope)
+        if existing:
+            body = dict(existing, **{field: policy[field] for field in ('description', 'rationale', 'remediation', 'policySections')})
+            if rhacs_client.update_policy(existing['id'], body):
+                logging.info(f"Added {len(new_cves)} CVEs to policy '{name}'.")
+                updated_count += 1
+                continue
+        elif name in existing_ids:
+            logging.error(f"Policy '{name}' exists but could not be exported; not updating it.")
+        elif rhacs_client.create_policy(policy):
+            created_count += 1
+            continue
+        failed.extend(members)
+
+    return created_count, updated_count, failed
+
 # --- Main Application Logic ---
 def load_configuration(config_file: str = "config.json") -> Dict[str, Any]:
     """Loads configuration from a JSON file."""
@@ -125,35 +301,176 @@ def load_configuration(config_file: str = "config.json") -> Dict[str, Any]:
     
     return config
 
-def filter_vulnerabilities(vulnerabilities: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+# Keywords marking a KEV entry as relevant to containerized environments.
+# Keywords match whole words; a trailing '*' also matches longer words
+# ('container*' matches 'containers' and 'containerized').
+CONTAINER_KEYWORDS = [
+    "kubernetes", "openshift", "container*", "docker", "crio", "cri-o", "containerd",
+    "runc", "etcd", "flannel", "calico", "istio", "envoy", "helm", "tiller",
+    "kubelet", "api server", "scheduler", "controller manager"
+]
+
+# KEV fields searched for keywords; each field is matched on its own
+KEV_MATCH_FIELDS = ["vulnerabilityName", "shortDescription", "requiredAction"]
+
+_WORD = re.compile(r'\w+')
+
+class KeywordMatcher:
+    """
+    Multi-keyword matcher built once from the keyword list.
+
+    Keywords are split into words and stored in a trie keyed by word, so a
+    field is scanned word by word and each position only follows the trie
+    as far as a keyword continues. Cost grows with the text length, not with
+    the number of keywords, and matches never start or end inside a word.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(dict.fromkeys(keyword.strip().lower() for keyword in keywords if keyword.strip()))
+        # node: {'next': {word: node}, 'match': keyword or None, 'prefixes': [(prefix, keyword)]}
+        self._root = self._node()
+        for keyword in self.keywords:
+            words = _WORD.findall(keyword.rstrip('*'))
+            if not words:
+                continue
+            node = self._root
+            for word in words[:-1]:
+                node = node['next'].setdefault(word, self._node())
+            if keyword.endswith('*'):
+                node['prefixes'].append((words[-1], keyword))
+            else:
+                node = node['next'].setdefault(words[-1], self._node())
+                node['match'] = keyword
+
+    @staticmethod
+    def _node() -> Dict[str, Any]:
+        return {'next': {}, 'match': None, 'prefixes': []}
+
+    def find(self, text: str) -> List[str]:
+        """Keywords found in ``text``."""
+        words = _WORD.findall((text or '').lower())
+        root_next = self._root['next']
+        root_prefixes = self._root['prefixes']
+        found = []
+        for start, word in enumerate(words):
+            if root_prefixes:
+                found.extend(keyword for prefix, keyword in root_prefixes if word.startswith(prefix))
+            node = root_next.get(word)
+            position = start + 1
+            while node is not None:
+                if node['match']:
+                    found.append(node['match'])
+                if position == len(words):
+                    break
+                word = words[position]
+                found.extend(keyword for prefix, keyword in node['prefixes'] if word.startswith(prefix))
+                node = node['next'].get(word)
+                position += 1
+        return found
+
+def filter_vulnerabilities(vulnerabilities: List[Dict[str, Any]],
+                           matcher: Optional[KeywordMatcher] = None,
+                           fields: List[str] = KEV_MATCH_FIELDS) -> List[Dict[str, Any]]:
     """Filters vulnerabilities based on keywords relevant to containerized environments."""
-    keywords = [
-        "kubernetes", "openshift", "container", "docker", "crio", "containerd",
-        "runc", "etcd", "flannel", "calico", "istio", "envoy", "helm", "tiller",
-        "kubelet", "api server", "scheduler", "controller manager"
-    ]
-    
+    matcher = matcher or KeywordMatcher(CONTAINER_KEYWORDS)
+    keyword_counts = Counter()
+
     filtered_vulns = []
     for vuln in vulnerabilities:
-        search_text = (
-            vuln.get("vulnerabilityName", "") + 
-            vuln.get("shortDescription", "") + 
-            vuln.get("requiredAction", "")
-        ).lower()
+        matched = set()
+        for field in fields:
+            matched.update(matcher.find(vuln.get(field, "")))
         
-        if any(keyword in search_text for keyword in keywords):
+        if matched:
             filtered_vulns.append(vuln)
+            keyword_counts.update(matched)
             
     logging.info(f"Filtered down to {len(filtered_vulns)} vulnerabilities relevant to container technologies.")
+    if keyword_counts:
+        logging.info("Keyword matches: " + ", ".join(f"{keyword}={count}" for keyword, count in keyword_counts.most_common()))
     return filtered_vulns
 
+# --- Incremental Processing State ---
+class KevProcessingState:
+    """
+    Persistent record of the KEV entries already handled.
+
+    Every entry that was filtered out or turned into a policy is remembered
+    by cveID, so each run only filters and transforms entries added since
+    the last run. The state is reset when the filter keywords change, since
+    previously skipped entries might match the new keywords. ``pending_failures``
+    is set while entries from the stored feed still wait for a retry.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self.catalog_version = None
+        self.last_date_added = None
+        self.filter_signature = None
+        self.processed = set()
+        self.pending_failures = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable KEV state file {self.path}: {e}")
+            return
+        self.catalog_version = state.get('catalogVersion')
+        self.last_date_added = state.get('lastDateAdded')
+        self.filter_signature = state.get('filterSignature')
+        self.processed = set(state.get('processedCves', []))
+        self.pending_failures = bool(state.get('pendingFailures', False))
+
+    def pending(self, vulnerabilities: List[Dict[str, Any]], filter_signature: str) -> List[Dict[str, Any]]:
+        """The entries not processed yet under the given filter."""
+        if filter_signature != self.filter_signature:
+            if self.processed:
+                logging.info("KEV filter keywords changed; reprocessing the full catalog.")
+            self.processed = set()
+            self.filter_signature = filter_signature
+        return [vuln for vuln in vulnerabilities if vuln.get('cveID') not in self.processed]
+
+    def mark_processed(self, vulnerabilities: List[Dict[str, Any]], catalog: Dict[str, Any]):
+        for vuln in vulnerabilities:
+            if vuln.get('cveID'):
+                self.processed.add(vuln['cveID'])
+            if vuln.get('dateAdded') and (self.last_date_added or '') < vuln['dateAdded']:
+                self.last_date_added = vuln['dateAdded']
+        self.catalog_version = catalog.get('catalogVersion', self.catalog_version)
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'catalogVersion': self.catalog_version,
+                    'lastDateAdded': self.last_date_added,
+                    'filterSignature': self.filter_signature,
+                    'pendingFailures': self.pending_failures,
+                    'processedCves': sorted(self.processed)
+                }, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logging.warning(f"Could not save KEV state to {self.path}: {e}")
+
+def keywords_signature(keywords: List[str], fields: List[str], consolidate: str = CONSOLIDATE_NONE) -> str:
+    # Switching the consolidation mode reprocesses the catalog so every CVE lands in its new group
+    signature = [sorted(keywords), fields] + ([consolidate] if consolidate != CONSOLIDATE_NONE else [])
+    return hashlib.sha256(json.dumps(signature).encode('utf-8')).hexdigest()
+
 def run_policy_creation_job():
-    """The main job to be scheduled."""
-    logging.info("Running the daily CISA KEV policy creation job...")
+    """The main job to be scheduled. Returns False when the run failed."""
+    logging.info("Running the CISA KEV policy creation job...")
     try:
         config = load_configuration()
     except FileNotFoundError:
-        return
+        return False
 
     rhacs_config = config.get('rhacs', {})
     central_url = rhacs_config.get('central_url')
@@ -161,57 +478,150 @@ def run_policy_creation_job():
 
     if not all([central_url, api_token]):
         logging.critical("Missing required configuration for RHACS. Skipping job.")
-        return
+        return False
 
-    rhacs_client = RHACSClient(central_url, api_token)
-    kev_client = CisaKevClient()
-    transformer = PolicyTransformer()
-    
-    existing_policy_names = rhacs_client.get_existing_policies()
-    
-    vulnerabilities = kev_client.get_known_exploited_vulnerabilities()
+    kev_config = config.get('cisa_kev', {})
+    consolidate = kev_config.get('consolidate', CONSOLIDATE_NONE)
+    bucket_size = int(kev_config.get('bucket_size', DEFAULT_KEV_BUCKET_SIZE))
+    if consolidate not in CONSOLIDATE_MODES or bucket_size < 1:
+        logging.critical(f"Invalid cisa_kev.consolidate '{consolidate}' or bucket_size {bucket_size}; "
+                         f"consolidate must be one of {', '.join(CONSOLIDATE_MODES)}. Skipping job.")
+        return False
+
+    cache_dir = kev_config.get('cache_dir', DEFAULT_KEV_CACHE_DIR)
+    kev_client = CisaKevClient(cache_dir)
+    matcher = KeywordMatcher(kev_config.get('keywords', CONTAINER_KEYWORDS) + kev_config.get('extra_keywords', []))
+    fields = kev_config.get('match_fields', KEV_MATCH_FIELDS)
+    signature = keywords_signature(matcher.keywords, fields, consolidate)
+    state = KevProcessingState(kev_config.get('state_file', os.path.join(cache_dir, 'kev_state.json')))
+
+    # An unchanged feed means there is nothing new to create and RHACS is not
+    # contacted, unless the keywords or consolidation mode changed since the
+    # last run or entries of the stored feed failed: then the stored feed is
+    # reprocessed
+    outcome, catalog = kev_client.fetch_catalog()
+    if outcome == FETCH_NOT_MODIFIED:
+        if signature == state.filter_signature and not state.pending_failures:
+            logging.info("No CISA KEV catalog changes to process. Job finished.")
+            return True
+        if signature != state.filter_signature:
+            logging.info("CISA KEV filter settings changed; reprocessing the stored catalog.")
+        else:
+            logging.info("Retrying KEV entries that failed in an earlier run; reprocessing the stored catalog.")
+        catalog = kev_client.load_cached_catalog()
+        if catalog is None:
+            outcome, catalog = kev_client.fetch_catalog(conditional=False)
+    if outcome == FETCH_FAILED:
+        logging.error("Could not download the CISA KEV catalog. Job failed.")
+        return False
+
+    vulnerabilities = catalog.get('vulnerabilities', [])
     
     if not vulnerabilities:
         logging.info("No vulnerabilities found from CISA KEV catalog. Job finished.")
-        return
+        kev_client.save_catalog()
+        return True
 
-    filtered_vulnerabilities = filter_vulnerabilities(vulnerabilities)
+    # Only entries added since the last run are filtered and transformed
+    new_vulnerabilities = state.pending(vulnerabilities, signature)
+    logging.info(f"{len(new_vulnerabilities)} of {len(vulnerabilities)} KEV entries are new since the last run "
+                 f"(last processed: catalog {state.catalog_version or 'none'}, dateAdded {state.last_date_added or 'none'}).")
+
+    filtered_vulnerabilities = filter_vulnerabilities(new_vulnerabilities, matcher, fields)
 
     if not filtered_vulnerabilities:
-        logging.info("No relevant container-focused vulnerabilities found in the CISA KEV catalog at this time. Job finished.")
-        return
+        logging.info("No new container-focused vulnerabilities in the CISA KEV catalog at this time. Job finished.")
+        state.mark_processed(new_vulnerabilities, catalog)
+        state.pending_failures = False
+        state.save()
+        kev_client.save_catalog()
+        return True
 
-    created_count = 0
-    for vuln in filtered_vulnerabilities:
-        rhacs_policy = transformer.from_kev_to_rhacs(vuln)
-        
-        if not rhacs_policy:
-            continue
+    rhacs_client = RHACSClient(central_url, api_token, rate_limit=rhacs_config.get('rate_limit'))
+    transformer = PolicyTransformer()
+    
+    existing_policies = rhacs_client.get_existing_policies()
+    existing_policy_names = {policy.get('name', '') for policy in existing_policies}
 
-        if rhacs_policy['name'] in existing_policy_names:
-            logging.info(f"Skipping policy '{rhacs_policy['name']}' as it already exists.")
-            continue
-            
-        if rhacs_client.create_policy(rhacs_policy):
-            created_count += 1
+    created_count = updated_count = 0
+    failed = []
+    if consolidate != CONSOLIDATE_NONE:
+        created_count, updated_count, failed = deploy_consolidated_policies(
+            rhacs_client, transformer, filtered_vulnerabilities, existing_policies, consolidate, bucket_size)
+    else:
+        for vuln in filtered_vulnerabilities:
+            rhacs_policy = transformer.from_kev_to_rhacs(vuln)
+
+            if not rhacs_policy:
+                continue
+
+            if rhacs_policy['name'] in existing_policy_names:
+                logging.info(f"Skipping policy '{rhacs_policy['name']}' as it already exists.")
+                continue
+
+            if rhacs_client.create_policy(rhacs_policy):
+                created_count += 1
+            else:
+                failed.append(vuln)
+
+    # Failed entries stay pending, and the feed is not recorded as processed
+    # so the next run fetches it again; pending_failures makes a 304 for an
+    # already stored feed retry them as well instead of finishing early
+    failed_cves = {vuln.get('cveID') for vuln in failed}
+    state.mark_processed([vuln for vuln in new_vulnerabilities if vuln.get('cveID') not in failed_cves], catalog)
+    state.pending_failures = bool(failed)
+    state.save()
+    if failed:
+        logging.warning(f"{len(failed)} policies failed to create and will be retried next run.")
+    else:
+        kev_client.save_catalog()
 
-    logging.info(f"Policy creation job finished. Created {created_count} new policies.")
+    if consolidate != CONSOLIDATE_NONE:
+        logging.info(f"Policy creation job finished. Created {created_count} and updated {updated_count} consolidated policies.")
+    else:
+        logging.info(f"Policy creation job finished. Created {created_count} new policies.")
+    return not failed
 
+def build_schedule(schedule_config: Dict[str, Any]):
+    """A CronSchedule for ``cron``, otherwise an IntervalSchedule of ``interval_minutes`` (default daily)."""
+    if schedule_config.get('cron'):
+        return CronSchedule(schedule_config['cron'])
+    return IntervalSchedule(float(schedule_config.get('interval_minutes', DEFAULT_KEV_INTERVAL_MINUTES)) * 60)
 
 def main():
-    """Main function to run the CISA KEV to RHACS policy creator as a daily agent."""
-    
-    # Run the job once at startup
-    run_policy_creation_job()
-    
-    # Schedule the job to run every 24 hours
-    schedule.every(24).hours.do(run_policy_creation_job)
-    
-    logging.info("Scheduler started. The policy creation job will run every 24 hours.")
-    
-    while True:
-        schedule.run_pending()
-        time.sleep(60) # Check for pending jobs every 60 seconds
+    """Main function to run the CISA KEV to RHACS policy creator as a long-running agent."""
+    parser = argparse.ArgumentParser(description="Create RHACS policies from the CISA KEV catalog")
+    parser.add_argument('--once', action='store_true',
+                        help='Run the job once and exit with its outcome (e.g. from a Kubernetes CronJob)')
+    parser.add_argument('--cron', help="Cron expression overriding cisa_kev.schedule, e.g. '0 3 * * *'")
+    parser.add_argument('--interval-minutes', type=float, help='Interval overriding cisa_kev.schedule')
+    args = parser.parse_args()
+
+    if args.once:
+        sys.exit(0 if run_policy_creation_job() else 1)
+
+    try:
+        schedule_config = dict(load_configuration().get('cisa_kev', {}).get('schedule', {}))
+    except FileNotFoundError:
+        schedule_config = {}
+    if args.cron or args.interval_minutes:
+        schedule_config.update(cron=args.cron, interval_minutes=args.interval_minutes or DEFAULT_KEV_INTERVAL_MINUTES)
+
+    try:
+        job_schedule = build_schedule(schedule_config)
+    except ValueError as e:
+        logging.critical(f"Invalid CISA KEV schedule: {e}")
+        sys.exit(2)
+
+    scheduler = JobScheduler(
+        run_policy_creation_job, job_schedule,
+        jitter=float(schedule_config.get('jitter_seconds', 0)),
+        run_on_start=schedule_config.get('run_on_start', True),
+        status_file=schedule_config.get('status_file'),
+        shutdown_grace=float(schedule_config.get('shutdown_grace_seconds', DEFAULT_SHUTDOWN_GRACE))
+    )
+    scheduler.install_signal_handlers()
+    scheduler.run_forever()
 
 if __name__ == "__main__":
     main()
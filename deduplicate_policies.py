@@ -1,104 +1,289 @@
+import argparse
 import os
 import json
 import logging
-import requests
-from typing import Dict, Any, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Tuple
 from dateutil import parser
 
-# --- RHACS Client ---
-class RHACSClient:
-    def __init__(self, central_url: str, api_token: str):
-        self.central_url = central_url.rstrip('/')
-        self.api_token = api_token
-        self.headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json"
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        self.session.verify = False  # Consider using proper certificate validation in production
+from rhacs_client import RHACSClient, POLICY_FAILED
+from policy_deployer import DeploymentResult, DeploymentSummary, DEFAULT_MAX_WORKERS, POLICY_DELETED
+from policy_hash import DUPLICATE_FIELDS, policy_cves, policy_fingerprint
 
-    def get_all_policies(self) -> List[Dict[str, Any]]:
-        """Fetches all policies from RHACS."""
-        url = f"{self.central_url}/v1/policies"
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response.json().get('policies', [])
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Failed to get policies: {e}")
-            return []
+# Duplicate detection modes: identical CVE sets, or identical policy content
+DEDUP_BY_CVE = 'cve'
+DEDUP_BY_CONTENT = 'content'
+DEDUP_MODES = (DEDUP_BY_CVE, DEDUP_BY_CONTENT)
+
+# Policies per /v1/policies/export request when loading full definitions
+DEFAULT_EXPORT_BATCH_SIZE = 200
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def enforces_more(policy: Dict[str, Any], keep: Dict[str, Any]) -> bool:
+    """Whether deleting ``policy`` in favour of ``keep`` would lose enforcement."""
+    if keep.get('disabled') and not policy.get('disabled'):
+        return True
+    return bool(set(policy.get('enforcementActions') or []) - set(keep.get('enforcementActions') or []))
 
-    def delete_policy(self, policy_id: str) -> bool:
-        """Deletes a single policy by its ID."""
-        url = f"{self.central_url}/v1/policies/{policy_id}"
+def parse_timestamp(value: Optional[str]) -> datetime:
+    """Parses an RFC 3339 timestamp from Central; missing or invalid values sort as oldest."""
+    if not value:
+        return _EPOCH
+    text = value.strip().replace('Z', '+00:00').replace('z', '+00:00')
+    # Central returns up to nanoseconds; fromisoformat accepts at most microseconds
+    seconds, dot, rest = text.partition('.')
+    if dot:
+        digits = len(rest) - len(rest.lstrip('0123456789'))
+        text = f"{seconds}.{rest[:min(digits, 6)]:0<6}{rest[digits:]}"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
         try:
-            response = self.session.delete(url)
-            if response.status_code == 204:
-                logging.info(f"Successfully deleted policy with ID: {policy_id}")
-                return True
-            else:
-                logging.error(f"Failed to delete policy {policy_id}. Status: {response.status_code}, Response: {response.text}")
-                response.raise_for_status()
-                return False
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Exception while deleting policy {policy_id}: {e}")
-            return False
+            parsed = parser.parse(value)
+        except (ValueError, OverflowError):
+            logging.warning(f"Unparseable policy timestamp '{value}', treating it as oldest.")
+            return _EPOCH
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+# --- Policy Indexes ---
+class _PolicyIndex:
+    """Parses each indexed policy's timestamp once and orders duplicates by which to keep."""
+
+    def __init__(self):
+        self.timestamps: Dict[str, datetime] = {}
+
+    def _track(self, policy: Dict[str, Any]):
+        self.timestamps[policy['id']] = parse_timestamp(policy.get('createdAt') or policy.get('lastUpdated'))
+
+    def keep_order(self, policies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Default policies first, then enabled ones, each newest first; the first one is kept."""
+        return sorted(policies, reverse=True, key=lambda p: (
+            bool(p.get('isDefault')), not p.get('disabled'), self.timestamps[p['id']]))
+
+class CveIndex(_PolicyIndex):
+    """
+    Index of policies by CVE, built once per run.
+
+    Policies matching exactly the same CVE set are duplicates; ``by_cve``
+    also shows CVEs covered by several different policies.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.by_cve: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_cve_set: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        self.cve_sets: Dict[str, Tuple[str, ...]] = {}
+
+    def add(self, policy: Dict[str, Any], cves: List[str]):
+        self._track(policy)
+        cve_key = self.cve_sets[policy['id']] = tuple(sorted(cves))
+        self.by_cve_set.setdefault(cve_key, []).append(policy)
+        for cve in cve_key:
+            self.by_cve.setdefault(cve, []).append(policy)
+
+    def duplicate_groups(self) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """(label, policies in keep order) for every CVE set held by more than one policy."""
+        return [(f"CVE(s): {', '.join(cve_key)}", self.keep_order(policies))
+                for cve_key, policies in self.by_cve_set.items() if len(policies) > 1]
+
+    def overlapping_cves(self) -> List[str]:
+        """CVEs matched by policies with different CVE sets (not removed as duplicates)."""
+        return [cve for cve, policies in self.by_cve.items()
+                if len({self.cve_sets[policy['id']] for policy in policies}) > 1]
+
+class ContentIndex(_PolicyIndex):
+    """
+    Index of policies by content fingerprint (see policy_hash.policy_fingerprint).
+
+    Policies with the same fingerprint have identical criteria, lifecycle
+    stages, scope, exclusions, enforcement actions, severity, notifiers,
+    event source and enabled state, and are exact duplicates whatever their
+    names. Policies with identical criteria that differ in any of the other
+    fields are near-duplicates, reported for review.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.by_criteria: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+
+    def add(self, policy: Dict[str, Any]):
+        self._track(policy)
+        criteria = policy_fingerprint(policy, ('policySections',))
+        self.by_criteria.setdefault(criteria, {}).setdefault(
+            policy_fingerprint(policy, DUPLICATE_FIELDS), []).append(policy)
+
+    def duplicate_groups(self) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """(label, policies in keep order) for every fingerprint held by more than one policy."""
+        return [(f"content fingerprint {fingerprint[:16]}", self.keep_order(policies))
+                for variants in self.by_criteria.values()
+                for fingerprint, policies in variants.items() if len(policies) > 1]
+
+    def near_duplicate_clusters(self) -> List[List[Dict[str, Any]]]:
+        """Policies sharing criteria but differing in anything else that matters (one per variant)."""
+        return [self.keep_order([self.keep_order(policies)[0] for policies in variants.values()])
+                for variants in self.by_criteria.values() if len(variants) > 1]
 
 # --- Deduplication Logic ---
+class DedupPlan:
+    """Policies to keep and delete for each duplicated CVE set."""
+
+    def __init__(self, groups: List[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]],
+                 near_duplicates: Optional[List[List[Dict[str, Any]]]] = None):
+        self.groups = groups
+        self.near_duplicates = near_duplicates or []
+
+    @property
+    def deletes(self) -> List[Dict[str, Any]]:
+        return [policy for _, _, delete in self.groups for policy in delete]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'duplicateGroups': len(self.groups),
+            'deletes': len(self.deletes),
+            'groups': [
+                {
+                    'match': label,
+                    'keep': {'id': keep['id'], 'name': keep['name']},
+                    'delete': [{'id': policy['id'], 'name': policy['name']} for policy in delete]
+                }
+                for label, keep, delete in self.groups
+            ],
+            'nearDuplicates': [
+                [{'id': policy['id'], 'name': policy['name']} for policy in cluster]
+                for cluster in self.near_duplicates
+            ]
+        }
+
 class PolicyDeduplicator:
-    def find_and_remove_duplicates(self, client: RHACSClient):
-        """Finds and removes duplicate policies based on CVEs."""
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 export_batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+                 mode: str = DEDUP_BY_CVE, delete_content_duplicates: bool = False):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown deduplication mode '{mode}'")
+        self.mode = mode
+        # Content mode only reports duplicates unless deleting them was asked for
+        self.delete_content_duplicates = delete_content_duplicates
+        self.max_workers = max(1, max_workers)
+        self.export_batch_size = max(1, export_batch_size)
+
+    def load_policies(self, client: RHACSClient, include_default: bool = False) -> List[Dict[str, Any]]:
+        """
+        Full definitions of every non-default policy (or every policy).
+
+        The policy list omits policy sections, so definitions are exported in
+        concurrent batches.
+        """
+        ids = [policy['id'] for policy in client.get_existing_policies()
+               if policy.get('id') and (include_default or not policy.get('isDefault'))]
+        batches = [ids[start:start + self.export_batch_size] for start in range(0, len(ids), self.export_batch_size)]
+        if not batches:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            return [policy for batch in executor.map(client.export_policies, batches) for policy in batch]
+
+    def build_index(self, policies: List[Dict[str, Any]]) -> CveIndex:
+        index = CveIndex()
+        for policy in policies:
+            cves = policy_cves(policy)
+            if cves:
+                index.add(policy, cves)
+        return index
+
+    def build_content_index(self, policies: List[Dict[str, Any]]) -> ContentIndex:
+        index = ContentIndex()
+        for policy in policies:
+            if policy.get('policySections'):
+                index.add(policy)
+        return index
+
+    def plan(self, client: RHACSClient) -> DedupPlan:
+        """
+        Keep one policy of each duplicate group and plan deleting the rest.
+
+        In content mode default policies are indexed too, so custom copies of
+        them are found; a default policy is always the one kept and is never
+        deleted. A policy that is enabled while the kept one is disabled, or
+        that has enforcement actions the kept one lacks, is never deleted.
+        """
+        if self.mode == DEDUP_BY_CONTENT:
+            index = self.build_content_index(self.load_policies(client, include_default=True))
+            near_duplicates = index.near_duplicate_clusters()
+        else:
+            index = self.build_index(self.load_policies(client))
+            near_duplicates = []
+            overlapping = index.overlapping_cves()
+            if overlapping:
+                logging.info(f"{len(overlapping)} CVEs are covered by policies with different CVE sets; those are kept.")
+
+        groups = []
+        for label, policies in index.duplicate_groups():
+            keep = policies[0]
+            delete = []
+            for policy in policies[1:]:
+                if policy.get('isDefault'):
+                    continue
+                if enforces_more(policy, keep):
+                    logging.info(f"Keeping '{policy['name']}': it enforces more than '{keep['name']}' for {label}")
+                    continue
+                delete.append(policy)
+            if delete:
+                groups.append((label, policies[0], delete))
+        return DedupPlan(groups, near_duplicates)
+
+    def log_plan(self, plan: DedupPlan):
+        for label, keep, delete in plan.groups:
+            logging.warning(f"Found {len(delete) + 1} duplicate policies for {label}")
+            logging.info(f"  keep   '{keep['name']}' (ID: {keep['id']})")
+            for policy in delete:
+                logging.info(f"  delete '{policy['name']}' (ID: {policy['id']})")
+        for cluster in plan.near_duplicates:
+            logging.warning(f"Near-duplicate policies (same criteria, different lifecycle, scope, exclusions or enforcement): "
+                            + ", ".join(f"'{policy['name']}'" for policy in cluster))
+        logging.info(f"Plan: {len(plan.deletes)} duplicate policies to delete in {len(plan.groups)} groups"
+                     + (f", {len(plan.near_duplicates)} near-duplicate clusters to review." if plan.near_duplicates else "."))
+
+    def apply(self, client: RHACSClient, plan: DedupPlan) -> DeploymentSummary:
+        """Delete the planned policies through a bounded worker pool."""
+        def _delete(policy: Dict[str, Any]) -> DeploymentResult:
+            try:
+                if client.delete_policy(policy['id']):
+                    return DeploymentResult(policy['name'], POLICY_DELETED, policy['id'])
+                return DeploymentResult(policy['name'], POLICY_FAILED, 'Delete failed')
+            except Exception as e:
+                logging.error(f"Failed to delete policy {policy['name']}: {e}")
+                return DeploymentResult(policy['name'], POLICY_FAILED, str(e))
+
+        deletes = plan.deletes
+        if not deletes:
+            return DeploymentSummary([])
+        workers = min(self.max_workers, len(deletes))
+        logging.info(f"Deleting {len(deletes)} duplicate policies with {workers} concurrent workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return DeploymentSummary(list(executor.map(_delete, deletes)))
+
+    def find_and_remove_duplicates(self, client: RHACSClient, dry_run: bool = False) -> DedupPlan:
+        """Finds and removes duplicate policies by CVE set or content; returns the plan."""
         logging.info("Starting policy deduplication process...")
-        all_policies = client.get_all_policies()
-
-        if not all_policies:
-            logging.info("No policies found to deduplicate.")
-            return
-
-        # Group policies by the CVEs they contain
-        cve_to_policies: Dict[str, List[Dict[str, Any]]] = {}
-        for policy in all_policies:
-            cves = self._extract_cves(policy)
-            if not cves:
-                continue
-            
-            # Use a tuple of sorted CVEs as the key to handle policies with multiple CVEs
-            cve_key = tuple(sorted(cves))
-            if cve_key not in cve_to_policies:
-                cve_to_policies[cve_key] = []
-            cve_to_policies[cve_key].append(policy)
-
-        # Identify and remove duplicates
-        total_deleted = 0
-        for cve_key, policies in cve_to_policies.items():
-            if len(policies) > 1:
-                logging.warning(f"Found {len(policies)} duplicate policies for CVE(s): {', '.join(cve_key)}")
-                
-                # Sort policies by creation time (newest first)
-                policies.sort(key=lambda p: parser.parse(p.get('createdAt', '1970-01-01T00:00:00Z')), reverse=True)
-                
-                # Keep the newest one, delete the rest
-                policy_to_keep = policies[0]
-                logging.info(f"Keeping the newest policy: '{policy_to_keep['name']}' (ID: {policy_to_keep['id']})")
-                
-                for policy_to_delete in policies[1:]:
-                    logging.info(f"Deleting older policy: '{policy_to_delete['name']}' (ID: {policy_to_delete['id']})")
-                    if client.delete_policy(policy_to_delete['id']):
-                        total_deleted += 1
-        
-        logging.info(f"Deduplication process finished. Deleted {total_deleted} duplicate policies.")
-
-    def _extract_cves(self, policy: Dict[str, Any]) -> List[str]:
-        """Extracts all CVEs from a policy's definition."""
-        cves = set()
-        for section in policy.get("policySections", []):
-            for group in section.get("policyGroups", []):
-                if group.get("fieldName") == "CVE":
-                    for value in group.get("values", []):
-                        if value.get("value"):
-                            cves.add(value["value"])
-        return list(cves)
+        plan = self.plan(client)
+        if not plan.groups and not plan.near_duplicates:
+            logging.info("No duplicate policies found.")
+            return plan
+
+        self.log_plan(plan)
+        if dry_run or not plan.groups:
+            if dry_run:
+                logging.info("Dry run: no policies were deleted.")
+            return plan
+        if self.mode == DEDUP_BY_CONTENT and not self.delete_content_duplicates:
+            logging.info("Content mode reports duplicates only; pass --delete to remove them.")
+            return plan
+
+        summary = self.apply(client, plan)
+        logging.info(f"Deduplication process finished. Deleted {summary.deleted} duplicate policies"
+                     + (f", {summary.failed} deletes failed." if summary.failed else "."))
+        return plan
 
 # --- Main ---
 def load_configuration(config_file: str = "config.json") -> Dict[str, Any]:
@@ -120,6 +305,24 @@ def load_configuration(config_file: str = "config.json") -> Dict[str, Any]:
 
 def main():
     """Main function to run the deduplication script."""
+    arg_parser = argparse.ArgumentParser(
+        description="Find duplicate RHACS policies and remove them: policies matching the same CVE set "
+                    "(--mode cve), or policies with identical content whatever their names (--mode content, "
+                    "reported only unless --delete is given). Default policies and copies that enforce more "
+                    "than the kept policy are never deleted.")
+    arg_parser.add_argument('--mode', choices=DEDUP_MODES, default=DEDUP_BY_CVE,
+                            help="'cve': delete policies with identical CVE sets (default); "
+                                 "'content': report policies with identical criteria, lifecycle stages, scope, exclusions, "
+                                 "enforcement, severity, notifiers, event source and enabled state, and list "
+                                 "near-duplicates that share only the criteria")
+    arg_parser.add_argument('--dry-run', action='store_true', help='Show the deletion plan without deleting anything in either mode')
+    arg_parser.add_argument('--delete', action='store_true',
+                            help='In content mode, delete the exact duplicates found (default: report only)')
+    arg_parser.add_argument('--output', help='Write the plan as JSON to this file')
+    arg_parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                            help=f'Concurrent delete/export requests (default: {DEFAULT_MAX_WORKERS})')
+    args = arg_parser.parse_args()
+
     try:
         config = load_configuration()
     except FileNotFoundError:
@@ -133,9 +336,19 @@ def main():
         logging.critical("Missing required configuration for RHACS.")
         return
 
-    rhacs_client = RHACSClient(central_url, api_token)
-    deduplicator = PolicyDeduplicator()
-    deduplicator.find_and_remove_duplicates(rhacs_client)
+    rhacs_client = RHACSClient(central_url, api_token, rate_limit=rhacs_config.get('rate_limit'))
+    deduplicator = PolicyDeduplicator(max_workers=args.workers, mode=args.mode,
+                                      delete_content_duplicates=args.delete)
+    try:
+        plan = deduplicator.find_and_remove_duplicates(rhacs_client, dry_run=args.dry_run)
+    except Exception as e:
+        logging.critical(f"Deduplication failed: {e}")
+        return
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(plan.to_dict(), f, indent=2)
+        logging.info(f"Wrote deduplication plan to {args.output}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Job Scheduler for Long-Running Agents
+
+Runs a job on a cron expression or a fixed interval without polling:
+
+- the scheduler thread sleeps until the next run is due (or until it is
+  woken by a run-now trigger or a shutdown request)
+- runs execute on a worker thread, so a slow run never delays scheduling;
+  a run that comes due while the previous one is still going is skipped
+  instead of piling up
+- an optional random jitter spreads the runs of many replicas
+- SIGTERM/SIGINT stop the scheduler gracefully, waiting for a running job up
+  to a grace period; SIGUSR1 triggers a run immediately
+- every run is recorded with its start time, duration and outcome, and the
+  latest status can be written to a JSON file for liveness checks
+
+Cron expressions use the standard five fields (minute hour day-of-month
+month day-of-week) with ``*``, lists, ranges and ``/`` steps, evaluated in
+local time. As in cron, when both day fields are restricted a day matching
+either one is due; a day field starting with ``*`` is never restricted.
+"""
+
+import json
+import logging
+import os
+import random
+import signal
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Run outcomes
+RUN_SUCCEEDED = 'succeeded'
+RUN_FAILED = 'failed'
+RUN_SKIPPED = 'skipped'
+
+# Seconds a running job may take to finish after SIGTERM before the process exits
+DEFAULT_SHUTDOWN_GRACE = 25
+
+# Completed runs kept in memory
+DEFAULT_HISTORY_SIZE = 50
+
+_CRON_FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 6),
+)
+
+
+class CronSchedule:
+    """Five-field cron expression, e.g. ``'0 3 * * *'`` for 03:00 every day."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        (self.minutes, self.hours, self.days, self.months, self.weekdays) = (
+            self._parse(field, name, low, high) for field, (name, low, high) in zip(fields, _CRON_FIELDS)
+        )
+        # As in vixie-cron, a day field starting with '*' ('*', '*/2') is unrestricted
+        self.any_day = fields[2].startswith('*')
+        self.any_weekday = fields[4].startswith('*')
+
+    @staticmethod
+    def _parse(field: str, name: str, low: int, high: int) -> frozenset:
+        values = set()
+        for part in field.split(','):
+            part, _, step = part.partition('/')
+            try:
+                step = int(step) if step else 1
+                if part == '*':
+                    start, end = low, high
+                elif '-' in part:
+                    start, end = (int(value) for value in part.split('-', 1))
+                else:
+                    start = int(part)
+                    end = high if step > 1 else start
+            except ValueError:
+                raise ValueError(f"Invalid cron {name} field '{field}'")
+            if name == 'day of week' and end == 7:
+                # 7 is Sunday as well as 0
+                values.add(0)
+                if start == 7:
+                    continue
+                end = 6
+            if step < 1 or not low <= start <= end <= high:
+                raise ValueError(f"Invalid cron {name} field '{field}'")
+            values.update(range(start, end + 1, step))
+        return frozenset(values)
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day = moment.day in self.days
+        weekday = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first due time strictly after ``moment``."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=candidate.year + (month == 1), month=month,
+                                              day=1, hour=0, minute=0)
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+    def __str__(self) -> str:
+        return f"cron '{self.expression}'"
+
+
+class IntervalSchedule:
+    """A run every ``seconds`` seconds."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Schedule interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def __str__(self) -> str:
+        return f"every {timedelta(seconds=self.seconds)}"
+
+
+class RunRecord:
+    """Outcome of one job run."""
+
+    def __init__(self, number: int, trigger: str, started: datetime):
+        self.number = number
+        self.trigger = trigger
+        self.started = started
+        self.duration = 0.0
+        self.outcome = None
+        self.error = ''
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            'run': self.number,
+            'trigger': self.trigger,
+            'started': self.started.isoformat(timespec='seconds'),
+            'durationSeconds': round(self.duration, 3),
+            'outcome': self.outcome,
+            'error': self.error
+        }
+
+
+class JobScheduler:
+    """
+    Runs ``job`` on ``schedule`` on a worker thread until stopped.
+
+    ``job`` succeeds unless it raises or returns False. ``jitter`` delays
+    each scheduled run by up to that many seconds; run-now triggers are not
+    delayed.
+    """
+
+    def __init__(self, job: Callable[[], Optional[bool]], schedule, jitter: float = 0,
+                 run_on_start: bool = True, status_file: Optional[str] = None,
+                 shutdown_grace: float = DEFAULT_SHUTDOWN_GRACE,
+                 history_size: int = DEFAULT_HISTORY_SIZE):
+        self.job = job
+        self.schedule = schedule
+        self.jitter = max(0.0, jitter)
+        self.run_on_start = run_on_start
+        self.status_file = os.path.expanduser(status_file) if status_file else None
+        self.shutdown_grace = shutdown_grace
+        self.history = deque(maxlen=history_size)
+        self.next_run = None
+        self._runs = 0
+        self._worker = None
+        self._lock = threading.Lock()
+        self._status_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._run_now = None
+
+    # --- Control ---
+
+    def trigger(self, reason: str = 'manual'):
+        """Request a run as soon as possible (safe to call from signal handlers)."""
+        self._run_now = reason
+        self._wake.set()
+
+    def stop(self):
+        """Ask the scheduler to exit; a running job is allowed to finish."""
+        self._stopping.set()
+        self._wake.set()
+
+    def install_signal_handlers(self):
+        """SIGTERM/SIGINT stop the scheduler and SIGUSR1 triggers a run. Main thread only."""
+        def _stop(signum, frame):
+            logger.info(f"Received {signal.Signals(signum).name}, shutting down")
+            self.stop()
+
+        signal.signal(signal.SIGTERM, _stop)
+        signal.signal(signal.SIGINT, _stop)
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.trigger())
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    # --- Scheduling loop ---
+
+    def _next_due(self, after: datetime) -> datetime:
+        due = self.schedule.next_after(after)
+        if self.jitter:
+            due += timedelta(seconds=random.uniform(0, self.jitter))
+        return due
+
+    def run_forever(self):
+        """Block, running the job on schedule, until stop() is called."""
+        logger.info(f"Scheduler started: {self.schedule}"
+                     + (f" with up to {self.jitter:.0f}s jitter" if self.jitter else ""))
+        if self.run_on_start:
+            self.trigger('startup')
+        self.next_run = self._next_due(datetime.now())
+        self._write_status()
+
+        while not self._stopping.is_set():
+            wait = (self.next_run - datetime.now()).total_seconds()
+            if wait > 0 and not self._run_now:
+                self._wake.wait(wait)
+            self._wake.clear()
+            if self._stopping.is_set():
+                break
+
+            if self._run_now:
+                reason, self._run_now = self._run_now, None
+                self._start(reason)
+            elif datetime.now() >= self.next_run:
+                self._start('schedule')
+                self.next_run = self._next_due(max(datetime.now(), self.next_run))
+                logger.info(f"Next run at {self.next_run.isoformat(timespec='seconds')}")
+            self._write_status()
+
+        self._shutdown()
+
+    def _start(self, trigger: str):
+        with self._lock:
+            self._runs += 1
+            record = RunRecord(self._runs, trigger, datetime.now())
+            if self.running:
+                record.outcome = RUN_SKIPPED
+                record.error = 'previous run still in progress'
+                logger.warning(f"Run #{record.number} ({trigger}) skipped: previous run still in progress")
+                self.history.append(record)
+                return
+            self._worker = threading.Thread(target=self._execute, args=(record,),
+                                            name=f"job-run-{record.number}", daemon=True)
+            self._worker.start()
+
+    def _execute(self, record: RunRecord):
+        logger.info(f"Run #{record.number} ({record.trigger}) started")
+        started = time.monotonic()
+        try:
+            if self.job() is False:
+                record.outcome = RUN_FAILED
+                record.error = 'job reported failure'
+            else:
+                record.outcome = RUN_SUCCEEDED
+        except Exception as e:
+            logger.exception(f"Run #{record.number} raised an exception")
+            record.outcome = RUN_FAILED
+            record.error = str(e)
+        record.duration = time.monotonic() - started
+        logger.info(f"Run #{record.number} {record.outcome} in {record.duration:.2f}s")
+        with self._lock:
+            self.history.append(record)
+        self._write_status()
+
+    def _shutdown(self):
+        worker = self._worker
+        if worker is not None and worker.is_alive():
+            logger.info(f"Waiting up to {self.shutdown_grace}s for the running job to finish")
+            worker.join(self.shutdown_grace)
+            if worker.is_alive():
+                logger.warning("Running job did not finish in time; exiting anyway")
+        self.next_run = None
+        self._write_status()
+        logger.info("Scheduler stopped")
+
+    # --- Status ---
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            history: List[RunRecord] = list(self.history)
+        return {
+            'schedule': str(self.schedule),
+            'running': self.running,
+            'nextRun': self.next_run.isoformat(timespec='seconds') if self.next_run else None,
+            'lastRun': history[-1].to_dict() if history else None,
+            'lastSuccess': next((record.to_dict() for record in reversed(history)
+                                 if record.outcome == RUN_SUCCEEDED), None),
+            'runs': [record.to_dict() for record in history]
+        }
+
+    def _write_status(self):
+        if not self.status_file:
+            return
+        try:
+            with self._status_lock:
+                os.makedirs(os.path.dirname(self.status_file) or '.', exist_ok=True)
+                tmp_path = f"{self.status_file}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.status(), f, indent=2)
+                os.replace(tmp_path, self.status_file)
+        except OSError as e:
+            logger.warning(f"Could not write scheduler status to {self.status_file}: {e}")
@@ -11,16 +11,16 @@ Usage:
 """
 
 import json
-import requests
 import logging
 import sys
 import os
 from typing import Dict, List, Any
-from urllib.parse import urljoin
-import urllib3
 
-# Disable SSL warnings
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from rhacs_client import RHACSClient
+from policy_deployer import deploy_policies, DEFAULT_MAX_WORKERS, DEFAULT_IMPORT_BATCH_SIZE
+from policy_sync import sync_policies
+from async_rhacs_client import deploy_policies_concurrently
+from policy_catalog import PolicyCatalog
 
 # Configure logging
 logging.basicConfig(
@@ -53,75 +53,11 @@ def load_env_file(env_file: str = ".env") -> Dict[str, str]:
         sys.exit(1)
 
 
-class RHACSClient:
-    """RHACS/ACS API client for managing security policies."""
-    
-    def __init__(self, central_url: str, api_token: str):
-        self.central_url = central_url.rstrip('/')
-        self.api_token = api_token
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.api_token}',
-            'Content-Type': 'application/json'
-        })
-        
-    def _make_request(self, method: str, endpoint: str, data: Dict = None) -> requests.Response:
-        """Make HTTP request to RHACS API."""
-        url = urljoin(self.central_url, endpoint)
-        try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data,
-                verify=False  # For demo environments
-            )
-            response.raise_for_status()
-            return response
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            if hasattr(e.response, 'text'):
-                logger.error(f"Response: {e.response.text[:500]}")
-            raise
-    
-    def test_connection(self) -> bool:
-        """Test connection to RHACS Central."""
-        try:
-            response = self._make_request('GET', '/v1/metadata')
-            metadata = response.json()
-            logger.info(f"Successfully connected to RHACS Central (version: {metadata.get('version', 'unknown')})")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to connect to RHACS Central: {e}")
-            return False
-    
-    def create_policy(self, policy: Dict[str, Any]) -> tuple[bool, str]:
-        """Create a security policy in RHACS."""
-        try:
-            response = self._make_request('POST', '/v1/policies', policy)
-            policy_id = response.json().get('id', 'unknown')
-            logger.info(f"✓ Created policy: {policy['name']} (ID: {policy_id})")
-            return True, policy_id
-        except Exception as e:
-            logger.error(f"✗ Failed to create policy {policy['name']}: {e}")
-            return False, str(e)
-    
-    def get_existing_policies(self) -> List[Dict]:
-        """Get list of existing policies."""
-        try:
-            response = self._make_request('GET', '/v1/policies')
-            return response.json().get('policies', [])
-        except Exception as e:
-            logger.error(f"Failed to fetch existing policies: {e}")
-            return []
-
-
 def load_nist_policies(policies_file: str = "nist_800_190_policies.json") -> List[Dict[str, Any]]:
     """Load NIST 800-190 policies from JSON file."""
     try:
-        with open(policies_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        policies = data.get('nist_800_190_policies', [])
+        catalog = PolicyCatalog.load([os.path.abspath(policies_file)])
+        policies = catalog.section('nist_800_190_policies')
         logger.info(f"Loaded {len(policies)} policies from {policies_file}")
         return policies
         
@@ -172,11 +108,19 @@ def main():
         logger.error("RHACS_URL and RHACS_TOKEN must be set in .env file")
         sys.exit(1)
     
+    max_workers = int(env_vars.get('MAX_WORKERS', DEFAULT_MAX_WORKERS))
+    import_batch_size = int(env_vars.get('IMPORT_BATCH_SIZE', DEFAULT_IMPORT_BATCH_SIZE))
+    use_async = env_vars.get('ASYNC', 'false').lower() == 'true'
+    validate_schema = env_vars.get('VALIDATE_SCHEMA', 'true').lower() == 'true'
+    sync = env_vars.get('SYNC', 'false').lower() == 'true'
+    prune = env_vars.get('PRUNE', 'false').lower() == 'true'
+    
     logger.info(f"RHACS URL: {rhacs_url}")
     logger.info("")
     
     # Initialize RHACS client
-    client = RHACSClient(rhacs_url, rhacs_token)
+    rate_limit = float(env_vars['RATE_LIMIT']) if env_vars.get('RATE_LIMIT') else None
+    client = RHACSClient(rhacs_url, rhacs_token, rate_limit=rate_limit)
     
     # Test connection
     if not client.test_connection():
@@ -185,38 +129,55 @@ def main():
     
     logger.info("")
     
-    # Get existing policies to avoid duplicates
-    existing_policies = client.get_existing_policies()
-    existing_policy_names = {policy.get('name', '') for policy in existing_policies}
-    logger.info(f"Found {len(existing_policies)} existing policies in RHACS")
-    logger.info("")
-    
     # Load NIST 800-190 policies
     policies = load_nist_policies()
     
-    # Deploy policies
-    logger.info("Starting policy deployment...")
-    logger.info("-" * 80)
-    
-    created_count = 0
-    skipped_count = 0
-    failed_count = 0
-    
-    for policy in policies:
-        policy_name = policy['name']
+    if sync:
+        # Create new, update changed and optionally prune removed policies
+        logger.info("Starting policy sync...")
+        logger.info("-" * 80)
         
-        # Skip if policy already exists
-        if policy_name in existing_policy_names:
-            logger.info(f"⊗ Policy already exists, skipping: {policy_name}")
-            skipped_count += 1
-            continue
+        summary = sync_policies(
+            client,
+            policies,
+            managed_prefixes=['NIST-800-190-'],
+            prune=prune,
+            max_workers=max_workers,
+            validate=validate_schema
+        )
+        logger.info(f"Updated: {summary.updated}, Deleted: {summary.deleted}")
+    else:
+        # Get existing policies to avoid duplicates
+        existing_policies = client.get_existing_policies()
+        existing_policy_names = {policy.get('name', '') for policy in existing_policies}
+        logger.info(f"Found {len(existing_policies)} existing policies in RHACS")
+        logger.info("")
+        
+        # Deploy policies
+        logger.info("Starting policy deployment...")
+        logger.info("-" * 80)
         
-        # Create the policy
-        success, result = client.create_policy(policy)
-        if success:
-            created_count += 1
+        if use_async:
+            summary = deploy_policies_concurrently(
+                client,
+                policies,
+                existing_names=existing_policy_names,
+                max_concurrency=max_workers,
+                batch_size=import_batch_size,
+                validate=validate_schema
+            )
         else:
-            failed_count += 1
+            summary = deploy_policies(
+                client,
+                policies,
+                existing_names=existing_policy_names,
+                max_workers=max_workers,
+                batch_size=import_batch_size,
+                validate=validate_schema
+            )
+    created_count = summary.created
+    skipped_count = summary.skipped
+    failed_count = summary.failed
     
     logger.info("")
     
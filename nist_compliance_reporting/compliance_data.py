@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Shared data collection for the RHACS compliance reporting scripts.
+
+Fetches policy violations in bulk so a report costs a handful of alert queries
+for the whole framework instead of one query per policy, and builds the
+deployment x policy ComplianceMatrix shared by every report format.
+
+A report run is a single collection stage producing a ComplianceSnapshot,
+which the JSON, CSV and HTML renderers in report_renderers.py all consume.
+"""
+
+import sys
+from collections import defaultdict
+from datetime import datetime
+
+import yaml
+
+from compliance_matrix import ComplianceMatrix
+
+# Policy IDs combined into one disjunctive "Policy Id:a,b,c" alerts query.
+# Bounded so the resulting URL stays well under common proxy limits.
+POLICY_ID_CHUNK_SIZE = 50
+
+
+def load_frameworks(config_file='compliance_frameworks.yaml'):
+    """Load compliance framework definitions"""
+    try:
+        with open(config_file, 'r') as f:
+            config = yaml.safe_load(f)
+            return config.get('frameworks', {})
+    except FileNotFoundError:
+        print(f"ERROR: Framework configuration file not found: {config_file}")
+        sys.exit(1)
+    except yaml.YAMLError as e:
+        print(f"ERROR: Invalid YAML in configuration file: {e}")
+        sys.exit(1)
+
+
+def get_framework(framework_id, frameworks):
+    """Look up a framework definition, exiting with the available IDs if unknown"""
+    if framework_id not in frameworks:
+        print(f"ERROR: Unknown framework: {framework_id}")
+        print(f"Available frameworks: {', '.join(frameworks.keys())}")
+        sys.exit(1)
+    return frameworks[framework_id]
+
+
+def chunked(items, size):
+    """Split a list into consecutive chunks of at most ``size`` items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def policy_alert_queries(policy_ids, chunk_size=POLICY_ID_CHUNK_SIZE):
+    """Disjunctive "Policy Id:a,b,c" alert queries covering ``policy_ids``"""
+    return [f"Policy Id:{','.join(chunk)}" for chunk in chunked(sorted(policy_ids), chunk_size)]
+
+
+def report_data_requests(policy_ids, chunk_size=POLICY_ID_CHUNK_SIZE):
+    """(endpoint, query) list requests a report for ``policy_ids`` reads, for prefetching"""
+    return [('/v1/deployments', None)] + [('/v1/alerts', query) for query in policy_alert_queries(policy_ids, chunk_size)]
+
+
+def iter_policy_alerts(client, policy_ids, chunk_size=POLICY_ID_CHUNK_SIZE):
+    """Stream alerts for many policies using paginated disjunctive Policy Id queries"""
+    for query in policy_alert_queries(policy_ids, chunk_size):
+        yield from client.iter_alerts(query)
+
+
+def collect_policy_violations(client, policy_ids, chunk_size=POLICY_ID_CHUNK_SIZE):
+    """
+    Map deployment ID -> set of violated policy IDs for the given policies.
+
+    Alerts are bucketed locally by the policy ID they carry, so alerts for
+    policies outside ``policy_ids`` are ignored.
+    """
+    wanted = set(policy_ids)
+    policies_with_violations = defaultdict(set)
+
+    for alert in iter_policy_alerts(client, wanted, chunk_size):
+        policy_id = alert.get('policy', {}).get('id')
+        deployment_id = alert.get('deployment', {}).get('id')
+        if deployment_id and policy_id in wanted:
+            policies_with_violations[deployment_id].add(policy_id)
+
+    return policies_with_violations
+
+
+def get_all_policy_definitions(client):
+    """
+    Fetch every policy with its full definition.
+
+    The /v1/policies list omits fields such as categories, so the full bodies
+    are fetched with a single export request for the listed policy IDs.
+    """
+    policies = list(client.iter_policies())
+    if policies and all('categories' in p for p in policies):
+        return policies
+    return client.export_policies([p['id'] for p in policies])
+
+
+def get_policies_for_framework(client, framework_config):
+    """Fetch policies that match the framework criteria"""
+    filter_type = framework_config['policy_filter']['type']
+    filter_value = framework_config['policy_filter']['value']
+
+    if filter_type == 'category':
+        query = f"Category:{filter_value}"
+    elif filter_type == 'name_prefix':
+        query = f"Policy:{filter_value}"
+    elif filter_type == 'name_contains':
+        query = None
+    elif filter_type == 'tag':
+        query = f"Tag:{filter_value}"
+    else:
+        print(f"ERROR: Unknown filter type: {filter_type}")
+        return []
+
+    policies = list(client.iter_policies(query))
+
+    # Additional filtering for name_contains
+    if filter_type in ('name_contains', 'name_prefix'):
+        policies = [p for p in policies if filter_value in p.get('name', '')]
+
+    return policies
+
+
+def policy_matches_filter(policy, policy_filter):
+    """Evaluate a framework policy_filter against a policy locally"""
+    filter_type = policy_filter['type']
+    filter_value = policy_filter['value']
+
+    if filter_type in ('name_prefix', 'name_contains'):
+        return filter_value in policy.get('name', '')
+    if filter_type == 'category':
+        wanted = filter_value.lower()
+        return any(wanted in category.lower() for category in policy.get('categories', []))
+    if filter_type == 'tag':
+        return filter_value in policy.get('tags', [])
+
+    print(f"ERROR: Unknown filter type: {filter_type}")
+    return False
+
+
+def select_framework_policies(policies, framework):
+    """Select the policies from an in-memory policy set that belong to a framework"""
+    return [p for p in policies if policy_matches_filter(p, framework['policy_filter'])]
+
+
+class ComplianceSnapshot:
+    """
+    One framework's compliance results, collected once and rendered many times.
+
+    Holds the framework definition, its policies and the ComplianceMatrix,
+    plus the roll-ups (totals, per-policy and per-deployment counts) that the
+    console, JSON, CSV and HTML outputs all report.
+    """
+
+    def __init__(self, framework_id, framework, policies, matrix, generated=None):
+        self.framework_id = framework_id
+        self.framework = framework
+        self.policies = policies
+        self.matrix = matrix
+        self.generated = generated or datetime.now()
+
+    @property
+    def name(self):
+        return self.framework['name']
+
+    @property
+    def full_name(self):
+        return self.framework.get('full_name', self.name)
+
+    @property
+    def timestamp(self):
+        """Timestamp used in report file names"""
+        return self.generated.strftime('%Y%m%d_%H%M%S')
+
+    @property
+    def total_clusters(self):
+        return self.matrix.total_clusters
+
+    @property
+    def total_namespaces(self):
+        return self.matrix.total_namespaces
+
+    @property
+    def total_deployments(self):
+        return self.matrix.total_deployments
+
+    @property
+    def compliance_data(self):
+        """Nested cluster -> namespace -> deployment -> policy results dict"""
+        return self.matrix.to_nested_dict()
+
+    def iter_deployment_results(self):
+        """Yield (cluster, namespace, deployment, row) in sorted order"""
+        matrix = self.matrix
+        for row in matrix.sorted_rows():
+            cluster, namespace, deployment = matrix.row_key(row)
+            yield cluster, namespace, deployment, row
+
+    def policy_stats(self):
+        """Count deployments passing and failing each policy"""
+        total = self.total_deployments
+        if not total:
+            return {}
+        return {
+            policy_name: {'total': total, 'pass': total - failed, 'fail': failed}
+            for policy_name, failed in self.matrix.policy_fail_counts().items()
+        }
+
+    def deployment_compliance(self):
+        """Return (compliant, non_compliant) deployment counts"""
+        non_compliant = self.matrix.non_compliant_deployments()
+        return self.total_deployments - non_compliant, non_compliant
+
+    def framework_info(self):
+        return {
+            'id': self.framework_id,
+            'name': self.name,
+            'full_name': self.full_name,
+            'description': self.framework.get('description', ''),
+            'url': self.framework.get('url', '')
+        }
+
+    def to_dict(self):
+        """JSON-serializable form of the snapshot"""
+        return {
+            'framework': self.framework_info(),
+            'generated': self.generated.isoformat(),
+            'policies': [{'id': p['id'], 'name': p['name']} for p in self.policies],
+            'compliance_data': self.compliance_data
+        }
+
+
+def collect_snapshot(client, framework_id, framework, policies, deployments=None,
+                     policies_with_violations=None, generated=None, concurrency=0):
+    """
+    Collection stage: build a ComplianceSnapshot for a framework's policies.
+
+    ``deployments`` and ``policies_with_violations`` are fetched from Central
+    when not supplied, so multi-framework runs can pass data they already hold.
+    With ``concurrency`` > 0 the deployment and alert requests are prefetched
+    concurrently through the client's prefetch().
+    """
+    if concurrency and deployments is None and policies_with_violations is None:
+        client.prefetch(report_data_requests([p['id'] for p in policies]), concurrency)
+    if deployments is None:
+        # Stream deployments lazily; pages are fetched while the matrix is built
+        deployments = client.iter_deployments()
+    if policies_with_violations is None:
+        policies_with_violations = collect_policy_violations(client, [p['id'] for p in policies])
+
+    matrix = ComplianceMatrix.build(policies, deployments, policies_with_violations)
+    return ComplianceSnapshot(framework_id, framework, policies, matrix, generated)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Compact deployment x policy compliance matrix.
+
+Instead of one ``{'status': ..., 'policy_id': ...}`` dict per deployment and
+policy, the matrix keeps:
+
+- interned cluster and namespace tables with a small integer index per row
+- a dense row-major bitmap (one bit per deployment x policy cell, set = FAIL)
+- one integer bitset per policy column (bit N set = deployment row N fails)
+
+Per-policy pass/fail counts and the number of non-compliant deployments are
+popcounts over the column bitsets, so summaries no longer walk every cell.
+"""
+
+from array import array
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(value):
+        return bin(value).count('1')
+
+
+class ComplianceMatrix:
+    """Deployment x policy pass/fail matrix for one framework."""
+
+    def __init__(self, policies):
+        # Policy columns are keyed by name (as in the report output); when two
+        # policies share a name the later policy ID wins, in the first column
+        self.policy_columns = {}
+        self.policy_ids = []
+        for policy in policies:
+            column = self.policy_columns.setdefault(policy['name'], len(self.policy_ids))
+            if column == len(self.policy_ids):
+                self.policy_ids.append(policy['id'])
+            else:
+                self.policy_ids[column] = policy['id']
+        self.policy_names = list(self.policy_columns)
+
+        self.clusters = []
+        self.namespaces = []
+        self.deployment_names = []
+        self.row_cluster = array('I')
+        self.row_namespace = array('I')
+
+        self._cluster_index = {}
+        self._namespace_index = {}
+        self._row_index = {}
+        self._row_failures = {}
+
+        self.bitmap = bytearray()
+        self.columns = [0] * len(self.policy_names)
+        self.row_failed = array('H')
+
+    @property
+    def row_stride(self):
+        """Bytes per deployment row in the bitmap"""
+        return (len(self.policy_names) + 7) // 8
+
+    @classmethod
+    def build(cls, policies, deployments, policies_with_violations):
+        """
+        Build the matrix from policies, deployments and deployment ID -> violated policy IDs.
+
+        ``deployments`` may be any iterable, including a lazy paginated stream.
+        """
+        matrix = cls(policies)
+        column_of_id = {policy_id: column for column, policy_id in enumerate(matrix.policy_ids)}
+
+        for deployment in deployments:
+            violated = policies_with_violations.get(deployment.get('id'), ())
+            failed_columns = [column_of_id[pid] for pid in violated if pid in column_of_id]
+            matrix._add_row(
+                deployment.get('clusterName', 'Unknown'),
+                deployment.get('namespace'),
+                deployment.get('name'),
+                failed_columns
+            )
+
+        matrix._pack()
+        return matrix
+
+    def _intern(self, value, index, table):
+        position = index.get(value)
+        if position is None:
+            position = index[value] = len(table)
+            table.append(value)
+        return position
+
+    def _add_row(self, cluster, namespace, deployment_name, failed_columns):
+        cluster_i = self._intern(cluster, self._cluster_index, self.clusters)
+        namespace_i = self._intern(namespace, self._namespace_index, self.namespaces)
+
+        # A repeated cluster/namespace/name replaces the earlier row's results
+        key = (cluster_i, namespace_i, deployment_name)
+        row = self._row_index.get(key)
+        if row is None:
+            row = self._row_index[key] = len(self.deployment_names)
+            self.deployment_names.append(deployment_name)
+            self.row_cluster.append(cluster_i)
+            self.row_namespace.append(namespace_i)
+
+        if failed_columns:
+            self._row_failures[row] = failed_columns
+        else:
+            self._row_failures.pop(row, None)
+
+    def _pack(self):
+        """Turn the sparse per-row failures into the bitmap and column bitsets"""
+        rows = len(self.deployment_names)
+        stride = self.row_stride
+        self.bitmap = bytearray(rows * stride)
+        self.row_failed = array('H', bytes(2 * rows))
+        column_bits = [bytearray((rows + 7) // 8) for _ in self.policy_names]
+
+        for row, failed_columns in self._row_failures.items():
+            failed_columns = set(failed_columns)
+            self.row_failed[row] = len(failed_columns)
+            for column in failed_columns:
+                self.bitmap[row * stride + (column >> 3)] |= 1 << (column & 7)
+                column_bits[column][row >> 3] |= 1 << (row & 7)
+
+        self.columns = [int.from_bytes(bits, 'little') for bits in column_bits]
+        self._row_failures = {}
+        self._row_index = {}
+
+    @property
+    def total_deployments(self):
+        return len(self.deployment_names)
+
+    @property
+    def total_clusters(self):
+        return len(set(self.row_cluster))
+
+    @property
+    def total_namespaces(self):
+        return len(set(zip(self.row_cluster, self.row_namespace)))
+
+    def failed(self, row, column):
+        """True if the deployment in ``row`` violates the policy in ``column``"""
+        return bool(self.bitmap[row * self.row_stride + (column >> 3)] >> (column & 7) & 1)
+
+    def failed_count(self, row):
+        """Number of policies the deployment in ``row`` violates"""
+        return self.row_failed[row]
+
+    def failed_policies(self, row):
+        """Names of the policies the deployment in ``row`` violates"""
+        if not self.row_failed[row]:
+            return []
+        return [name for column, name in enumerate(self.policy_names) if self.failed(row, column)]
+
+    def policy_fail_counts(self):
+        """Policy name -> number of failing deployments"""
+        return {name: _popcount(self.columns[column]) for column, name in enumerate(self.policy_names)}
+
+    def non_compliant_deployments(self):
+        """Number of deployments violating at least one policy"""
+        any_failed = 0
+        for bits in self.columns:
+            any_failed |= bits
+        return _popcount(any_failed)
+
+    def row_key(self, row):
+        return (self.clusters[self.row_cluster[row]],
+                self.namespaces[self.row_namespace[row]],
+                self.deployment_names[row])
+
+    def sorted_rows(self):
+        """Row indexes ordered by cluster, namespace and deployment name"""
+        # Cluster-scoped or namespace-less deployments carry None, which sorts as ''
+        return sorted(range(self.total_deployments),
+                      key=lambda row: tuple(value or '' for value in self.row_key(row)))
+
+    def grouped_rows(self):
+        """
+        Rows grouped as [(cluster, [(namespace, [row, ...]), ...]), ...].
+
+        Clusters, namespaces and deployments keep first-seen order, matching
+        the key order of the nested report JSON.
+        """
+        groups = {}
+        for row in range(self.total_deployments):
+            namespaces = groups.setdefault(self.row_cluster[row], {})
+            namespaces.setdefault(self.row_namespace[row], []).append(row)
+        return [
+            (self.clusters[cluster_i], [(self.namespaces[ns_i], rows) for ns_i, rows in namespaces.items()])
+            for cluster_i, namespaces in groups.items()
+        ]
+
+    def row_results(self, row):
+        """The report's per-policy results for one deployment row"""
+        return {
+            name: {'status': 'FAIL' if self.failed(row, column) else 'PASS',
+                   'policy_id': self.policy_ids[column]}
+            for column, name in enumerate(self.policy_names)
+        }
+
+    def to_nested_dict(self):
+        """Expand to the nested cluster -> namespace -> deployment -> policy results dict"""
+        return {
+            cluster: {
+                namespace: {self.deployment_names[row]: self.row_results(row) for row in rows}
+                for namespace, rows in namespaces
+            }
+            for cluster, namespaces in self.grouped_rows()
+        }
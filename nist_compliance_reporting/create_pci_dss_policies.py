@@ -9,19 +9,21 @@ for organizations that handle credit cards.
 PCI-DSS 4.0 has 12 main requirements focused on protecting cardholder data.
 """
 
-import requests
 import json
 import os
 import sys
-import urllib3
 
-# Disable SSL warnings for demo environment
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Make the shared RHACS client in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rhacs_client import RHACSClient
+from policy_deployer import deploy_policies, DEFAULT_MAX_WORKERS, DEFAULT_IMPORT_BATCH_SIZE
 
 # RHACS Configuration from environment variables
 RHACS_URL = os.getenv('RHACS_URL', '').rstrip('/')
 API_TOKEN = os.getenv('RHACS_API_TOKEN')
 VERIFY_SSL = os.getenv('RHACS_VERIFY_SSL', 'false').lower() == 'true'
+MAX_WORKERS = int(os.getenv('RHACS_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+IMPORT_BATCH_SIZE = int(os.getenv('RHACS_IMPORT_BATCH_SIZE', DEFAULT_IMPORT_BATCH_SIZE))
 
 # Validate required environment variables
 if not RHACS_URL:
@@ -34,10 +36,9 @@ if not API_TOKEN:
     print("Please set: export RHACS_API_TOKEN='your-api-token'")
     sys.exit(1)
 
-HEADERS = {
-    "Authorization": f"Bearer {API_TOKEN}",
-    "Content-Type": "application/json"
-}
+# Shared pooled client reused for every API call in this run
+CLIENT = RHACSClient(RHACS_URL, API_TOKEN, verify_ssl=VERIFY_SSL,
+                     rate_limit=float(os.getenv('RHACS_RATE_LIMIT', 0)) or None)
 
 # PCI-DSS 4.0 Policy Definitions
 PCI_DSS_POLICIES = [
@@ -332,11 +333,9 @@ PCI_DSS_POLICIES = [
     }
 ]
 
-def create_policy(policy_definition):
-    """Create a single policy in RHACS"""
-
-    # Build the full policy object
-    policy = {
+def build_policy(policy_definition):
+    """Build the full RHACS policy object from a PCI-DSS policy definition"""
+    return {
         "name": policy_definition["name"],
         "description": policy_definition["description"],
         "rationale": policy_definition["rationale"],
@@ -351,20 +350,6 @@ def create_policy(policy_definition):
         "policySections": policy_definition["policySection"]
     }
 
-    url = f"{RHACS_URL}/v1/policies"
-
-    try:
-        response = requests.post(url, headers=HEADERS, json=policy, verify=VERIFY_SSL)
-
-        if response.status_code == 200:
-            return True, "Created successfully"
-        elif response.status_code == 409:
-            return False, "Policy already exists"
-        else:
-            return False, f"Error: {response.status_code} - {response.text}"
-    except requests.exceptions.RequestException as e:
-        return False, f"Request failed: {e}"
-
 def main():
     print("=" * 80)
     print("PCI-DSS 4.0 Policy Creation for RHACS")
@@ -374,28 +359,24 @@ def main():
     print(f"Total policies to create: {len(PCI_DSS_POLICIES)}")
     print()
 
-    created = 0
-    skipped = 0
-    failed = 0
+    policies = [build_policy(policy_def) for policy_def in PCI_DSS_POLICIES]
+    summary = deploy_policies(CLIENT, policies, skip_existing=False, max_workers=MAX_WORKERS,
+                              batch_size=IMPORT_BATCH_SIZE)
 
-    for policy_def in PCI_DSS_POLICIES:
-        policy_name = policy_def["name"]
-        print(f"Creating: {policy_name}")
-
-        success, message = create_policy(policy_def)
-
-        if success:
-            print(f"  ✓ {message}")
-            created += 1
-        elif "already exists" in message:
-            print(f"  ⊙ {message}")
-            skipped += 1
+    for result in summary.results:
+        print(f"Creating: {result.name}")
+        if result.created:
+            print("  ✓ Created successfully")
+        elif result.skipped:
+            print(f"  ⊙ {result.detail}")
         else:
-            print(f"  ✗ {message}")
-            failed += 1
-
+            print(f"  ✗ {result.detail}")
         print()
 
+    created = summary.created
+    skipped = summary.skipped
+    failed = summary.failed
+
     print("=" * 80)
     print("PCI-DSS 4.0 Policy Creation Summary")
     print("=" * 80)
@@ -49,26 +49,29 @@ mkdir -p "$OUTPUT_DIR"
 echo "Output directory: $OUTPUT_DIR"
 echo ""
 
-# Generate reports for each framework
-for framework in "${FRAMEWORKS[@]}"
-do
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-    echo "Generating report for: $framework"
-    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+# Generate reports for every framework in a single pass: policies,
+# deployments and alerts are downloaded once and shared by all frameworks
+FRAMEWORK_LIST=$(IFS=,; echo "${FRAMEWORKS[*]}")
 
-    if python3 universal_compliance_report.py --framework "$framework" > "$OUTPUT_DIR/${framework}_console.log" 2>&1; then
-        echo "✅ $framework: SUCCESS"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+echo "Generating reports for: $FRAMEWORK_LIST"
+echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 
-        # Move generated JSON to output directory
-        mv ${framework}_compliance_report_*.json "$OUTPUT_DIR/" 2>/dev/null || true
+if ! python3 universal_compliance_report.py --frameworks "$FRAMEWORK_LIST" --output-dir "$OUTPUT_DIR" > "$OUTPUT_DIR/console.log" 2>&1; then
+    echo "❌ Report generation FAILED (check ${OUTPUT_DIR}/console.log)"
+fi
 
+for framework in "${FRAMEWORKS[@]}"
+do
+    if ls "$OUTPUT_DIR"/${framework}_compliance_report_*.json > /dev/null 2>&1; then
+        echo "✅ $framework: SUCCESS"
         GENERATED_COUNT=$((GENERATED_COUNT + 1))
     else
-        echo "❌ $framework: FAILED (check ${OUTPUT_DIR}/${framework}_console.log)"
+        echo "❌ $framework: FAILED (check ${OUTPUT_DIR}/console.log)"
         FAILED_COUNT=$((FAILED_COUNT + 1))
     fi
-    echo ""
 done
+echo ""
 
 echo "╔════════════════════════════════════════════════════════════════╗"
 echo "║   Report Generation Complete                                   ║"
@@ -113,7 +116,8 @@ cat > "$INDEX_FILE" << 'EOF'
             <tr>
                 <th>Framework</th>
                 <th>Report</th>
-                <th>Console Log</th>
+                <th>Dashboard</th>
+                <th>CSV</th>
             </tr>
         </thead>
         <tbody>
@@ -124,10 +128,13 @@ do
     json_file=$(ls "$OUTPUT_DIR"/${framework}_compliance_report_*.json 2>/dev/null | head -1)
     if [ -n "$json_file" ]; then
         json_basename=$(basename "$json_file")
+        html_basename=$(basename "$(ls "$OUTPUT_DIR"/${framework}_compliance_dashboard_*.html 2>/dev/null | head -1)")
+        csv_basename=$(basename "$(ls "$OUTPUT_DIR"/${framework}_compliance_summary_*.csv 2>/dev/null | head -1)")
         echo "            <tr>" >> "$INDEX_FILE"
         echo "                <td>$framework</td>" >> "$INDEX_FILE"
         echo "                <td><a href=\"$json_basename\">JSON Report</a></td>" >> "$INDEX_FILE"
-        echo "                <td><a href=\"${framework}_console.log\">Console Log</a></td>" >> "$INDEX_FILE"
+        echo "                <td><a href=\"$html_basename\">HTML Dashboard</a></td>" >> "$INDEX_FILE"
+        echo "                <td><a href=\"$csv_basename\">CSV Summary</a></td>" >> "$INDEX_FILE"
         echo "            </tr>" >> "$INDEX_FILE"
     fi
 done
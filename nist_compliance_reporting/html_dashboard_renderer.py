@@ -0,0 +1,763 @@
+#!/usr/bin/env python3
+"""
+Red Hat branded HTML dashboard renderer for RHACS compliance snapshots.
+
+Used by report_renderers.py for two output formats:
+
+- ``html``: static page with every deployment as table markup. The page is
+  streamed to the output file section by section and row by row, so memory
+  use and write time stay linear in the number of deployments.
+- ``html-virtual``: same page, but deployments ship as a compact columnar JSON
+  blob and the table is rendered client-side with virtual scrolling, filtering
+  and sorting, keeping file size and browser render time flat for large fleets.
+"""
+
+import json
+import os
+
+
+# Output file buffer size; rows are small, so batch them into large writes
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def render_html(snapshot, output_dir='.'):
+    """Render the Red Hat branded HTML dashboard for a ComplianceSnapshot"""
+    html_file = os.path.join(output_dir, f"{snapshot.framework_id}_compliance_dashboard_{snapshot.timestamp}.html")
+    return _render(snapshot, html_file, virtual=False)
+
+
+def render_html_virtual(snapshot, output_dir='.'):
+    """Render the dashboard with a client-side virtualized deployment table"""
+    html_file = os.path.join(output_dir, f"{snapshot.framework_id}_compliance_dashboard_virtual_{snapshot.timestamp}.html")
+    return _render(snapshot, html_file, virtual=True)
+
+
+def _render(snapshot, html_file, virtual):
+    print(f"\nGenerating HTML dashboard: {html_file}")
+
+    with open(html_file, 'w', buffering=WRITE_BUFFER_SIZE) as f:
+        _write_dashboard(f, snapshot, virtual)
+
+    print(f"✓ HTML dashboard saved: {html_file}")
+
+    return [html_file]
+
+
+def _write_dashboard(f, snapshot, virtual=False):
+    """Write the dashboard page to an open file"""
+    framework_name = snapshot.name
+    framework_full_name = snapshot.full_name
+
+    # Calculate statistics
+    total_clusters = snapshot.total_clusters
+    total_namespaces = snapshot.total_namespaces
+    total_deployments = snapshot.total_deployments
+    policy_stats = snapshot.policy_stats()
+    total_compliant, total_noncompliant = snapshot.deployment_compliance()
+
+    overall_pass_rate = (total_compliant / total_deployments * 100) if total_deployments > 0 else 0
+    extra_css = VIRTUAL_TABLE_CSS if virtual else ''
+
+    # Page head, summary cards and policy table header with Red Hat branding
+    f.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{framework_name} Compliance Dashboard | Red Hat Advanced Cluster Security</title>
+    <link href="https://fonts.googleapis.com/css2?family=Red+Hat+Display:wght@400;500;700;900&family=Red+Hat+Text:wght@400;500;700&display=swap" rel="stylesheet">
+    <style>
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+
+        body {{
+            font-family: 'Red Hat Text', 'Helvetica Neue', Arial, sans-serif;
+            background: #F5F5F5;
+            color: #151515;
+            line-height: 1.6;
+        }}
+
+        .header {{
+            background: linear-gradient(135deg, #EE0000 0%, #A30000 100%);
+            color: white;
+            padding: 2.5rem 2rem;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.15);
+        }}
+
+        .header h1 {{
+            font-family: 'Red Hat Display', sans-serif;
+            font-size: 2.5rem;
+            font-weight: 900;
+            margin-bottom: 0.5rem;
+            letter-spacing: -0.5px;
+        }}
+
+        .header .subtitle {{
+            font-size: 1.1rem;
+            opacity: 0.95;
+            font-weight: 400;
+        }}
+
+        .header .framework-info {{
+            margin-top: 1rem;
+            padding-top: 1rem;
+            border-top: 1px solid rgba(255,255,255,0.3);
+            font-size: 0.95rem;
+            opacity: 0.9;
+        }}
+
+        .container {{
+            max-width: 1400px;
+            margin: 0 auto;
+            padding: 2rem;
+        }}
+
+        .stats-grid {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+            gap: 1.5rem;
+            margin-bottom: 2rem;
+        }}
+
+        .stat-card {{
+            background: white;
+            border-radius: 8px;
+            padding: 1.5rem;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+            border-left: 4px solid #EE0000;
+            transition: transform 0.2s, box-shadow 0.2s;
+        }}
+
+        .stat-card:hover {{
+            transform: translateY(-2px);
+            box-shadow: 0 4px 16px rgba(0,0,0,0.12);
+        }}
+
+        .stat-card h3 {{
+            font-family: 'Red Hat Display', sans-serif;
+            color: #6A6E73;
+            font-size: 0.9rem;
+            font-weight: 500;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            margin-bottom: 0.5rem;
+        }}
+
+        .stat-card .value {{
+            font-family: 'Red Hat Display', sans-serif;
+            font-size: 2.5rem;
+            font-weight: 700;
+            color: #151515;
+            line-height: 1;
+        }}
+
+        .stat-card.success {{
+            border-left-color: #3E8635;
+        }}
+
+        .stat-card.success .value {{
+            color: #3E8635;
+        }}
+
+        .stat-card.danger {{
+            border-left-color: #C9190B;
+        }}
+
+        .stat-card.danger .value {{
+            color: #C9190B;
+        }}
+
+        .section {{
+            background: white;
+            border-radius: 8px;
+            padding: 2rem;
+            margin-bottom: 2rem;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+        }}
+
+        .section h2 {{
+            font-family: 'Red Hat Display', sans-serif;
+            font-size: 1.75rem;
+            font-weight: 700;
+            color: #151515;
+            margin-bottom: 1.5rem;
+            padding-bottom: 0.75rem;
+            border-bottom: 2px solid #EE0000;
+        }}
+
+        table {{
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 1rem;
+        }}
+
+        th {{
+            background: #F5F5F5;
+            color: #151515;
+            font-family: 'Red Hat Display', sans-serif;
+            font-weight: 700;
+            text-align: left;
+            padding: 1rem;
+            font-size: 0.9rem;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            border-bottom: 2px solid #EE0000;
+        }}
+
+        td {{
+            padding: 1rem;
+            border-bottom: 1px solid #EDEDED;
+        }}
+
+        tr:hover {{
+            background: #FAFAFA;
+        }}
+
+        .pass {{
+            color: #3E8635;
+            font-weight: 700;
+        }}
+
+        .fail {{
+            color: #C9190B;
+            font-weight: 700;
+        }}
+
+        .badge {{
+            display: inline-block;
+            padding: 0.25rem 0.75rem;
+            border-radius: 12px;
+            font-size: 0.85rem;
+            font-weight: 600;
+        }}
+
+        .badge.pass {{
+            background: #F0F8EF;
+            color: #3E8635;
+        }}
+
+        .badge.fail {{
+            background: #FDF1F0;
+            color: #C9190B;
+        }}
+
+        .progress-bar {{
+            width: 100%;
+            height: 24px;
+            background: #EDEDED;
+            border-radius: 4px;
+            overflow: hidden;
+            margin-top: 0.5rem;
+        }}
+
+        .progress-fill {{
+            height: 100%;
+            background: linear-gradient(90deg, #3E8635 0%, #5BA352 100%);
+            transition: width 0.3s;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            color: white;
+            font-weight: 700;
+            font-size: 0.85rem;
+        }}
+
+        .footer {{
+            text-align: center;
+            padding: 2rem;
+            color: #6A6E73;
+            font-size: 0.9rem;
+        }}
+
+        .footer a {{
+            color: #EE0000;
+            text-decoration: none;
+            font-weight: 600;
+        }}
+
+        .footer a:hover {{
+            text-decoration: underline;
+        }}
+
+        @media print {{
+            .header {{
+                background: #EE0000;
+                color: white;
+            }}
+            .stat-card, .section {{
+                box-shadow: none;
+                border: 1px solid #EDEDED;
+            }}
+        }}
+{extra_css}    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{framework_name} Compliance Dashboard</h1>
+        <div class="subtitle">Red Hat Advanced Cluster Security</div>
+        <div class="framework-info">
+            <strong>{framework_full_name}</strong><br>
+            Generated: {snapshot.generated.strftime('%B %d, %Y at %I:%M %p')}
+        </div>
+    </div>
+
+    <div class="container">
+        <div class="stats-grid">
+            <div class="stat-card">
+                <h3>Total Deployments</h3>
+                <div class="value">{total_deployments}</div>
+            </div>
+            <div class="stat-card success">
+                <h3>Compliant</h3>
+                <div class="value">{total_compliant}</div>
+            </div>
+            <div class="stat-card danger">
+                <h3>Non-Compliant</h3>
+                <div class="value">{total_noncompliant}</div>
+            </div>
+            <div class="stat-card">
+                <h3>Compliance Rate</h3>
+                <div class="value">{overall_pass_rate:.1f}%</div>
+            </div>
+            <div class="stat-card">
+                <h3>Total Policies</h3>
+                <div class="value">{len(snapshot.policies)}</div>
+            </div>
+            <div class="stat-card">
+                <h3>Clusters</h3>
+                <div class="value">{total_clusters}</div>
+            </div>
+            <div class="stat-card">
+                <h3>Namespaces</h3>
+                <div class="value">{total_namespaces}</div>
+            </div>
+        </div>
+
+        <div class="section">
+            <h2>Policy Compliance Summary</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Policy</th>
+                        <th style="text-align: center;">Total</th>
+                        <th style="text-align: center;">Passed</th>
+                        <th style="text-align: center;">Failed</th>
+                        <th>Pass Rate</th>
+                    </tr>
+                </thead>
+                <tbody>
+""")
+
+    # Add policy rows
+    for policy_name in sorted(policy_stats.keys()):
+        stats = policy_stats[policy_name]
+        total = stats['total']
+        passed = stats['pass']
+        failed = stats['fail']
+        pass_rate = (passed / total * 100) if total > 0 else 0
+
+        f.write(f"""
+                    <tr>
+                        <td style="font-weight: 500;">{policy_name}</td>
+                        <td style="text-align: center;">{total}</td>
+                        <td style="text-align: center;" class="pass">{passed}</td>
+                        <td style="text-align: center;" class="fail">{failed}</td>
+                        <td>
+                            <div class="progress-bar">
+                                <div class="progress-fill" style="width: {pass_rate}%;">
+                                    {pass_rate:.1f}%
+                                </div>
+                            </div>
+                        </td>
+                    </tr>
+""")
+
+    f.write("""
+                </tbody>
+            </table>
+        </div>
+""")
+
+    if virtual:
+        _write_virtual_deployments(f, snapshot)
+    else:
+        _write_static_deployments(f, snapshot)
+
+    f.write(f"""
+        </div>
+    </div>
+
+    <div class="footer">
+        <p>Generated by <a href="https://www.redhat.com/en/technologies/cloud-computing/openshift/advanced-cluster-security-kubernetes" target="_blank">Red Hat Advanced Cluster Security</a></p>
+        <p style="margin-top: 0.5rem; font-size: 0.85rem;">Framework: {framework_full_name}</p>
+    </div>
+""")
+
+    if virtual:
+        f.write(VIRTUAL_TABLE_SCRIPT)
+
+    f.write("""</body>
+</html>
+""")
+
+
+def _write_static_deployments(f, snapshot):
+    """Write the deployment table with one <tr> per deployment"""
+    f.write("""
+        <div class="section">
+            <h2>Deployment Details</h2>
+            <table>
+                <thead>
+                    <tr>
+                        <th>Cluster</th>
+                        <th>Namespace</th>
+                        <th>Deployment</th>
+                        <th style="text-align: center;">Policies</th>
+                        <th style="text-align: center;">Passed</th>
+                        <th style="text-align: center;">Failed</th>
+                        <th style="text-align: center;">Status</th>
+                    </tr>
+                </thead>
+                <tbody>
+""")
+
+    # Add deployment rows
+    total = len(snapshot.matrix.policy_names)
+    for cluster, namespace, deployment, row in snapshot.iter_deployment_results():
+        failed = snapshot.matrix.failed_count(row)
+        passed = total - failed
+        status = 'PASS' if failed == 0 else 'FAIL'
+        status_class = 'pass' if status == 'PASS' else 'fail'
+
+        f.write(f"""
+                    <tr>
+                        <td>{cluster}</td>
+                        <td>{namespace}</td>
+                        <td style="font-weight: 500;">{deployment}</td>
+                        <td style="text-align: center;">{total}</td>
+                        <td style="text-align: center;" class="pass">{passed}</td>
+                        <td style="text-align: center;" class="fail">{failed}</td>
+                        <td style="text-align: center;">
+                            <span class="badge {status_class}">{status}</span>
+                        </td>
+                    </tr>
+""")
+
+    f.write("""
+                </tbody>
+            </table>""")
+
+
+def _json_script_value(value):
+    """Encode a value as JSON that is safe to embed in a <script> element"""
+    return json.dumps(value, separators=(',', ':')).replace('</', '<\\/')
+
+
+def _write_virtual_deployments(f, snapshot):
+    """
+    Write the deployment section as filter controls, a virtual scroll viewport
+    and the deployment rows as a columnar JSON blob.
+
+    Rows are in cluster/namespace/deployment order; clusters and namespaces
+    are sent once and referenced by index.
+    """
+    matrix = snapshot.matrix
+    rows = matrix.sorted_rows()
+
+    f.write("""
+        <div class="section">
+            <h2>Deployment Details</h2>
+            <div class="filters">
+                <input type="search" id="filter-text" placeholder="Filter deployments...">
+                <select id="filter-cluster"><option value="">All clusters</option></select>
+                <select id="filter-namespace"><option value="">All namespaces</option></select>
+                <select id="filter-status">
+                    <option value="">All statuses</option>
+                    <option value="PASS">PASS</option>
+                    <option value="FAIL">FAIL</option>
+                </select>
+                <span id="row-count" class="row-count"></span>
+            </div>
+            <div class="vtable">
+                <div class="vrow vhead">
+                    <div data-sort="cluster">Cluster</div>
+                    <div data-sort="namespace">Namespace</div>
+                    <div data-sort="deployment">Deployment</div>
+                    <div data-sort="policies" class="num">Policies</div>
+                    <div data-sort="passed" class="num">Passed</div>
+                    <div data-sort="failed" class="num">Failed</div>
+                    <div data-sort="status" class="num">Status</div>
+                </div>
+                <div id="vviewport" class="vviewport">
+                    <div id="vspacer"></div>
+                    <div id="vrows" class="vrows"></div>
+                </div>
+            </div>
+            <script type="application/json" id="compliance-data">""")
+
+    f.write('{"policies":%d' % len(matrix.policy_names))
+    f.write(',"clusters":' + _json_script_value(matrix.clusters))
+    f.write(',"namespaces":' + _json_script_value(matrix.namespaces))
+    f.write(',"cluster":' + _json_script_value([matrix.row_cluster[row] for row in rows]))
+    f.write(',"namespace":' + _json_script_value([matrix.row_namespace[row] for row in rows]))
+    f.write(',"deployment":' + _json_script_value([matrix.deployment_names[row] for row in rows]))
+    f.write(',"failed":' + _json_script_value([matrix.failed_count(row) for row in rows]))
+    f.write('}</script>')
+
+
+VIRTUAL_TABLE_CSS = """
+        .filters {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 0.75rem;
+            align-items: center;
+            margin-bottom: 1rem;
+        }
+
+        .filters input, .filters select {
+            font-family: inherit;
+            font-size: 0.95rem;
+            padding: 0.5rem 0.75rem;
+            border: 1px solid #D2D2D2;
+            border-radius: 4px;
+            background: white;
+        }
+
+        .filters input {
+            flex: 1 1 240px;
+        }
+
+        .row-count {
+            color: #6A6E73;
+            font-size: 0.9rem;
+        }
+
+        .vtable {
+            border-top: 1px solid #EDEDED;
+        }
+
+        .vrow {
+            display: grid;
+            grid-template-columns: 1.2fr 1.2fr 2fr 0.7fr 0.7fr 0.7fr 0.8fr;
+            align-items: center;
+            height: 44px;
+            border-bottom: 1px solid #EDEDED;
+        }
+
+        .vrow > div {
+            padding: 0 1rem;
+            overflow: hidden;
+            white-space: nowrap;
+            text-overflow: ellipsis;
+        }
+
+        .vrow .num {
+            text-align: center;
+        }
+
+        .vhead {
+            background: #F5F5F5;
+            font-family: 'Red Hat Display', sans-serif;
+            font-weight: 700;
+            font-size: 0.9rem;
+            text-transform: uppercase;
+            letter-spacing: 0.5px;
+            border-bottom: 2px solid #EE0000;
+        }
+
+        .vhead > div {
+            cursor: pointer;
+            user-select: none;
+        }
+
+        .vhead > div.asc::after {
+            content: " \\25B2";
+        }
+
+        .vhead > div.desc::after {
+            content: " \\25BC";
+        }
+
+        .vviewport {
+            position: relative;
+            height: 600px;
+            overflow-y: auto;
+        }
+
+        .vrows {
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+        }
+
+        .vrows .vrow:hover {
+            background: #FAFAFA;
+        }
+"""
+
+VIRTUAL_TABLE_SCRIPT = """    <script>
+    (function () {
+        var ROW_HEIGHT = 44;
+        var OVERSCAN = 10;
+        var data = JSON.parse(document.getElementById('compliance-data').textContent);
+        var total = data.deployment.length;
+        var viewport = document.getElementById('vviewport');
+        var spacer = document.getElementById('vspacer');
+        var rows = document.getElementById('vrows');
+        var rowCount = document.getElementById('row-count');
+        var filterText = document.getElementById('filter-text');
+        var filterCluster = document.getElementById('filter-cluster');
+        var filterNamespace = document.getElementById('filter-namespace');
+        var filterStatus = document.getElementById('filter-status');
+        var order = [];
+        var sortKey = null;
+        var sortDir = 1;
+
+        var sortValues = {
+            cluster: function (i) { return String(data.clusters[data.cluster[i]]); },
+            namespace: function (i) { return String(data.namespaces[data.namespace[i]]); },
+            deployment: function (i) { return String(data.deployment[i]); },
+            policies: function (i) { return data.policies; },
+            passed: function (i) { return data.policies - data.failed[i]; },
+            failed: function (i) { return data.failed[i]; },
+            status: function (i) { return data.failed[i] ? 1 : 0; }
+        };
+
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"]/g, function (c) {
+                return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+            });
+        }
+
+        function addOption(select, value, label) {
+            var option = document.createElement('option');
+            option.value = value;
+            option.textContent = label;
+            select.appendChild(option);
+        }
+
+        // Namespaces present in each cluster, for the dependent namespace filter
+        var clusterNamespaces = data.clusters.map(function () { return {}; });
+        for (var i = 0; i < total; i++) {
+            clusterNamespaces[data.cluster[i]][data.namespace[i]] = true;
+        }
+
+        function byName(names) {
+            return function (a, b) { return String(names[a]).localeCompare(String(names[b])); };
+        }
+
+        data.clusters.map(function (_, c) { return c; }).sort(byName(data.clusters)).forEach(function (c) {
+            addOption(filterCluster, c, data.clusters[c]);
+        });
+
+        function fillNamespaces() {
+            var selected = filterNamespace.value;
+            var allowed = filterCluster.value === '' ? null : clusterNamespaces[+filterCluster.value];
+            filterNamespace.length = 1;
+            data.namespaces.map(function (_, n) { return n; }).sort(byName(data.namespaces)).forEach(function (n) {
+                if (!allowed || allowed[n]) {
+                    addOption(filterNamespace, n, data.namespaces[n]);
+                }
+            });
+            filterNamespace.value = selected;
+            if (filterNamespace.selectedIndex < 0) {
+                filterNamespace.value = '';
+            }
+        }
+
+        function compare(a, b) {
+            var x = sortValues[sortKey](a);
+            var y = sortValues[sortKey](b);
+            if (x < y) return -sortDir;
+            if (x > y) return sortDir;
+            return a - b;
+        }
+
+        function applyFilters() {
+            var text = filterText.value.toLowerCase();
+            var cluster = filterCluster.value === '' ? -1 : +filterCluster.value;
+            var namespace = filterNamespace.value === '' ? -1 : +filterNamespace.value;
+            var status = filterStatus.value;
+            order = [];
+            for (var i = 0; i < total; i++) {
+                if (cluster >= 0 && data.cluster[i] !== cluster) continue;
+                if (namespace >= 0 && data.namespace[i] !== namespace) continue;
+                if (status === 'PASS' && data.failed[i]) continue;
+                if (status === 'FAIL' && !data.failed[i]) continue;
+                if (text && String(data.deployment[i]).toLowerCase().indexOf(text) === -1) continue;
+                order.push(i);
+            }
+            if (sortKey) {
+                order.sort(compare);
+            }
+            rowCount.textContent = order.length + ' of ' + total + ' deployments';
+            spacer.style.height = (order.length * ROW_HEIGHT) + 'px';
+            viewport.scrollTop = 0;
+            render();
+        }
+
+        function render() {
+            var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            var last = Math.min(order.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            var html = [];
+            for (var k = first; k < last; k++) {
+                var i = order[k];
+                var failed = data.failed[i];
+                var status = failed ? 'FAIL' : 'PASS';
+                html.push(
+                    '<div class="vrow">' +
+                    '<div>' + escapeHtml(data.clusters[data.cluster[i]]) + '</div>' +
+                    '<div>' + escapeHtml(data.namespaces[data.namespace[i]]) + '</div>' +
+                    '<div style="font-weight: 500;">' + escapeHtml(data.deployment[i]) + '</div>' +
+                    '<div class="num">' + data.policies + '</div>' +
+                    '<div class="num pass">' + (data.policies - failed) + '</div>' +
+                    '<div class="num fail">' + failed + '</div>' +
+                    '<div class="num"><span class="badge ' + status.toLowerCase() + '">' + status + '</span></div>' +
+                    '</div>'
+                );
+            }
+            rows.style.transform = 'translateY(' + (first * ROW_HEIGHT) + 'px)';
+            rows.innerHTML = html.join('');
+        }
+
+        var pending = false;
+        viewport.addEventListener('scroll', function () {
+            if (!pending) {
+                pending = true;
+                window.requestAnimationFrame(function () {
+                    pending = false;
+                    render();
+                });
+            }
+        });
+
+        Array.prototype.forEach.call(document.querySelectorAll('.vhead [data-sort]'), function (header) {
+            header.addEventListener('click', function () {
+                var key = header.getAttribute('data-sort');
+                sortDir = sortKey === key ? -sortDir : 1;
+                sortKey = key;
+                Array.prototype.forEach.call(document.querySelectorAll('.vhead [data-sort]'), function (other) {
+                    other.className = other.className.replace(/ ?(asc|desc)/g, '');
+                });
+                header.className += sortDir > 0 ? ' asc' : ' desc';
+                applyFilters();
+            });
+        });
+
+        filterText.addEventListener('input', applyFilters);
+        filterCluster.addEventListener('change', function () {
+            fillNamespaces();
+            applyFilters();
+        });
+        filterNamespace.addEventListener('change', applyFilters);
+        filterStatus.addEventListener('change', applyFilters);
+
+        fillNamespaces();
+        applyFilters();
+    })();
+    </script>
+"""
@@ -7,21 +7,23 @@ It fetches all policies with NIST 800-190 in their name, retrieves violations,
 and generates a report showing Pass/Fail status for each deployment in each namespace and cluster.
 """
 
-import requests
 import json
 import os
 import sys
 from collections import defaultdict
 from datetime import datetime
-import urllib3
 
-# Disable SSL warnings for demo environment
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+# Make the shared RHACS client in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from rhacs_client import RHACSClient, DEFAULT_PAGE_SIZE
+from compliance_data import collect_policy_violations
+from snapshot_cache import CachedClient, SnapshotCache
 
 # RHACS Configuration from environment variables
 RHACS_URL = os.getenv('RHACS_URL')
 API_TOKEN = os.getenv('RHACS_API_TOKEN')
 VERIFY_SSL = os.getenv('RHACS_VERIFY_SSL', 'false').lower() == 'true'
+PAGE_SIZE = int(os.getenv('RHACS_PAGE_SIZE', DEFAULT_PAGE_SIZE))
 
 # Validate required environment variables
 if not RHACS_URL:
@@ -34,57 +36,27 @@ if not API_TOKEN:
     print("Please set: export RHACS_API_TOKEN='your-api-token'")
     sys.exit(1)
 
-HEADERS = {
-    "Authorization": f"Bearer {API_TOKEN}",
-    "Content-Type": "application/json"
-}
-
-def api_request(endpoint, params=None):
-    """Make API request to RHACS"""
-    url = f"{RHACS_URL}{endpoint}"
-    try:
-        response = requests.get(url, headers=HEADERS, params=params, verify=VERIFY_SSL)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making API request to {endpoint}: {e}")
-        return None
+# Shared pooled client reused for every API call in this run, read through
+# the local report cache when RHACS_CACHE_TTL enables it (RHACS_CACHE_DIR)
+CLIENT = CachedClient(
+    RHACSClient(RHACS_URL, API_TOKEN, verify_ssl=VERIFY_SSL, page_size=PAGE_SIZE),
+    SnapshotCache.from_env(RHACS_URL)
+)
 
 def get_nist_policies():
     """Fetch all NIST 800-190 policies"""
     print("Fetching NIST 800-190 policies...")
-    data = api_request("/v1/policies", params={"query": "Category:NIST"})
-
-    if not data or 'policies' not in data:
-        print("No policies found")
-        return []
+    policies = CLIENT.iter_policies("Category:NIST")
 
     # Filter for NIST-800-190 policies
-    nist_policies = [p for p in data['policies'] if 'NIST-800-190' in p.get('name', '')]
+    nist_policies = [p for p in policies if 'NIST-800-190' in p.get('name', '')]
     print(f"Found {len(nist_policies)} NIST 800-190 policies")
     return nist_policies
 
-def get_policy_violations(policy_id):
-    """Fetch violations for a specific policy"""
-    data = api_request(f"/v1/alerts", params={"query": f"Policy Id:{policy_id}"})
-
-    if not data or 'alerts' not in data:
-        return []
-
-    return data['alerts']
-
 def get_all_deployments():
-    """Fetch all deployments from RHACS"""
+    """Stream all deployments from RHACS page by page"""
     print("Fetching deployments...")
-    data = api_request("/v1/deployments")
-
-    if not data or 'deployments' not in data:
-        print("No deployments found")
-        return []
-
-    deployments = data['deployments']
-    print(f"Found {len(deployments)} deployments")
-    return deployments
+    return CLIENT.iter_deployments()
 
 def generate_compliance_report():
     """Generate NIST 800-190 compliance report"""
@@ -106,28 +78,9 @@ def generate_compliance_report():
     # Create structure: cluster -> namespace -> deployment -> policy results
     compliance_data = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
 
-    # Track which policies have violations
-    policies_with_violations = defaultdict(set)
-
+    # Track which policies have violations, fetched in bulk for all policies
     print("\nAnalyzing policy violations...")
-    # For each policy, get violations and map to deployments
-    for policy in policies:
-        policy_id = policy['id']
-        policy_name = policy['name']
-        print(f"  Checking policy: {policy_name}")
-
-        violations = get_policy_violations(policy_id)
-
-        # Track deployments with violations for this policy
-        for violation in violations:
-            deployment_info = violation.get('deployment', {})
-            deployment_id = deployment_info.get('id')
-            deployment_name = deployment_info.get('name')
-            namespace = deployment_info.get('namespace')
-            cluster_name = deployment_info.get('clusterName', 'Unknown')
-
-            if deployment_id:
-                policies_with_violations[deployment_id].add(policy_id)
+    policies_with_violations = collect_policy_violations(CLIENT, [p['id'] for p in policies])
 
     # Build compliance report for all deployments
     for deployment in deployments:
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Report renderers for RHACS compliance snapshots.
+
+Each renderer takes a ComplianceSnapshot and an output directory, writes its
+files and returns their paths. Renderers are registered by format name so a
+single collection run can be written out as any combination of formats, e.g.
+``--format json,csv,html``.
+"""
+
+import csv
+import json
+import os
+import sys
+
+from html_dashboard_renderer import render_html, render_html_virtual
+
+# Format name -> renderer(snapshot, output_dir) -> list of written files
+RENDERERS = {}
+
+# Formats written when a run does not choose any
+DEFAULT_FORMATS = ['json', 'csv', 'html']
+
+
+def register_renderer(name, renderer):
+    """Register a renderer for an output format"""
+    RENDERERS[name] = renderer
+
+
+def parse_formats(selection):
+    """Expand a comma-separated --format value into known format names"""
+    formats = [fmt.strip().lower() for fmt in selection.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+    if unknown or not formats:
+        print(f"ERROR: Unknown report format(s): {', '.join(unknown) or selection}")
+        print(f"Available formats: {', '.join(RENDERERS.keys())}")
+        sys.exit(1)
+    return formats
+
+
+def render_reports(snapshot, formats, output_dir='.'):
+    """Write a snapshot in every requested format and return all written files"""
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for fmt in formats:
+        written.extend(RENDERERS[fmt](snapshot, output_dir))
+    return written
+
+
+def _json_value(value, level):
+    """Encode a value as indent=2 JSON nested ``level`` levels deep"""
+    return json.dumps(value, indent=2, default=str).replace('\n', '\n' + '  ' * level)
+
+
+def _json_key(key):
+    """Encode a dict key the way json.dump does (non-string keys become strings)"""
+    return json.dumps(key if isinstance(key, str) else json.dumps(key))
+
+
+def _write_json_object(f, items, level, write_value):
+    """Write ``items`` (key, value) pairs as an indent=2 JSON object, one entry at a time"""
+    pad = '  ' * (level + 1)
+    first = True
+    for key, value in items:
+        f.write('{\n' if first else ',\n')
+        f.write(f"{pad}{_json_key(key)}: ")
+        write_value(value)
+        first = False
+    f.write('{}' if first else '\n' + '  ' * level + '}')
+
+
+def render_json(snapshot, output_dir='.'):
+    """
+    Export the compliance report for a framework to JSON.
+
+    The nested compliance_data object is streamed from the matrix one
+    deployment at a time rather than expanded in memory first.
+    """
+    matrix = snapshot.matrix
+    output_file = os.path.join(output_dir, f"{snapshot.framework_id}_compliance_report_{snapshot.timestamp}.json")
+
+    def write_deployments(rows):
+        _write_json_object(f, ((matrix.deployment_names[row], row) for row in rows), 3,
+                           lambda row: f.write(_json_value(matrix.row_results(row), 4)))
+
+    def write_namespaces(namespaces):
+        _write_json_object(f, namespaces, 2, write_deployments)
+
+    with open(output_file, 'w') as f:
+        f.write('{\n')
+        f.write(f'  "framework": {_json_value(snapshot.framework_info(), 1)},\n')
+        f.write(f'  "generated": {_json_value(snapshot.generated.isoformat(), 1)},\n')
+        f.write(f'  "policies": {_json_value([{"id": p["id"], "name": p["name"]} for p in snapshot.policies], 1)},\n')
+        f.write('  "compliance_data": ')
+        _write_json_object(f, matrix.grouped_rows(), 1, write_namespaces)
+        f.write('\n}')
+
+    print(f"\nDetailed report exported to: {output_file}")
+    return [output_file]
+
+
+def render_csv(snapshot, output_dir='.'):
+    """Write the detailed, deployment summary and policy summary CSV reports"""
+    matrix = snapshot.matrix
+    policy_columns = sorted(matrix.policy_columns.items())
+    framework_id = snapshot.framework_id
+    framework_name = snapshot.name
+    timestamp = snapshot.timestamp
+
+    # Generate 1: Detailed Report
+    detailed_file = os.path.join(output_dir, f"{framework_id}_compliance_detailed_{timestamp}.csv")
+    print(f"\nGenerating detailed report: {detailed_file}")
+
+    with open(detailed_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Cluster', 'Namespace', 'Deployment', 'Policy', 'Status', 'Framework'])
+
+        for cluster, namespace, deployment, row in snapshot.iter_deployment_results():
+            for policy_name, column in policy_columns:
+                writer.writerow([
+                    cluster,
+                    namespace,
+                    deployment,
+                    policy_name,
+                    'FAIL' if matrix.failed(row, column) else 'PASS',
+                    framework_name
+                ])
+
+    print(f"✓ Detailed report saved: {detailed_file}")
+
+    # Generate 2: Summary Report by Deployment
+    summary_file = os.path.join(output_dir, f"{framework_id}_compliance_summary_{timestamp}.csv")
+    print(f"Generating summary report: {summary_file}")
+
+    with open(summary_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Cluster', 'Namespace', 'Deployment', 'Total Policies', 'Passed', 'Failed', 'Pass Rate', 'Framework'])
+
+        total = len(policy_columns)
+        for cluster, namespace, deployment, row in snapshot.iter_deployment_results():
+            failed = matrix.failed_count(row)
+            passed = total - failed
+            pass_rate = f"{(passed/total*100):.1f}%" if total > 0 else "N/A"
+
+            writer.writerow([
+                cluster,
+                namespace,
+                deployment,
+                total,
+                passed,
+                failed,
+                pass_rate,
+                framework_name
+            ])
+
+    print(f"✓ Summary report saved: {summary_file}")
+
+    # Generate 3: Policy Summary Report
+    policy_summary_file = os.path.join(output_dir, f"{framework_id}_policy_summary_{timestamp}.csv")
+    print(f"Generating policy summary: {policy_summary_file}")
+
+    policy_stats = snapshot.policy_stats()
+
+    with open(policy_summary_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Policy', 'Total Deployments', 'Passed', 'Failed', 'Pass Rate', 'Framework'])
+
+        for policy_name in sorted(policy_stats.keys()):
+            stats = policy_stats[policy_name]
+            total = stats['total']
+            passed = stats['pass']
+            failed = stats['fail']
+            pass_rate = f"{(passed/total*100):.1f}%" if total > 0 else "N/A"
+
+            writer.writerow([
+                policy_name,
+                total,
+                passed,
+                failed,
+                pass_rate,
+                framework_name
+            ])
+
+    print(f"✓ Policy summary saved: {policy_summary_file}")
+
+    return [detailed_file, summary_file, policy_summary_file]
+
+
+register_renderer('json', render_json)
+register_renderer('csv', render_csv)
+register_renderer('html', render_html)
+register_renderer('html-virtual', render_html_virtual)
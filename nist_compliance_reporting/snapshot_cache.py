@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Local snapshot cache for RHACS report data.
+
+Report runs read policies, deployments and alerts through CachedClient. When
+caching is enabled (``--cache SECONDS`` or RHACS_CACHE_TTL; off by default so
+reports show live data), every list response is kept on disk keyed by Central
+URL, endpoint and query. Regenerating a report within the TTL is then served
+from disk without contacting Central, with a notice for every cached response
+used; ``--refresh`` forces a fresh download. With ``--async`` the list
+requests a report needs are fetched concurrently up front (prefetch) and the
+report then reads them from the cache.
+
+The responses used by a run can also be bundled into a single snapshot file
+(``--save-snapshot``) and replayed later with ``--offline`` to render reports
+with no Central access at all, e.g. in an air-gapped review environment.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+from rhacs_client import RHACSClient
+from async_rhacs_client import AsyncRHACSClient, DEFAULT_MAX_CONCURRENCY
+
+# Default on-disk cache location and entry lifetime in seconds (0 disables)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'rhacs-compliance')
+DEFAULT_CACHE_TTL = 0
+
+# Entry lifetime used by --cache without a value
+DEFAULT_CACHE_OPTION_TTL = 300
+
+SNAPSHOT_VERSION = 1
+
+
+def cache_key(central_url, endpoint, query):
+    """Stable cache key for one Central list request"""
+    raw = f"{central_url.rstrip('/')}|{endpoint}|{query or ''}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _write_json_atomic(path, data):
+    """Write JSON to a temporary file and move it into place"""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _policy_id_query(query):
+    """Policy IDs named by a "Policy Id:a,b,c" query, or None for any other query"""
+    if query and query.startswith('Policy Id:'):
+        return set(query[len('Policy Id:'):].split(','))
+    return None
+
+
+def policy_matches_query(policy, query):
+    """Evaluate the Category:/Policy:/Tag: policy queries used by the reports locally"""
+    if not query:
+        return True
+    field, _, value = query.partition(':')
+    if field == 'Category':
+        return any(value.lower() in category.lower() for category in policy.get('categories', []))
+    if field == 'Policy':
+        return value.lower() in policy.get('name', '').lower()
+    if field == 'Tag':
+        return value in policy.get('tags', [])
+    return False
+
+
+class SnapshotCache:
+    """Directory of cached Central responses, one JSON file per request key."""
+
+    def __init__(self, central_url, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL, refresh=False):
+        self.central_url = central_url.rstrip('/')
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.refresh = refresh
+
+    @classmethod
+    def from_env(cls, central_url, refresh=False, ttl=None):
+        """Build a cache from RHACS_CACHE_DIR and RHACS_CACHE_TTL; ``ttl`` overrides the latter"""
+        return cls(
+            central_url,
+            cache_dir=os.path.expanduser(os.getenv('RHACS_CACHE_DIR', DEFAULT_CACHE_DIR)),
+            ttl=int(os.getenv('RHACS_CACHE_TTL', DEFAULT_CACHE_TTL)) if ttl is None else ttl,
+            refresh=refresh
+        )
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, endpoint, query=None):
+        """Return the cached entry for a request, or None if missing, expired or refreshing"""
+        if not self.enabled or self.refresh:
+            return None
+        try:
+            with open(self._path(cache_key(self.central_url, endpoint, query))) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        age = time.time() - entry.get('fetched', 0)
+        if age > self.ttl:
+            return None
+        print(f"NOTE: using cached RHACS data for {endpoint}{f' ({query})' if query else ''} "
+              f"fetched {age:.0f}s ago; pass --refresh (or unset RHACS_CACHE_TTL) for live data")
+        return entry
+
+    def put(self, endpoint, query, records):
+        """Store a response and return the cache entry"""
+        entry = {
+            'endpoint': endpoint,
+            'query': query,
+            'fetched': time.time(),
+            'records': records
+        }
+        if self.enabled:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                _write_json_atomic(self._path(cache_key(self.central_url, endpoint, query)), entry)
+            except OSError as e:
+                print(f"Warning: could not write report cache: {e}")
+        return entry
+
+
+class CachedClient:
+    """
+    Read-through cache in front of RHACSClient for the report data endpoints.
+
+    Exposes the same iter_policies/iter_deployments/iter_alerts/export_policies
+    calls the reporting code uses. With ``snapshot`` set it remembers every
+    entry it served so the run can be saved as an offline snapshot. With
+    neither the cache nor snapshots enabled, listings stream straight from
+    RHACSClient's lazy pagination instead of being held in memory.
+    """
+
+    def __init__(self, client, cache, snapshot=False):
+        self.client = client
+        self.cache = cache
+        self.snapshot = snapshot
+        self.central_url = client.central_url
+        self.entries = {}
+
+    @property
+    def retains(self):
+        """Whether responses are kept (on disk or for a snapshot) rather than streamed"""
+        return self.cache.enabled or self.snapshot
+
+    def _fetch(self, endpoint, query, loader):
+        key = cache_key(self.central_url, endpoint, query)
+        entry = self.entries.get(key) or self.cache.get(endpoint, query)
+        if entry is None:
+            entry = self.cache.put(endpoint, query, loader())
+        if self.snapshot:
+            self.entries[key] = entry
+        return entry['records']
+
+    def _iter(self, endpoint, query, lister):
+        entry = self.entries.get(cache_key(self.central_url, endpoint, query))
+        if entry is not None:
+            return iter(entry['records'])
+        if not self.retains:
+            return lister(query)
+        return iter(self._fetch(endpoint, query, lambda: list(lister(query))))
+
+    def prefetch(self, requests, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """
+        Fetch several (endpoint, query) list requests concurrently.
+
+        Requests already served by this run or the on-disk cache are skipped;
+        the rest overlap on one event loop through AsyncRHACSClient, and later
+        iter_* calls for the same requests are answered from memory (the
+        prefetched listings are held for the rest of the run).
+        """
+        missing = []
+        for endpoint, query in requests:
+            key = cache_key(self.central_url, endpoint, query)
+            if key in self.entries or (endpoint, query) in missing:
+                continue
+            entry = self.cache.get(endpoint, query)
+            if entry is not None:
+                self.entries[key] = entry
+            else:
+                missing.append((endpoint, query))
+        if not missing:
+            return
+
+        async def _fetch_all():
+            async with AsyncRHACSClient.from_client(self.client, max_concurrency) as async_client:
+                listers = {
+                    '/v1/policies': async_client.list_policies,
+                    '/v1/deployments': async_client.list_deployments,
+                    '/v1/alerts': async_client.list_alerts
+                }
+                return await asyncio.gather(*(listers[endpoint](query) for endpoint, query in missing))
+
+        for (endpoint, query), records in zip(missing, asyncio.run(_fetch_all())):
+            self.entries[cache_key(self.central_url, endpoint, query)] = self.cache.put(endpoint, query, records)
+
+    def iter_policies(self, query=None):
+        return self._iter('/v1/policies', query, self.client.iter_policies)
+
+    def iter_deployments(self, query=None):
+        return self._iter('/v1/deployments', query, self.client.iter_deployments)
+
+    def iter_alerts(self, query=None):
+        return self._iter('/v1/alerts', query, self.client.iter_alerts)
+
+    def export_policies(self, policy_ids):
+        query = ','.join(sorted(policy_ids))
+        return self._fetch('/v1/policies/export', query, lambda: self.client.export_policies(policy_ids))
+
+    def save_snapshot(self, path):
+        """Bundle every response used by this run into a single snapshot file"""
+        _write_json_atomic(path, {
+            'version': SNAPSHOT_VERSION,
+            'central_url': self.central_url,
+            'created': datetime.now().isoformat(),
+            'entries': self.entries
+        })
+        print(f"\nSnapshot saved: {path} ({len(self.entries)} responses)")
+
+
+class OfflineClient:
+    """Serves report data from a saved snapshot file without contacting Central."""
+
+    def __init__(self, snapshot):
+        self.central_url = snapshot['central_url']
+        self.created = snapshot.get('created', 'unknown')
+        self.entries = snapshot['entries']
+
+    @classmethod
+    def load(cls, path):
+        """Load a snapshot written with --save-snapshot"""
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Cannot read snapshot {path}: {e}")
+            sys.exit(1)
+        if snapshot.get('version') != SNAPSHOT_VERSION:
+            print(f"ERROR: Unsupported snapshot version in {path}: {snapshot.get('version')}")
+            sys.exit(1)
+        print(f"Offline mode: using snapshot of {snapshot['central_url']} taken {snapshot.get('created', 'unknown')}")
+        return cls(snapshot)
+
+    def _entry(self, endpoint, query):
+        return self.entries.get(cache_key(self.central_url, endpoint, query))
+
+    def _missing(self, endpoint, query):
+        print(f"ERROR: Snapshot has no data for {endpoint} (query: {query or 'none'})")
+        print("Re-create it with --save-snapshot using the same report options, or with --frameworks all")
+        sys.exit(1)
+
+    def _records(self, endpoint, query):
+        entry = self._entry(endpoint, query)
+        if entry is None:
+            self._missing(endpoint, query)
+        return entry['records']
+
+    def iter_policies(self, query=None):
+        entry = self._entry('/v1/policies', query)
+        if entry is not None:
+            return iter(entry['records'])
+
+        # Answer a filtered query from the full policy list, using exported
+        # definitions (which carry categories) where the snapshot has them
+        full = self._entry('/v1/policies', None)
+        if full is None:
+            self._missing('/v1/policies', query)
+        definitions = {
+            policy['id']: policy
+            for export in self.entries.values()
+            if export['endpoint'] == '/v1/policies/export'
+            for policy in export['records']
+        }
+        policies = [definitions.get(p['id'], p) for p in full['records']]
+        return iter([p for p in policies if policy_matches_query(p, query)])
+
+    def iter_deployments(self, query=None):
+        return iter(self._records('/v1/deployments', query))
+
+    def iter_alerts(self, query=None):
+        entry = self._entry('/v1/alerts', query)
+        if entry is not None:
+            return iter(entry['records'])
+
+        # A "Policy Id:a,b" query can be served from other alert queries only
+        # if together they covered every requested policy; otherwise missing
+        # alerts would be reported as passing deployments.
+        wanted = _policy_id_query(query)
+        covered = set()
+        alerts = []
+        for entry in self.entries.values():
+            if entry['endpoint'] == '/v1/alerts':
+                ids = _policy_id_query(entry['query'])
+                if ids is not None:
+                    covered |= ids
+                    alerts.extend(entry['records'])
+        if wanted is None or not wanted <= covered:
+            self._missing('/v1/alerts', query)
+        return iter([a for a in alerts if a.get('policy', {}).get('id') in wanted])
+
+    def export_policies(self, policy_ids):
+        return self._records('/v1/policies/export', ','.join(sorted(policy_ids)))
+
+    def prefetch(self, requests, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """Snapshot data is already local; nothing to prefetch"""
+
+    def save_snapshot(self, path):
+        """Re-save the loaded snapshot (e.g. to copy it alongside offline reports)"""
+        _write_json_atomic(path, {
+            'version': SNAPSHOT_VERSION,
+            'central_url': self.central_url,
+            'created': self.created,
+            'entries': self.entries
+        })
+        print(f"\nSnapshot saved: {path} ({len(self.entries)} responses)")
+
+
+def add_cache_arguments(parser):
+    """Add the --cache, --refresh, --offline, --async and --save-snapshot options to a report CLI"""
+    parser.add_argument(
+        '--cache',
+        metavar='SECONDS',
+        type=int,
+        nargs='?',
+        const=DEFAULT_CACHE_OPTION_TTL,
+        help='Reuse RHACS data cached on disk within SECONDS (default with --cache: '
+             f'{DEFAULT_CACHE_OPTION_TTL}; without it RHACS_CACHE_TTL, which defaults to no caching)'
+    )
+
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached RHACS data and download it again'
+    )
+
+    parser.add_argument(
+        '--offline',
+        metavar='SNAPSHOT',
+        help='Render reports from a saved snapshot file without contacting RHACS'
+    )
+
+    parser.add_argument(
+        '--async',
+        dest='async_fetch',
+        action='store_true',
+        help='Fetch report data with concurrent requests (RHACS_MAX_CONCURRENCY, default: '
+             f'{DEFAULT_MAX_CONCURRENCY})'
+    )
+
+    parser.add_argument(
+        '--save-snapshot',
+        metavar='SNAPSHOT',
+        help='Save the RHACS data used by this run to a snapshot file for --offline'
+    )
+
+
+def report_concurrency(args):
+    """Concurrent requests for report data prefetching, or 0 without --async"""
+    if not args.async_fetch:
+        return 0
+    return int(os.getenv('RHACS_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY))
+
+
+def open_report_client(args):
+    """Return the report data source selected by the cache command-line options"""
+    if args.offline:
+        return OfflineClient.load(args.offline)
+
+    rhacs_url = os.getenv('RHACS_URL')
+    api_token = os.getenv('RHACS_API_TOKEN')
+
+    # Validate required environment variables
+    if not rhacs_url:
+        print("ERROR: RHACS_URL environment variable not set")
+        print("Please set: export RHACS_URL='https://your-rhacs-instance.com'")
+        sys.exit(1)
+
+    if not api_token:
+        print("ERROR: RHACS_API_TOKEN environment variable not set")
+        print("Please set: export RHACS_API_TOKEN='your-api-token'")
+        sys.exit(1)
+
+    # Honours RHACS_VERIFY_SSL, RHACS_PAGE_SIZE and RHACS_RATE_LIMIT
+    client = RHACSClient.from_env()
+    return CachedClient(client, SnapshotCache.from_env(rhacs_url, refresh=args.refresh, ttl=args.cache),
+                        snapshot=bool(args.save_snapshot))
@@ -6,124 +6,81 @@ This script generates compliance reports for any compliance framework supported
 Supports NIST 800-190, NIST 800-53, PCI-DSS, HIPAA, CIS, GDPR, SOC 2, ISO 27001, FedRAMP, and custom frameworks.
 """
 
-import requests
-import json
 import os
 import sys
-import yaml
 import argparse
-from collections import defaultdict
 from datetime import datetime
-import urllib3
-
-# Disable SSL warnings for demo environment
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-# RHACS Configuration from environment variables
-RHACS_URL = os.getenv('RHACS_URL')
-API_TOKEN = os.getenv('RHACS_API_TOKEN')
-VERIFY_SSL = os.getenv('RHACS_VERIFY_SSL', 'false').lower() == 'true'
-
-# Validate required environment variables
-if not RHACS_URL:
-    print("ERROR: RHACS_URL environment variable not set")
-    print("Please set: export RHACS_URL='https://your-rhacs-instance.com'")
-    sys.exit(1)
-
-if not API_TOKEN:
-    print("ERROR: RHACS_API_TOKEN environment variable not set")
-    print("Please set: export RHACS_API_TOKEN='your-api-token'")
-    sys.exit(1)
-
-HEADERS = {
-    "Authorization": f"Bearer {API_TOKEN}",
-    "Content-Type": "application/json"
-}
-
-def load_frameworks(config_file='compliance_frameworks.yaml'):
-    """Load compliance framework definitions"""
-    try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-            return config.get('frameworks', {})
-    except FileNotFoundError:
-        print(f"ERROR: Framework configuration file not found: {config_file}")
-        sys.exit(1)
-    except yaml.YAMLError as e:
-        print(f"ERROR: Invalid YAML in configuration file: {e}")
-        sys.exit(1)
 
-def api_request(endpoint, params=None):
-    """Make API request to RHACS"""
-    url = f"{RHACS_URL}{endpoint}"
-    try:
-        response = requests.get(url, headers=HEADERS, params=params, verify=VERIFY_SSL)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making API request to {endpoint}: {e}")
-        return None
-
-def get_policies_for_framework(framework_config):
-    """Fetch policies that match the framework criteria"""
-    filter_type = framework_config['policy_filter']['type']
-    filter_value = framework_config['policy_filter']['value']
-
-    if filter_type == 'category':
-        # Search by category
-        data = api_request("/v1/policies", params={"query": f"Category:{filter_value}"})
-    elif filter_type == 'name_prefix':
-        # Search by name prefix
-        data = api_request("/v1/policies", params={"query": f"Policy:{filter_value}"})
-    elif filter_type == 'name_contains':
-        # Search by name contains
-        data = api_request("/v1/policies")
-    elif filter_type == 'tag':
-        # Search by tag
-        data = api_request("/v1/policies", params={"query": f"Tag:{filter_value}"})
-    else:
-        print(f"ERROR: Unknown filter type: {filter_type}")
-        return []
-
-    if not data or 'policies' not in data:
-        print(f"No policies found for framework")
-        return []
-
-    policies = data['policies']
-
-    # Additional filtering for name_contains
-    if filter_type == 'name_contains':
-        policies = [p for p in policies if filter_value in p.get('name', '')]
-    elif filter_type == 'name_prefix':
-        policies = [p for p in policies if filter_value in p.get('name', '')]
-
-    return policies
-
-def get_policy_violations(policy_id):
-    """Fetch violations for a specific policy"""
-    data = api_request(f"/v1/alerts", params={"query": f"Policy Id:{policy_id}"})
-    if not data or 'alerts' not in data:
-        return []
-    return data['alerts']
-
-def get_all_deployments():
-    """Fetch all deployments from RHACS"""
-    data = api_request("/v1/deployments")
-    if not data or 'deployments' not in data:
-        print("No deployments found")
-        return []
-    deployments = data['deployments']
-    return deployments
-
-def generate_compliance_report(framework_id, frameworks):
-    """Generate compliance report for a specific framework"""
-
-    if framework_id not in frameworks:
-        print(f"ERROR: Unknown framework: {framework_id}")
-        print(f"Available frameworks: {', '.join(frameworks.keys())}")
-        sys.exit(1)
+# Make the shared RHACS client in the repository root importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from compliance_data import (
+    load_frameworks, get_framework, get_policies_for_framework,
+    get_all_policy_definitions, select_framework_policies,
+    collect_policy_violations, collect_snapshot, report_data_requests
+)
+from snapshot_cache import add_cache_arguments, open_report_client, report_concurrency
+from report_renderers import RENDERERS, DEFAULT_FORMATS, parse_formats, render_reports
+
+def print_compliance_report(snapshot, details=True):
+    """Print the cluster/namespace/deployment report and summary statistics"""
+    framework_name = snapshot.name
+    matrix = snapshot.matrix
+    total_policies = len(matrix.policy_names)
+
+    if details:
+        print("\n" + "="*80)
+        print(f"COMPLIANCE REPORT BY CLUSTER/NAMESPACE/DEPLOYMENT - {framework_name}")
+        print("="*80 + "\n")
+
+        current_cluster = current_namespace = None
+        for cluster, namespace, deployment, row in snapshot.iter_deployment_results():
+            if cluster != current_cluster:
+                current_cluster, current_namespace = cluster, None
+                print(f"\n{'#'*80}")
+                print(f"CLUSTER: {cluster}")
+                print(f"{'#'*80}\n")
+
+            if namespace != current_namespace:
+                current_namespace = namespace
+                print(f"\n  Namespace: {namespace}")
+                print(f"  {'-'*76}\n")
+
+            print(f"    Deployment: {deployment}")
+
+            # Count pass/fail
+            failed_policies = matrix.failed_count(row)
+            passed_policies = total_policies - failed_policies
+
+            print(f"      Summary: {passed_policies}/{total_policies} policies PASS, {failed_policies}/{total_policies} policies FAIL")
+            print()
+
+            # Show failed policies
+            if failed_policies > 0:
+                print(f"      Failed Policies:")
+                for policy_name in sorted(matrix.failed_policies(row)):
+                    print(f"        ❌ {policy_name}")
+                print()
 
-    framework = frameworks[framework_id]
+    # Summary statistics
+    print("\n" + "="*80)
+    print("SUMMARY STATISTICS")
+    print("="*80 + "\n")
+
+    print(f"Framework:         {framework_name}")
+    print(f"Total Clusters:    {snapshot.total_clusters}")
+    print(f"Total Namespaces:  {snapshot.total_namespaces}")
+    print(f"Total Deployments: {snapshot.total_deployments}")
+    print(f"Total Policies:    {len(snapshot.policies)}")
+
+def generate_compliance_report(client, framework_id, frameworks, formats=('json',), output_dir='.',
+                               concurrency=0):
+    """
+    Generate compliance report for a specific framework in the requested formats.
+
+    With ``concurrency`` > 0 deployments and alerts are prefetched with that
+    many concurrent requests.
+    """
+    framework = get_framework(framework_id, frameworks)
     framework_name = framework['name']
 
     print("\n" + "="*80)
@@ -133,7 +90,7 @@ def generate_compliance_report(framework_id, frameworks):
 
     # Get policies for this framework
     print(f"Fetching {framework_name} policies...")
-    policies = get_policies_for_framework(framework)
+    policies = get_policies_for_framework(client, framework)
 
     if not policies:
         print(f"No policies found for {framework_name}!")
@@ -143,127 +100,90 @@ def generate_compliance_report(framework_id, frameworks):
 
     print(f"Found {len(policies)} {framework_name} policies")
 
-    # Get all deployments
-    deployments = get_all_deployments()
-    print(f"Found {len(deployments)} deployments")
+    # One collection run feeds every requested output format
+    print(f"\nAnalyzing policy violations for {framework_name}...")
+    snapshot = collect_snapshot(client, framework_id, framework, policies, concurrency=concurrency)
 
-    # Create structure: cluster -> namespace -> deployment -> policy results
-    compliance_data = defaultdict(lambda: defaultdict(lambda: defaultdict(dict)))
+    print_compliance_report(snapshot)
+    render_reports(snapshot, formats, output_dir)
 
-    # Track which policies have violations
-    policies_with_violations = defaultdict(set)
+def resolve_framework_ids(selection, frameworks):
+    """Expand a --frameworks value ('all' or a comma-separated list) into framework IDs"""
+    if selection == 'all':
+        return [fid for fid in frameworks if fid != 'custom-template']
+
+    framework_ids = [fid.strip() for fid in selection.split(',') if fid.strip()]
+    unknown = [fid for fid in framework_ids if fid not in frameworks]
+    if unknown:
+        print(f"ERROR: Unknown framework(s): {', '.join(unknown)}")
+        print(f"Available frameworks: {', '.join(frameworks.keys())}")
+        sys.exit(1)
+    return framework_ids
+
+def generate_multi_framework_reports(client, framework_ids, frameworks, output_dir='.', formats=None,
+                                     concurrency=0):
+    """
+    Generate reports for several frameworks in one pass.
+
+    Policies, deployments and alerts are fetched once and every framework's
+    policy_filter is evaluated against the same in-memory data. JSON, CSV and
+    HTML are written unless ``formats`` selects otherwise. With ``concurrency``
+    > 0 the list requests are prefetched with that many concurrent requests.
+    """
+    formats = formats or DEFAULT_FORMATS
 
-    print(f"\nAnalyzing policy violations for {framework_name}...")
-    # For each policy, get violations and map to deployments
-    for policy in policies:
-        policy_id = policy['id']
-        policy_name = policy['name']
-        print(f"  Checking policy: {policy_name}")
-
-        violations = get_policy_violations(policy_id)
-
-        # Track deployments with violations for this policy
-        for violation in violations:
-            deployment_info = violation.get('deployment', {})
-            deployment_id = deployment_info.get('id')
-            deployment_name = deployment_info.get('name')
-            namespace = deployment_info.get('namespace')
-            cluster_name = deployment_info.get('clusterName', 'Unknown')
-
-            if deployment_id:
-                policies_with_violations[deployment_id].add(policy_id)
-
-    # Build compliance report for all deployments
-    for deployment in deployments:
-        deployment_id = deployment.get('id')
-        deployment_name = deployment.get('name')
-        namespace = deployment.get('namespace')
-        cluster_name = deployment.get('clusterName', 'Unknown')
-
-        # Check each policy against this deployment
-        for policy in policies:
-            policy_id = policy['id']
-            policy_name = policy['name']
-
-            # Check if this deployment has violations for this policy
-            has_violation = policy_id in policies_with_violations.get(deployment_id, set())
-
-            compliance_data[cluster_name][namespace][deployment_name][policy_name] = {
-                'status': 'FAIL' if has_violation else 'PASS',
-                'policy_id': policy_id
-            }
-
-    # Print the report
     print("\n" + "="*80)
-    print(f"COMPLIANCE REPORT BY CLUSTER/NAMESPACE/DEPLOYMENT - {framework_name}")
+    print(f"RHACS Multi-Framework Compliance Report ({len(framework_ids)} frameworks)")
+    print(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*80 + "\n")
 
-    for cluster in sorted(compliance_data.keys()):
-        print(f"\n{'#'*80}")
-        print(f"CLUSTER: {cluster}")
-        print(f"{'#'*80}\n")
+    print("Fetching policies...")
+    if concurrency:
+        client.prefetch([('/v1/policies', None), ('/v1/deployments', None)], concurrency)
+    all_policies = get_all_policy_definitions(client)
+    framework_policies = {
+        fid: select_framework_policies(all_policies, frameworks[fid])
+        for fid in framework_ids
+    }
+    print(f"Found {len(all_policies)} policies")
+
+    print("Fetching deployments...")
+    deployments = list(client.iter_deployments())
+    print(f"Found {len(deployments)} deployments")
 
-        for namespace in sorted(compliance_data[cluster].keys()):
-            print(f"\n  Namespace: {namespace}")
-            print(f"  {'-'*76}\n")
+    print("\nAnalyzing policy violations for all frameworks...")
+    policy_ids = {p['id'] for policies in framework_policies.values() for p in policies}
+    if concurrency:
+        client.prefetch(report_data_requests(policy_ids), concurrency)
+    policies_with_violations = collect_policy_violations(client, policy_ids)
 
-            for deployment in sorted(compliance_data[cluster][namespace].keys()):
-                print(f"    Deployment: {deployment}")
+    generated_at = datetime.now()
+    generated = []
 
-                policy_results = compliance_data[cluster][namespace][deployment]
+    for framework_id in framework_ids:
+        framework = frameworks[framework_id]
+        policies = framework_policies[framework_id]
 
-                # Count pass/fail
-                total_policies = len(policy_results)
-                failed_policies = sum(1 for r in policy_results.values() if r['status'] == 'FAIL')
-                passed_policies = total_policies - failed_policies
+        print("\n" + "━"*80)
+        print(f"Framework: {framework['name']}")
+        print("━"*80)
 
-                print(f"      Summary: {passed_policies}/{total_policies} policies PASS, {failed_policies}/{total_policies} policies FAIL")
-                print()
+        if not policies:
+            print(f"No policies found for {framework['name']}!")
+            continue
 
-                # Show failed policies
-                if failed_policies > 0:
-                    print(f"      Failed Policies:")
-                    for policy_name, result in sorted(policy_results.items()):
-                        if result['status'] == 'FAIL':
-                            print(f"        ❌ {policy_name}")
-                    print()
+        snapshot = collect_snapshot(client, framework_id, framework, policies, deployments,
+                                    policies_with_violations, generated_at)
+        print_compliance_report(snapshot, details=False)
+        render_reports(snapshot, formats, output_dir)
+        generated.append(framework_id)
 
-    # Summary statistics
     print("\n" + "="*80)
-    print("SUMMARY STATISTICS")
-    print("="*80 + "\n")
-
-    total_clusters = len(compliance_data)
-    total_namespaces = sum(len(namespaces) for namespaces in compliance_data.values())
-    total_deployments = sum(
-        len(deployments)
-        for cluster in compliance_data.values()
-        for deployments in cluster.values()
-    )
-
-    print(f"Framework:         {framework_name}")
-    print(f"Total Clusters:    {total_clusters}")
-    print(f"Total Namespaces:  {total_namespaces}")
-    print(f"Total Deployments: {total_deployments}")
-    print(f"Total Policies:    {len(policies)}")
-
-    # Export to JSON
-    output_file = f"{framework_id}_compliance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(output_file, 'w') as f:
-        json.dump({
-            'framework': {
-                'id': framework_id,
-                'name': framework_name,
-                'full_name': framework.get('full_name', framework_name),
-                'description': framework.get('description', ''),
-                'url': framework.get('url', '')
-            },
-            'generated': datetime.now().isoformat(),
-            'policies': [{'id': p['id'], 'name': p['name']} for p in policies],
-            'compliance_data': compliance_data
-        }, f, indent=2, default=str)
-
-    print(f"\nDetailed report exported to: {output_file}")
+    print("MULTI-FRAMEWORK REPORT GENERATION COMPLETE")
+    print("="*80)
+    print(f"Generated: {len(generated)} of {len(framework_ids)} frameworks")
+    print(f"Output:    {output_dir}")
+    return generated
 
 def list_frameworks(frameworks):
     """List all available compliance frameworks"""
@@ -301,6 +221,19 @@ Examples:
 
   # Use custom framework configuration
   python3 universal_compliance_report.py --framework my-custom --config my_frameworks.yaml
+
+  # Generate JSON, CSV and HTML reports for PCI-DSS from one data collection
+  python3 universal_compliance_report.py --framework pci-dss --format json,csv,html
+
+  # Generate JSON, CSV and HTML reports for every framework in one pass
+  python3 universal_compliance_report.py --frameworks all --output-dir reports/
+
+  # Save the RHACS data used by a run, then re-render from it offline
+  python3 universal_compliance_report.py --frameworks all --save-snapshot rhacs_snapshot.json
+  python3 universal_compliance_report.py --frameworks all --offline rhacs_snapshot.json
+
+  # Overlap all deployment and alert requests against a remote Central
+  python3 universal_compliance_report.py --frameworks all --async
         """
     )
 
@@ -309,6 +242,23 @@ Examples:
         help='Compliance framework ID (e.g., nist-800-190, pci-dss, nist-800-53)'
     )
 
+    parser.add_argument(
+        '--frameworks',
+        help="Generate reports for several frameworks in one pass ('all' or comma-separated IDs)"
+    )
+
+    parser.add_argument(
+        '--format',
+        help=f"Comma-separated report formats: {', '.join(RENDERERS)} "
+             f"(default: json for --framework, {','.join(DEFAULT_FORMATS)} for --frameworks)"
+    )
+
+    parser.add_argument(
+        '--output-dir', '-o',
+        default='.',
+        help='Directory for generated reports (default: current directory)'
+    )
+
     parser.add_argument(
         '--list', '-l',
         action='store_true',
@@ -321,6 +271,8 @@ Examples:
         help='Path to framework configuration file (default: compliance_frameworks.yaml)'
     )
 
+    add_cache_arguments(parser)
+
     args = parser.parse_args()
 
     # Load framework configurations
@@ -330,13 +282,27 @@ Examples:
         list_frameworks(frameworks)
         return
 
-    if not args.framework:
-        print("ERROR: --framework is required (use --list to see available frameworks)")
+    formats = parse_formats(args.format) if args.format else None
+
+    if not args.framework and not args.frameworks:
+        print("ERROR: --framework or --frameworks is required (use --list to see available frameworks)")
         parser.print_help()
         sys.exit(1)
 
-    # Generate report
-    generate_compliance_report(args.framework, frameworks)
+    client = open_report_client(args)
+    concurrency = report_concurrency(args)
+
+    if args.frameworks:
+        framework_ids = resolve_framework_ids(args.frameworks, frameworks)
+        generate_multi_framework_reports(client, framework_ids, frameworks, args.output_dir, formats,
+                                         concurrency)
+    else:
+        # Generate report
+        generate_compliance_report(client, args.framework, frameworks, formats or ['json'], args.output_dir,
+                                   concurrency)
+
+    if args.save_snapshot:
+        client.save_snapshot(args.save_snapshot)
 
 if __name__ == "__main__":
     main()
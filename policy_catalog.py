@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Indexed Policy Catalog
+
+Loads the policy JSON files once and builds secondary indexes so selecting
+policies is a dictionary lookup per criterion plus a set intersection, not a
+scan of every policy:
+
+- name (unique)
+- section (the list a policy came from, e.g. ``kubernetes_policies``)
+- category, severity, lifecycle stage
+- framework (CIS, NIST 800-190, PQC, Data Sovereignty, PCI-DSS; from the
+  name prefix)
+- region, one of REGIONS written as an upper-case whole word of the name or
+  description (e.g. ``EU``)
+
+Loaded catalogs are cached per file set and reloaded only when a file's
+modification time changes, so repeated generator calls in one process parse
+each file once. Policies are shared between queries and must be copied
+before being modified.
+
+Across processes, parsed and validated files can be kept in a compiled JSON
+artifact. It is opt-in: set ``RHACS_CATALOG_CACHE`` to its path, or to ``on``
+for ``~/.cache/rhacs-policies/catalog.json``. A source whose size and mtime
+match its entry is read from the artifact without re-validating it; if only
+the mtime changed (e.g. after a fresh checkout or image build) its sha256 is
+compared first. Whenever an entry is (re)built the file's policies are
+checked against the RHACS policy schema (see policy_schema.py) and the
+problems are kept in the entry. ``--compile`` validates every catalog file
+and writes the artifact ahead of time, e.g. while building a container
+image.
+
+Usage:
+    python3 policy_catalog.py --framework CIS --severity HIGH --lifecycle DEPLOY
+    python3 policy_catalog.py --region EU --names
+    RHACS_CATALOG_CACHE=/opt/app/catalog.json python3 policy_catalog.py --compile
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from policy_schema import check_policies, describe_problems
+
+# Policy files making up the full catalog, relative to this directory
+DEFAULT_CATALOG_FILES = (
+    'cis_policies.json',
+    'pqc_policy.json',
+    'data_sovereignty_policies.json',
+    'nist_800_190_policies.json',
+)
+
+# Name prefixes identifying the framework a policy implements
+FRAMEWORK_PREFIXES = (
+    ('NIST-800-190-', 'NIST 800-190'),
+    ('Data-Sovereignty-', 'Data Sovereignty'),
+    ('PCI-DSS', 'PCI-DSS'),
+    ('CIS-', 'CIS'),
+    ('PQC-', 'PQC'),
+)
+
+# Region codes used by the data sovereignty catalog; only these are indexed as regions
+REGIONS = frozenset(['EU', 'US'])
+
+# Compiled catalog artifact used when RHACS_CATALOG_CACHE is 'on' (disabled when unset)
+DEFAULT_COMPILED_CATALOG = os.path.join(os.path.expanduser('~'), '.cache', 'rhacs-policies', 'catalog.json')
+
+# Bumped whenever the artifact layout changes; older artifacts are rebuilt
+COMPILED_CATALOG_FORMAT = 2
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r'[A-Za-z0-9]+')
+
+_CACHE: Dict[Tuple[str, ...], Tuple[Tuple[int, ...], 'PolicyCatalog']] = {}
+
+Criterion = Optional[Union[str, Iterable[str]]]
+
+
+def normalize_severity(severity: str) -> str:
+    """'high' -> 'HIGH_SEVERITY'."""
+    severity = severity.upper()
+    return severity if severity.endswith('_SEVERITY') else f"{severity}_SEVERITY"
+
+
+def policy_framework(policy: Dict[str, Any]) -> Optional[str]:
+    """The framework a policy implements, from its name prefix."""
+    name = policy.get('name', '')
+    for prefix, framework in FRAMEWORK_PREFIXES:
+        if name.startswith(prefix):
+            return framework
+    return None
+
+
+def _resolve(path: str) -> str:
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+def compiled_catalog_path() -> Optional[str]:
+    """Path of the compiled catalog artifact from RHACS_CATALOG_CACHE, or None when disabled."""
+    path = os.environ.get('RHACS_CATALOG_CACHE', '').strip()
+    if path.lower() in ('', 'off', 'none', 'false', '0'):
+        return None
+    if path.lower() in ('on', 'true', '1'):
+        return DEFAULT_COMPILED_CATALOG
+    return os.path.expanduser(path)
+
+
+def parse_catalog(path: str, raw: bytes) -> Dict[str, List[Dict[str, Any]]]:
+    """Sections of a catalog file: a list of policies, or an object of policy lists."""
+    data = json.loads(raw)
+    if isinstance(data, list):
+        return {os.path.splitext(os.path.basename(path))[0]: data}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a list of policies or an object of policy lists")
+    return {section: policies for section, policies in data.items() if isinstance(policies, list)}
+
+
+def validate_sections(path: str, sections: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+    """Structural problems of a parsed catalog file (empty when it is usable)."""
+    errors = []
+    seen = {}
+    for section, policies in sections.items():
+        for position, policy in enumerate(policies):
+            where = f"{path}: {section}[{position}]"
+            if not isinstance(policy, dict):
+                errors.append(f"{where}: not an object")
+            elif not isinstance(policy.get('name'), str) or not policy['name'].strip():
+                errors.append(f"{where}: missing name")
+            elif policy['name'] in seen:
+                errors.append(f"{where}: duplicate name '{policy['name']}' (also {seen[policy['name']]})")
+            else:
+                seen[policy['name']] = where
+    return errors
+
+
+def schema_problems(sections: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+    """Schema errors of every policy in a parsed catalog file, one line each."""
+    problems = []
+    for section, policies in sections.items():
+        errors = {index: report.errors for index, report in check_policies(policies).items() if report.errors}
+        problems.extend(f"{section}: {line}" for line in describe_problems(policies, errors))
+    return problems
+
+
+class CompiledCatalog:
+    """
+    Parsed catalog files keyed by source path, with size, mtime and sha256
+    stamps and the schema errors found when each entry was built.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if path:
+            self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                artifact = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable compiled catalog {self.path}: {e}")
+            return
+        if isinstance(artifact, dict) and artifact.get('format') == COMPILED_CATALOG_FORMAT:
+            self.sources = artifact.get('sources', {})
+
+    def entry(self, path: str, force: bool = False) -> Dict[str, Any]:
+        """
+        The artifact entry of ``path``, rebuilt unless the source is unchanged.
+
+        A rebuilt entry is parsed and, when it goes into an artifact,
+        checked against the policy schema with a summary of the errors logged.
+        """
+        stat = os.stat(path)
+        entry = None if force else self.sources.get(path)
+        if entry and (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+            return entry
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry['sha256'] == digest:
+            sections, problems = entry['sections'], entry['schemaErrors']
+        else:
+            sections = parse_catalog(path, raw)
+            problems = schema_problems(sections) if self.path else []
+            if problems:
+                logger.warning(f"{path}: {len(problems)} schema errors; "
+                               f"run 'python3 policy_schema.py --file {path}' for details")
+        entry = self.sources[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest,
+                                      'sections': sections, 'schemaErrors': problems}
+        self._dirty = True
+        return entry
+
+    def sections(self, path: str, force: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """Parsed sections of ``path``, from the artifact when the source is unchanged."""
+        return self.entry(path, force)['sections']
+
+    def save(self):
+        """Write the artifact atomically if anything changed; failures only cost the next startup."""
+        if not self.path or not self._dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'format': COMPILED_CATALOG_FORMAT, 'sources': self.sources}, f,
+                          separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.debug(f"Could not write compiled catalog {self.path}: {e}")
+
+
+class PolicyCatalog:
+    """Policies from one or more catalog files with secondary indexes."""
+
+    def __init__(self, sections: Dict[str, List[Dict[str, Any]]]):
+        self.policies: List[Dict[str, Any]] = []
+        self.by_name: Dict[str, Dict[str, Any]] = {}
+        self._indexes: Dict[str, Dict[str, Set[int]]] = {
+            'section': {}, 'category': {}, 'severity': {}, 'lifecycle': {}, 'framework': {}, 'region': {}
+        }
+
+        for section, policies in sections.items():
+            for policy in policies:
+                if not isinstance(policy, dict) or not policy.get('name'):
+                    continue
+                position = len(self.policies)
+                self.policies.append(policy)
+                self.by_name.setdefault(policy['name'], policy)
+                self._add('section', section, position)
+                for category in policy.get('categories', []):
+                    self._add('category', category, position)
+                if policy.get('severity'):
+                    self._add('severity', normalize_severity(policy['severity']), position)
+                for stage in policy.get('lifecycleStages', []):
+                    self._add('lifecycle', stage, position)
+                framework = policy_framework(policy)
+                if framework:
+                    self._add('framework', framework, position)
+                # Case-sensitive, so the pronoun 'us' does not count as the region US
+                text = f"{policy['name']} {policy.get('description', '')}"
+                for word in set(_WORD.findall(text)) & REGIONS:
+                    self._add('region', word, position)
+
+    def _add(self, index: str, key: str, position: int):
+        self._indexes[index].setdefault(self._key(index, key), set()).add(position)
+
+    @staticmethod
+    def _key(index: str, key: str) -> str:
+        if index == 'severity':
+            return normalize_severity(key)
+        if index in ('lifecycle', 'region'):
+            return key.upper()
+        if index in ('category', 'framework'):
+            return key.lower()
+        return key
+
+    @classmethod
+    def load(cls, paths: Iterable[str] = DEFAULT_CATALOG_FILES) -> 'PolicyCatalog':
+        """
+        Load catalog files (a list of policies, or an object of policy lists).
+
+        Relative paths are resolved against this directory. Results are
+        cached in-process until one of the files changes, and parsed files
+        are reused from the compiled artifact across processes when it is
+        enabled.
+        """
+        resolved = tuple(_resolve(path) for path in paths)
+        mtimes = tuple(os.stat(path).st_mtime_ns for path in resolved)
+        cached = _CACHE.get(resolved)
+        if cached and cached[0] == mtimes:
+            return cached[1]
+
+        compiled = CompiledCatalog(compiled_catalog_path())
+        sections: Dict[str, List[Dict[str, Any]]] = {}
+        for path in resolved:
+            for section, policies in compiled.sections(path).items():
+                sections.setdefault(section, []).extend(policies)
+        compiled.save()
+
+        catalog = cls(sections)
+        _CACHE[resolved] = (mtimes, catalog)
+        return catalog
+
+    def __len__(self) -> int:
+        return len(self.policies)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """The policy with this exact name, or None."""
+        return self.by_name.get(name)
+
+    def keys(self, index: str) -> List[str]:
+        """Indexed (normalized) values of one criterion, e.g. keys('severity')."""
+        return sorted(self._indexes[index])
+
+    def select(self, section: Criterion = None, category: Criterion = None, severity: Criterion = None,
+               lifecycle: Criterion = None, framework: Criterion = None,
+               region: Criterion = None) -> List[Dict[str, Any]]:
+        """
+        Policies matching every given criterion, in catalog order.
+
+        Each criterion takes one value or several (matching any of them).
+        Categories and frameworks are case-insensitive, severities may omit
+        ``_SEVERITY``.
+        """
+        criteria = {'section': section, 'category': category, 'severity': severity,
+                    'lifecycle': lifecycle, 'framework': framework, 'region': region}
+        selected: Optional[Set[int]] = None
+        for index, values in criteria.items():
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            matches = set()
+            for value in values:
+                matches |= self._indexes[index].get(self._key(index, value), set())
+            selected = matches if selected is None else selected & matches
+            if not selected:
+                return []
+        if selected is None:
+            return list(self.policies)
+        return [self.policies[position] for position in sorted(selected)]
+
+    def section(self, name: str) -> List[Dict[str, Any]]:
+        """Policies of one section, e.g. ``kubernetes_policies``."""
+        return self.select(section=name)
+
+
+def compile_catalogs(paths: Iterable[str] = DEFAULT_CATALOG_FILES, output: Optional[str] = None,
+                     strict: bool = False) -> Tuple[List[str], List[str]]:
+    """
+    Validate catalog files and write them to the compiled artifact.
+
+    Every file is re-read. Returns (errors, schema errors). Nothing is
+    written when there are errors (unreadable files, missing or duplicate
+    names), or with ``strict`` when there are schema errors too.
+    """
+    compiled = CompiledCatalog(output or compiled_catalog_path() or DEFAULT_COMPILED_CATALOG)
+    errors = []
+    problems = []
+    for path in (_resolve(path) for path in paths):
+        try:
+            entry = compiled.entry(path, force=True)
+        except (OSError, ValueError) as e:
+            errors.append(f"{path}: {e}")
+            continue
+        errors.extend(validate_sections(path, entry['sections']))
+        problems.extend(f"{path}: {line}" for line in entry['schemaErrors'])
+    if not errors and not (strict and problems):
+        compiled.save()
+    return errors, problems
+
+
+def main():
+    """Print the policies matching the given criteria, or compile the catalog."""
+    parser = argparse.ArgumentParser(description="Query the policy catalog")
+    parser.add_argument('--file', action='append', dest='files',
+                        help='Catalog file (repeatable; default: all bundled policy files)')
+    for criterion in ('section', 'category', 'severity', 'lifecycle', 'framework', 'region'):
+        parser.add_argument(f'--{criterion}', action='append', help=f'Filter by {criterion} (repeatable)')
+    parser.add_argument('--names', action='store_true', help='Print policy names instead of JSON')
+    parser.add_argument('--compile', action='store_true',
+                        help='Validate the catalog files and write the compiled artifact')
+    parser.add_argument('--strict', action='store_true',
+                        help='With --compile, also fail on policies with schema errors')
+    parser.add_argument('--output', help='Compiled artifact path (default: RHACS_CATALOG_CACHE, '
+                                         'or ~/.cache/rhacs-policies/catalog.json)')
+    args = parser.parse_args()
+
+    if args.compile:
+        output = args.output or compiled_catalog_path() or DEFAULT_COMPILED_CATALOG
+        errors, problems = compile_catalogs(args.files or DEFAULT_CATALOG_FILES, output, args.strict)
+        for problem in problems:
+            print(f"{'ERROR' if args.strict else 'WARNING'}: schema: {problem}")
+        if errors or (args.strict and problems):
+            for error in errors:
+                print(f"ERROR: {error}")
+            sys.exit(1)
+        print(f"Compiled {len(args.files or DEFAULT_CATALOG_FILES)} catalog files into {output}"
+              + (f" ({len(problems)} schema errors)" if problems else ""))
+        if compiled_catalog_path() != output:
+            print(f"Set RHACS_CATALOG_CACHE={output} to load the catalog from it.")
+        return
+
+    catalog = PolicyCatalog.load(args.files or DEFAULT_CATALOG_FILES)
+    policies = catalog.select(args.section, args.category, args.severity,
+                              args.lifecycle, args.framework, args.region)
+    if args.names:
+        for policy in policies:
+            print(policy['name'])
+    else:
+        json.dump(policies, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
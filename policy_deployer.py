@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Concurrent Policy Deployment Engine
+
+Pushes a list of RHACS policies to Central through a bounded worker pool so
+that deploying a few hundred policies is limited by Central's throughput
+rather than by one round trip at a time. Results are collected in the same
+order as the input policies and rolled up into created/skipped/failed counts.
+Optionally, policies are sent in batches through the bulk import endpoint.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from rhacs_client import RHACSClient, POLICY_CREATED, POLICY_EXISTS, POLICY_FAILED
+from policy_hash import stamp_policy
+from policy_schema import check_policies, describe_problems
+
+logger = logging.getLogger(__name__)
+
+# Concurrent POST /v1/policies requests in flight against Central
+DEFAULT_MAX_WORKERS = 8
+
+# Policies per /v1/policies/import request in bulk mode (0 = one POST per policy)
+DEFAULT_IMPORT_BATCH_SIZE = 0
+
+# Per-policy outcome reported when a policy was skipped before any API call
+POLICY_SKIPPED = 'skipped'
+
+# Per-policy outcomes reported by the sync engine (policy_sync.py)
+POLICY_UPDATED = 'updated'
+POLICY_DELETED = 'deleted'
+POLICY_UNCHANGED = 'unchanged'
+
+
+class DeploymentResult:
+    """Outcome of deploying a single policy."""
+
+    def __init__(self, name: str, status: str, detail: str = ''):
+        self.name = name
+        self.status = status
+        self.detail = detail
+
+    @property
+    def created(self) -> bool:
+        return self.status == POLICY_CREATED
+
+    @property
+    def updated(self) -> bool:
+        return self.status == POLICY_UPDATED
+
+    @property
+    def deleted(self) -> bool:
+        return self.status == POLICY_DELETED
+
+    @property
+    def skipped(self) -> bool:
+        return self.status in (POLICY_SKIPPED, POLICY_EXISTS, POLICY_UNCHANGED)
+
+    @property
+    def failed(self) -> bool:
+        return self.status == POLICY_FAILED
+
+
+class DeploymentSummary:
+    """Ordered per-policy results plus created/updated/deleted/skipped/failed totals."""
+
+    def __init__(self, results: List[DeploymentResult]):
+        self.results = results
+
+    @property
+    def total(self) -> int:
+        return len(self.results)
+
+    @property
+    def created(self) -> int:
+        return sum(1 for result in self.results if result.created)
+
+    @property
+    def updated(self) -> int:
+        return sum(1 for result in self.results if result.updated)
+
+    @property
+    def deleted(self) -> int:
+        return sum(1 for result in self.results if result.deleted)
+
+    @property
+    def skipped(self) -> int:
+        return sum(1 for result in self.results if result.skipped)
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for result in self.results if result.failed)
+
+
+def schema_failures(policies: List[Dict[str, Any]],
+                    allow_unknown_fields: bool = False) -> Dict[int, DeploymentResult]:
+    """
+    Validate ``policies`` locally against the RHACS policy schema.
+
+    Every problem is logged in one pass; returns a failed result by position
+    for each policy with errors so it is never sent to Central. Policies
+    with only warnings (e.g. a criteria field the schema does not list) are
+    still sent.
+    """
+    reports = check_policies(policies, allow_unknown_fields)
+    warnings = {index: report.warnings for index, report in reports.items() if report.warnings}
+    problems = {index: report.errors for index, report in reports.items() if report.errors}
+    for line in describe_problems(policies, warnings):
+        logger.warning(f"Schema warning: {line}")
+    if not problems:
+        return {}
+    lines = describe_problems(policies, problems)
+    logger.error(f"{len(problems)} of {len(policies)} policies failed schema validation and will not be sent:")
+    for line in lines:
+        logger.error(f"  {line}")
+    return {
+        index: DeploymentResult(policies[index].get('name', f'policy #{index}'), POLICY_FAILED,
+                                'Schema validation failed: ' + '; '.join(errors))
+        for index, errors in problems.items()
+    }
+
+
+def deploy_policies(client: RHACSClient, policies: List[Dict[str, Any]],
+                    existing_names: Optional[Iterable[str]] = None,
+                    skip_existing: bool = True,
+                    max_workers: int = DEFAULT_MAX_WORKERS,
+                    timeout=None,
+                    batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+                    validate: bool = True,
+                    allow_unknown_fields: bool = False) -> DeploymentSummary:
+    """
+    Create policies concurrently and return an ordered DeploymentSummary.
+
+    Policies whose name is in ``existing_names`` are skipped without an API
+    call when ``skip_existing`` is set; policies Central reports as already
+    existing are also counted as skipped. ``timeout`` overrides the client's
+    per-request timeout for each create. Created policies carry a content-hash
+    stamp in their description for drift checks (see policy_hash.py).
+
+    With ``batch_size`` > 0 policies are created through /v1/policies/import
+    in batches of that size; only entries a batch fails to create (or every
+    entry of a batch whose request fails) are retried with single creates.
+
+    With ``validate`` set, policies that would be sent are first checked
+    against the RHACS policy schema (see policy_schema.py); invalid ones are
+    reported as failed without an API call. Set ``allow_unknown_fields`` for
+    bodies exported from Central, which may carry fields newer than the schema.
+    """
+    existing_names = set(existing_names or ())
+    results: List[Optional[DeploymentResult]] = [None] * len(policies)
+    pending = []
+
+    for index, policy in enumerate(policies):
+        if skip_existing and policy['name'] in existing_names:
+            logger.info(f"Policy '{policy['name']}' already exists, skipping")
+            results[index] = DeploymentResult(policy['name'], POLICY_SKIPPED, 'Policy already exists')
+        else:
+            pending.append(index)
+
+    if pending and validate:
+        failures = schema_failures([policies[index] for index in pending], allow_unknown_fields)
+        for position, result in failures.items():
+            results[pending[position]] = result
+        pending = [index for position, index in enumerate(pending) if position not in failures]
+
+    if pending and batch_size > 0:
+        pending = _import_batches(client, policies, pending, results, batch_size, max_workers, timeout)
+
+    if pending:
+        workers = max(1, min(max_workers, len(pending)))
+        logger.info(f"Deploying {len(pending)} policies with {workers} concurrent workers")
+
+        def _submit(index: int) -> DeploymentResult:
+            policy = policies[index]
+            try:
+                status, detail = client.submit_policy(stamp_policy(policy), timeout=timeout)
+            except Exception as e:
+                logger.error(f"Failed to create policy {policy['name']}: {e}")
+                status, detail = POLICY_FAILED, str(e)
+            return DeploymentResult(policy['name'], status, detail)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index, result in zip(pending, executor.map(_submit, pending)):
+                results[index] = result
+
+    return DeploymentSummary(results)
+
+
+def _import_batches(client: RHACSClient, policies: List[Dict[str, Any]], pending: List[int],
+                    results: List[Optional[DeploymentResult]], batch_size: int,
+                    max_workers: int, timeout) -> List[int]:
+    """
+    Create ``pending`` policies through bulk imports, filling in ``results``.
+
+    Returns the indexes that still need a single create.
+    """
+    batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+    workers = max(1, min(max_workers, len(batches)))
+    logger.info(f"Importing {len(pending)} policies in {len(batches)} batches with {workers} concurrent workers")
+
+    def _import(batch: List[int]):
+        try:
+            return client.import_policies([stamp_policy(policies[index]) for index in batch], timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Bulk import of {len(batch)} policies failed, falling back to single creates: {e}")
+            return None
+
+    retry = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch, outcomes in zip(batches, executor.map(_import, batches)):
+            if outcomes is None:
+                retry.extend(batch)
+                continue
+            for index, (status, detail) in zip(batch, outcomes):
+                name = policies[index]['name']
+                if status == POLICY_FAILED:
+                    logger.warning(f"Import of policy '{name}' failed ({detail}), retrying with a single create")
+                    retry.append(index)
+                    continue
+                if status == POLICY_CREATED:
+                    logger.info(f"Successfully imported policy: {name} (ID: {detail})")
+                else:
+                    logger.warning(f"Policy '{name}' already exists in RHACS")
+                results[index] = DeploymentResult(name, status, detail)
+
+    return sorted(retry)
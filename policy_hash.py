@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Policy Content Hashing
+
+Canonical content hashes for RHACS policy definitions, and a short stamp of
+that hash appended to each deployed policy's description, e.g.::
+
+    Ensure containers do not run as root. [content-hash:3f9a0c1d2e4b5a67]
+
+The ``/v1/policies`` list response includes each policy's description, so the
+stamps of every deployed policy are available from a single paginated list
+call. Comparing them with the hashes of the source catalog detects drift
+without fetching any per-policy details.
+
+Policy fingerprints hash only what a policy matches and where it applies
+(criteria, lifecycle stages, scope and exclusions), optionally together with
+what happens on a violation (enforcement, severity, notifiers, enabled state),
+in a canonical form, so policies that behave the same hash the same
+regardless of name, wording or the order of their sections and values.
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Server-maintained or cosmetic fields that never count as a difference
+IGNORED_FIELDS = frozenset([
+    'id', 'lastUpdated', 'policyVersion', 'source',
+    'SORTName', 'SORTLifecycleStage', 'SORTEnforcement'
+])
+
+# Hex digits of the sha256 digest kept in the description stamp
+STAMP_LENGTH = 16
+
+# Fields that determine what a policy matches and where it applies
+FINGERPRINT_FIELDS = ('policySections', 'lifecycleStages', 'scope', 'exclusions')
+
+# Fields that determine what happens on a violation; policies differing in
+# these are not interchangeable even when they match the same things
+ENFORCEMENT_FIELDS = ('enforcementActions', 'severity', 'notifiers', 'disabled', 'eventSource')
+
+# Fields two policies must share to be exact duplicates
+DUPLICATE_FIELDS = FINGERPRINT_FIELDS + ENFORCEMENT_FIELDS
+
+_STAMP_PATTERN = re.compile(r'\s*\[content-hash:([0-9a-f]{%d})\]\s*$' % STAMP_LENGTH)
+
+
+def _normalize(value: Any) -> Any:
+    """Drop empty/default values recursively so omitted and empty fields compare equal."""
+    if isinstance(value, dict):
+        normalized = {key: _normalize(item) for key, item in value.items()}
+        return {key: item for key, item in normalized.items() if item not in (None, '', [], {}, False)}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def strip_stamp(description: Optional[str]) -> str:
+    """Return a description without its content-hash stamp."""
+    return _STAMP_PATTERN.sub('', description or '')
+
+
+def read_stamp(description: Optional[str]) -> Optional[str]:
+    """Return the content-hash stamp carried by a description, or None."""
+    match = _STAMP_PATTERN.search(description or '')
+    return match.group(1) if match else None
+
+
+def content_hash(policy: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> str:
+    """
+    Hash a policy's content.
+
+    Only ``fields`` (default: every field of ``policy``) minus IGNORED_FIELDS
+    are hashed, so a Central policy can be compared on exactly the fields a
+    desired policy specifies. A stamp already present in the description is
+    ignored.
+    """
+    if fields is None:
+        fields = policy.keys()
+    content = {field: policy.get(field) for field in fields if field not in IGNORED_FIELDS}
+    if 'description' in content:
+        content['description'] = strip_stamp(content['description'])
+    encoded = json.dumps(_normalize(content), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def policy_stamp(policy: Dict[str, Any]) -> str:
+    """The stamp value for a source policy definition."""
+    return content_hash(policy)[:STAMP_LENGTH]
+
+
+def stamp_policy(policy: Dict[str, Any], stamp: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return a copy of ``policy`` whose description ends with its content-hash stamp.
+
+    ``stamp`` defaults to the policy's own stamp; pass the source policy's
+    stamp when ``policy`` is a merged body with extra Central-side fields.
+    """
+    stamp = stamp or policy_stamp(policy)
+    description = strip_stamp(policy.get('description'))
+    separator = ' ' if description else ''
+    return dict(policy, description=f"{description}{separator}[content-hash:{stamp}]")
+
+
+def _sorted_json(items: Iterable[Any]) -> List[Any]:
+    return sorted(items, key=lambda item: json.dumps(item, sort_keys=True))
+
+
+def canonical_policy(policy: Dict[str, Any], fields: Iterable[str] = FINGERPRINT_FIELDS) -> Dict[str, Any]:
+    """
+    Order-independent form of a policy's behaviour-defining fields.
+
+    Section names and exclusion names are cosmetic and dropped; sections,
+    policy groups, values, lifecycle stages, scopes and exclusions are
+    sorted.
+    """
+    canonical = {}
+    for field in fields:
+        value = policy.get(field)
+        if field == 'policySections':
+            value = _sorted_json(
+                _sorted_json({
+                    'fieldName': group.get('fieldName'),
+                    'booleanOperator': group.get('booleanOperator') or 'OR',
+                    'negate': bool(group.get('negate')),
+                    'values': sorted(str(item.get('value', '')) for item in group.get('values', []))
+                } for group in section.get('policyGroups', []))
+                for section in value or []
+            )
+        elif field == 'exclusions':
+            value = _sorted_json(_normalize({key: item for key, item in exclusion.items() if key != 'name'})
+                                 for exclusion in value or [])
+        elif isinstance(value, list):
+            value = _sorted_json(_normalize(value))
+        canonical[field] = value
+    return _normalize(canonical)
+
+
+def policy_fingerprint(policy: Dict[str, Any], fields: Iterable[str] = FINGERPRINT_FIELDS) -> str:
+    """sha256 of canonical_policy(); equal for policies that behave identically."""
+    encoded = json.dumps(canonical_policy(policy, fields), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def policy_cves(policy: Dict[str, Any]) -> List[str]:
+    """CVE IDs matched by a policy's CVE policy groups, each listed once."""
+    return list(dict.fromkeys(
+        value['value'] for section in policy.get('policySections', [])
+        for group in section.get('policyGroups', []) if group.get('fieldName') == 'CVE'
+        for value in group.get('values', []) if value.get('value')))
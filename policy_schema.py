@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Local RHACS Policy Schema Validation
+
+Checks policy definitions against the rules Central applies when a policy is
+created, so malformed policies are found in one local pass instead of one
+rejected POST at a time:
+
+- only known policy fields, with the expected JSON types
+- severity, lifecycle stage, event source and enforcement action enum values
+- enforcement actions that apply to one of the policy's lifecycle stages
+- at least one policy section, each with at least one policy group
+- AND/OR operators and non-empty values
+- criteria field names; names missing from CRITERIA_FIELDS are reported as
+  warnings only, since Central may know criteria this list does not
+
+The schema is compiled once into lookup tables at import time; validating a
+policy is a single walk over it. Every problem is reported, not just the
+first one.
+
+Usage:
+    python3 policy_schema.py
+    python3 policy_schema.py --file nist_800_190_policies.json
+"""
+
+import argparse
+import sys
+from typing import Any, Callable, Dict, Iterable, List
+
+# Enum values accepted by Central
+SEVERITIES = frozenset([
+    'LOW_SEVERITY', 'MEDIUM_SEVERITY', 'HIGH_SEVERITY', 'CRITICAL_SEVERITY'
+])
+
+LIFECYCLE_STAGES = frozenset(['BUILD', 'DEPLOY', 'RUNTIME'])
+
+EVENT_SOURCES = frozenset(['NOT_APPLICABLE', 'DEPLOYMENT_EVENT', 'AUDIT_LOG_EVENT'])
+
+# Enforcement actions and the lifecycle stage each one applies to
+ENFORCEMENT_STAGES = {
+    'UNSET_ENFORCEMENT': None,
+    'FAIL_BUILD_ENFORCEMENT': 'BUILD',
+    'SCALE_TO_ZERO_ENFORCEMENT': 'DEPLOY',
+    'UNSATISFIABLE_NODE_CONSTRAINT_ENFORCEMENT': 'DEPLOY',
+    'FAIL_DEPLOYMENT_CREATE_ENFORCEMENT': 'DEPLOY',
+    'FAIL_DEPLOYMENT_UPDATE_ENFORCEMENT': 'DEPLOY',
+    'KILL_POD_ENFORCEMENT': 'RUNTIME',
+    'FAIL_KUBE_REQUEST_ENFORCEMENT': 'RUNTIME',
+}
+
+BOOLEAN_OPERATORS = frozenset(['OR', 'AND'])
+
+# Policy criteria field names known to Central
+CRITERIA_FIELDS = frozenset([
+    'Add Capabilities', 'Allow Privilege Escalation', 'AppArmor Profile',
+    'Automount Service Account Token', 'Container CPU Limit', 'Container CPU Request',
+    'Container Memory Limit', 'Container Memory Request', 'Container Name', 'CVE', 'CVSS',
+    'Days Since CVE Was First Discovered In Image', 'Days Since CVE Was First Discovered In System',
+    'Days Since CVE Was Published', 'Days Since Image Was First Discovered',
+    'Disallowed Annotation', 'Disallowed Image Label', 'Dockerfile Line', 'Drop Capabilities',
+    'Environment Variable', 'Exposed Node Port', 'Exposed Port', 'Exposed Port Protocol',
+    'Fixable', 'Fixed By', 'Has Egress Network Policy', 'Has Ingress Network Policy',
+    'Host IPC', 'Host Network', 'Host PID', 'Image Age', 'Image Component', 'Image OS',
+    'Image Registry', 'Image Remote', 'Image Scan Age', 'Image Signature Verified By',
+    'Image Tag', 'Image User', 'Kubernetes API Verb', 'Kubernetes Resource',
+    'Kubernetes Resource Name', 'Kubernetes User Groups', 'Kubernetes User Name',
+    'Liveness Probe Defined', 'Minimum RBAC Permissions', 'Mount Propagation', 'Namespace',
+    'NVD CVSS', 'Port Exposure Method', 'Privileged Container', 'Process Ancestor',
+    'Process Arguments', 'Process Name', 'Process UID', 'Read-Only Root Filesystem',
+    'Readiness Probe Defined', 'Replicas', 'Required Annotation', 'Required Image Label',
+    'Required Label', 'Runtime Class', 'Seccomp Profile Type', 'Service Account', 'Severity',
+    'Unexpected Network Flow Detected', 'Unscanned Image', 'Volume Destination', 'Volume Name',
+    'Volume Source', 'Volume Type', 'Writable Host Mount', 'Writable Mounted Volume',
+    'Unexpected Process Executed', 'Is Impersonated User', 'Source IP Address', 'User Agent',
+])
+
+
+class SchemaReport:
+    """Errors (Central would reject the policy) and warnings (it may not) found in one policy."""
+
+    def __init__(self, allow_unknown: bool = False):
+        self.allow_unknown = allow_unknown
+        self.errors: List[str] = []
+        self.warnings: List[str] = []
+
+    def error(self, path: str, message: str):
+        self.errors.append(f"{path}: {message}")
+
+    def warn(self, path: str, message: str):
+        self.warnings.append(f"{path}: {message}")
+
+
+def _string(path: str, value: Any, report: SchemaReport):
+    if not isinstance(value, str):
+        report.error(path, "expected a string")
+
+
+def _boolean(path: str, value: Any, report: SchemaReport):
+    if not isinstance(value, bool):
+        report.error(path, "expected true or false")
+
+
+def _enum(allowed: Iterable[str]) -> Callable[[str, Any, SchemaReport], None]:
+    allowed = frozenset(allowed)
+    hint = f" (expected one of {', '.join(sorted(allowed))})"
+
+    def check(path: str, value: Any, report: SchemaReport):
+        if value not in allowed:
+            report.error(path, f"unknown value '{value}'{hint}")
+    return check
+
+
+def _list_of(check: Callable[[str, Any, SchemaReport], None], required: bool = False):
+    def check_list(path: str, value: Any, report: SchemaReport):
+        if not isinstance(value, list):
+            report.error(path, "expected a list")
+            return
+        if required and not value:
+            report.error(path, "must not be empty")
+        for index, item in enumerate(value):
+            check(f"{path}[{index}]", item, report)
+    return check_list
+
+
+def _object(path: str, value: Any, report: SchemaReport):
+    if not isinstance(value, dict):
+        report.error(path, "expected an object")
+
+
+def _non_empty_string(path: str, value: Any, report: SchemaReport):
+    if not isinstance(value, str) or not value.strip():
+        report.error(path, "must be a non-empty string")
+
+
+def _criteria_field(path: str, value: Any, report: SchemaReport):
+    # CRITERIA_FIELDS may lag behind Central, so an unlisted name is only a warning
+    _non_empty_string(path, value, report)
+    if isinstance(value, str) and value.strip() and value not in CRITERIA_FIELDS and not report.allow_unknown:
+        report.warn(path, f"unknown criteria field '{value}'")
+
+
+def _policy_value(path: str, value: Any, report: SchemaReport):
+    _check_object(path, value, _VALUE_FIELDS, ('value',), report)
+
+
+_VALUE_FIELDS = {
+    'value': _non_empty_string,
+}
+
+_GROUP_FIELDS = {
+    'fieldName': _criteria_field,
+    'booleanOperator': _enum(BOOLEAN_OPERATORS),
+    'negate': _boolean,
+    'values': _list_of(_policy_value, required=True),
+}
+
+
+def _policy_group(path: str, value: Any, report: SchemaReport):
+    _check_object(path, value, _GROUP_FIELDS, ('fieldName', 'values'), report)
+
+
+_SECTION_FIELDS = {
+    'sectionName': _string,
+    'policyGroups': _list_of(_policy_group, required=True),
+}
+
+
+def _policy_section(path: str, value: Any, report: SchemaReport):
+    _check_object(path, value, _SECTION_FIELDS, ('policyGroups',), report)
+
+
+# Top-level policy fields and their checks
+POLICY_FIELDS = {
+    'id': _string,
+    'name': _non_empty_string,
+    'description': _string,
+    'rationale': _string,
+    'remediation': _string,
+    'disabled': _boolean,
+    'categories': _list_of(_non_empty_string),
+    'lifecycleStages': _list_of(_enum(LIFECYCLE_STAGES), required=True),
+    'eventSource': _enum(EVENT_SOURCES),
+    'exclusions': _list_of(_object),
+    'scope': _list_of(_object),
+    'severity': _enum(SEVERITIES),
+    'enforcementActions': _list_of(_enum(ENFORCEMENT_STAGES)),
+    'notifiers': _list_of(_string),
+    'lastUpdated': _string,
+    'SORTName': _string,
+    'SORTLifecycleStage': _string,
+    'SORTEnforcement': _boolean,
+    'policyVersion': _string,
+    'policySections': _list_of(_policy_section, required=True),
+    'mitreAttackVectors': _list_of(_object),
+    'criteriaLocked': _boolean,
+    'mitreVectorsLocked': _boolean,
+    'isDefault': _boolean,
+    'source': _string,
+}
+
+REQUIRED_FIELDS = ('name', 'severity', 'lifecycleStages', 'policySections')
+
+
+def _check_object(path: str, value: Any, fields: Dict[str, Callable], required: Iterable[str],
+                  report: SchemaReport):
+    if not isinstance(value, dict):
+        report.error(path or 'policy', "expected an object")
+        return
+    prefix = f"{path}." if path else ''
+    for key in required:
+        if key not in value:
+            report.error(f"{prefix}{key}", "missing")
+    for key, item in value.items():
+        check = fields.get(key)
+        if check is not None:
+            check(f"{prefix}{key}", item, report)
+        elif not report.allow_unknown:
+            report.error(f"{prefix}{key}", "unknown field")
+
+
+def check_policy(policy: Any, allow_unknown_fields: bool = False) -> SchemaReport:
+    """
+    Errors and warnings for one policy definition.
+
+    ``allow_unknown_fields`` accepts fields and criteria names missing from
+    the schema at every level, for bodies exported from Central that may
+    carry newer ones.
+    """
+    report = SchemaReport(allow_unknown_fields)
+    _check_object('', policy, POLICY_FIELDS, REQUIRED_FIELDS, report)
+    if not isinstance(policy, dict):
+        return report
+
+    stages = policy.get('lifecycleStages')
+    actions = policy.get('enforcementActions')
+    if not isinstance(stages, list) or not isinstance(actions, list):
+        return report
+    for index, action in enumerate(actions):
+        stage = ENFORCEMENT_STAGES.get(action)
+        if stage and stage not in stages:
+            report.error(f"enforcementActions[{index}]", f"{action} requires the {stage} lifecycle stage")
+    return report
+
+
+def validate_policy(policy: Any, allow_unknown_fields: bool = False) -> List[str]:
+    """Every schema error of one policy definition (empty when Central would accept it)."""
+    return check_policy(policy, allow_unknown_fields).errors
+
+
+def check_policies(policies: Iterable[Any], allow_unknown_fields: bool = False) -> Dict[int, SchemaReport]:
+    """Reports by position for every policy in ``policies`` with errors or warnings."""
+    reports = {}
+    for index, policy in enumerate(policies):
+        report = check_policy(policy, allow_unknown_fields)
+        if report.errors or report.warnings:
+            reports[index] = report
+    return reports
+
+
+def validate_policies(policies: Iterable[Any], allow_unknown_fields: bool = False) -> Dict[int, List[str]]:
+    """Schema errors by position for every invalid policy in ``policies``."""
+    return {index: report.errors
+            for index, report in check_policies(policies, allow_unknown_fields).items() if report.errors}
+
+
+def describe_problems(policies: List[Any], problems: Dict[int, List[str]]) -> List[str]:
+    """One line per problem, prefixed with the policy's name (or position when unnamed)."""
+    lines = []
+    for index, errors in sorted(problems.items()):
+        policy = policies[index]
+        name = policy.get('name') if isinstance(policy, dict) else None
+        label = f"'{name}'" if isinstance(name, str) and name else f"policy #{index}"
+        lines.extend(f"{label}: {error}" for error in errors)
+    return lines
+
+
+def main():
+    """Validate catalog files and print every problem; exit code 1 if any policy has errors."""
+    from policy_catalog import DEFAULT_CATALOG_FILES, PolicyCatalog
+
+    parser = argparse.ArgumentParser(description='Validate policy catalogs against the RHACS policy schema')
+    parser.add_argument('--file', dest='files', action='append',
+                        help='Catalog file to validate (repeatable; default: all bundled catalogs)')
+    args = parser.parse_args()
+
+    invalid = 0
+    for path in args.files or DEFAULT_CATALOG_FILES:
+        try:
+            policies = PolicyCatalog.load([path]).policies
+        except (OSError, ValueError) as e:
+            print(f"{path}: {e}")
+            invalid += 1
+            continue
+        reports = check_policies(policies)
+        problems = {index: report.errors for index, report in reports.items() if report.errors}
+        warnings = {index: report.warnings for index, report in reports.items() if report.warnings}
+        for line in describe_problems(policies, problems):
+            print(f"{path}: {line}")
+        for line in describe_problems(policies, warnings):
+            print(f"{path}: warning: {line}")
+        print(f"{path}: {len(policies) - len(problems)}/{len(policies)} policies valid"
+              + (f", {len(warnings)} with warnings" if warnings else ""))
+        invalid += len(problems)
+
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == '__main__':
+    main()
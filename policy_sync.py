@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Incremental Policy Sync Engine
+
+Reconciles RHACS Central with desired policy catalogs (cis_policies.json,
+nist_800_190_policies.json, data_sovereignty_policies.json, ...) in two steps:
+
+- plan: list existing policies once and compare the content-hash stamp in
+  each listed description (see policy_hash.py) with the desired policy's
+  hash; only policies whose stamp differs are exported, in a single request,
+  to decide between an update and a stamp-only refresh
+- apply: issue only the create/update/delete operations the plan contains,
+  through a bounded worker pool
+
+Unchanged policies cost no API calls. Deletes are opt-in (``prune``) and only
+ever target non-default policies whose name starts with a managed prefix.
+
+Usage:
+    python3 policy_sync.py plan --catalog cis_policies.json
+    python3 policy_sync.py apply --catalog cis_policies.json --catalog nist_800_190_policies.json
+    python3 policy_sync.py apply --catalog cis_policies.json --prune --managed-prefix CIS-
+    python3 policy_sync.py drift --catalog cis_policies.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from rhacs_client import RHACSClient, POLICY_FAILED
+from policy_hash import content_hash, policy_stamp, read_stamp, stamp_policy
+from policy_deployer import (
+    DeploymentResult, DeploymentSummary, DEFAULT_MAX_WORKERS,
+    POLICY_UPDATED, POLICY_DELETED, POLICY_UNCHANGED, schema_failures
+)
+
+logger = logging.getLogger(__name__)
+
+# Planned operations
+SYNC_CREATE = 'create'
+SYNC_UPDATE = 'update'
+SYNC_DELETE = 'delete'
+SYNC_UNCHANGED = 'unchanged'
+
+
+class SyncOperation:
+    """One planned change (or no-op) for a single policy."""
+
+    def __init__(self, action: str, name: str, policy: Optional[Dict[str, Any]] = None,
+                 policy_id: Optional[str] = None, reason: str = ''):
+        self.action = action
+        self.name = name
+        self.policy = policy
+        self.policy_id = policy_id
+        self.reason = reason
+
+
+class SyncPlan:
+    """Ordered create/update/delete/unchanged operations."""
+
+    def __init__(self, operations: List[SyncOperation]):
+        self.operations = operations
+
+    def _with_action(self, action: str) -> List[SyncOperation]:
+        return [op for op in self.operations if op.action == action]
+
+    @property
+    def creates(self) -> List[SyncOperation]:
+        return self._with_action(SYNC_CREATE)
+
+    @property
+    def updates(self) -> List[SyncOperation]:
+        return self._with_action(SYNC_UPDATE)
+
+    @property
+    def deletes(self) -> List[SyncOperation]:
+        return self._with_action(SYNC_DELETE)
+
+    @property
+    def unchanged(self) -> List[SyncOperation]:
+        return self._with_action(SYNC_UNCHANGED)
+
+    @property
+    def changes(self) -> List[SyncOperation]:
+        return [op for op in self.operations if op.action != SYNC_UNCHANGED]
+
+
+def load_catalog(path: str) -> List[Dict[str, Any]]:
+    """
+    Load policies from a catalog file.
+
+    Accepts a list of policies or an object whose list values hold policies
+    (e.g. ``kubernetes_policies``/``docker_policies`` in cis_policies.json).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    groups = data.values() if isinstance(data, dict) else [data]
+    return [
+        policy
+        for group in groups if isinstance(group, list)
+        for policy in group if isinstance(policy, dict) and policy.get('name')
+    ]
+
+
+def plan_sync(client: RHACSClient, desired: List[Dict[str, Any]],
+              managed_prefixes: Iterable[str] = (), prune: bool = False,
+              full_compare: bool = False) -> SyncPlan:
+    """
+    Diff desired policies against Central and return the operations needed.
+
+    Existing policies are listed once; full definitions are exported in one
+    request only for policies that exist on both sides. With ``prune``,
+    non-default Central policies named with one of ``managed_prefixes`` that
+    are no longer desired are planned for deletion. ``full_compare`` also
+    exports policies whose stamp matches, to catch edits made in the RHACS UI.
+    """
+    desired_by_name: Dict[str, Dict[str, Any]] = {}
+    for policy in desired:
+        if policy['name'] in desired_by_name:
+            logger.warning(f"Duplicate desired policy '{policy['name']}', keeping the first definition")
+            continue
+        desired_by_name[policy['name']] = policy
+
+    # Errors propagate: planning against a partial listing would re-create policies
+    existing_by_name = {policy['name']: policy for policy in client.iter_policies()}
+    logger.info(f"Found {len(existing_by_name)} existing policies in RHACS")
+
+    stamps = {name: policy_stamp(policy) for name, policy in desired_by_name.items()}
+
+    # A policy whose listed description already carries the desired stamp is
+    # in sync; only the rest need their full definitions exported
+    matched_ids = [
+        existing_by_name[name]['id'] for name in desired_by_name
+        if name in existing_by_name and not existing_by_name[name].get('isDefault')
+        and (full_compare or read_stamp(existing_by_name[name].get('description')) != stamps[name])
+    ]
+    existing_bodies = {policy['id']: policy for policy in client.export_policies(matched_ids)}
+
+    operations = []
+    for name, policy in desired_by_name.items():
+        existing = existing_by_name.get(name)
+        if existing is None:
+            operations.append(SyncOperation(SYNC_CREATE, name, stamp_policy(policy, stamps[name])))
+            continue
+
+        policy_id = existing['id']
+        if existing.get('isDefault'):
+            operations.append(SyncOperation(SYNC_UNCHANGED, name, policy, policy_id,
+                                            'default policy, not modified'))
+            continue
+
+        if not full_compare and read_stamp(existing.get('description')) == stamps[name]:
+            operations.append(SyncOperation(SYNC_UNCHANGED, name, policy, policy_id))
+            continue
+
+        current = existing_bodies.get(policy_id)
+        if current is None:
+            logger.warning(f"Could not export policy '{name}', leaving it unchanged")
+            operations.append(SyncOperation(SYNC_UNCHANGED, name, policy, policy_id, 'export failed'))
+            continue
+
+        # Merge onto the current body so fields the catalog does not manage
+        # (e.g. notifiers attached in the UI) are preserved
+        merged = dict(current)
+        merged.update(policy)
+        if content_hash(policy) != content_hash(current, policy.keys()):
+            reason = 'content changed'
+        elif read_stamp(current.get('description')) != stamps[name]:
+            reason = 'add content hash'
+        else:
+            operations.append(SyncOperation(SYNC_UNCHANGED, name, policy, policy_id))
+            continue
+        operations.append(SyncOperation(SYNC_UPDATE, name, stamp_policy(merged, stamps[name]), policy_id, reason))
+
+    if prune:
+        prefixes = tuple(managed_prefixes)
+        if not prefixes:
+            logger.warning("Prune requested without managed prefixes; no policies will be deleted")
+        for name, existing in existing_by_name.items():
+            if (prefixes and name.startswith(prefixes) and name not in desired_by_name
+                    and not existing.get('isDefault')):
+                operations.append(SyncOperation(SYNC_DELETE, name, policy_id=existing['id'],
+                                                reason='no longer in catalog'))
+
+    return SyncPlan(operations)
+
+
+def check_drift(client: RHACSClient, desired: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Compare deployed policies with their source definitions from one list call.
+
+    Returns policy names grouped as ``in_sync``, ``drifted`` (stamp differs),
+    ``unstamped`` (deployed before stamping, or the stamp was edited away) and
+    ``missing``. No per-policy details are fetched.
+    """
+    deployed = {policy['name']: policy.get('description') for policy in client.iter_policies()}
+    drift = {'in_sync': [], 'drifted': [], 'unstamped': [], 'missing': []}
+    for policy in desired:
+        name = policy['name']
+        if name not in deployed:
+            drift['missing'].append(name)
+            continue
+        stamp = read_stamp(deployed[name])
+        if stamp is None:
+            drift['unstamped'].append(name)
+        elif stamp == policy_stamp(policy):
+            drift['in_sync'].append(name)
+        else:
+            drift['drifted'].append(name)
+    return drift
+
+
+def apply_sync(client: RHACSClient, plan: SyncPlan,
+               max_workers: int = DEFAULT_MAX_WORKERS, timeout=None,
+               validate: bool = True, allow_unknown_fields: bool = False) -> DeploymentSummary:
+    """
+    Execute a plan's changes concurrently and return an ordered DeploymentSummary.
+
+    With ``validate`` set, policies to create or update are checked against
+    the RHACS policy schema first and invalid ones fail without an API call.
+    Update bodies are merged onto Central's export, so fields the schema does
+    not know are always accepted there; ``allow_unknown_fields`` accepts them
+    in creates too, e.g. for catalogs exported from Central.
+    """
+    failures = {}
+    if validate:
+        for ops, allow_unknown in ((plan.creates, allow_unknown_fields), (plan.updates, True)):
+            if ops:
+                failures.update((id(ops[position]), result) for position, result in
+                                schema_failures([op.policy for op in ops], allow_unknown).items())
+
+    def _apply(op: SyncOperation) -> DeploymentResult:
+        if id(op) in failures:
+            return failures[id(op)]
+        try:
+            if op.action == SYNC_UNCHANGED:
+                return DeploymentResult(op.name, POLICY_UNCHANGED, op.reason)
+            if op.action == SYNC_CREATE:
+                status, detail = client.submit_policy(op.policy, timeout=timeout)
+                return DeploymentResult(op.name, status, detail)
+            if op.action == SYNC_UPDATE:
+                if client.update_policy(op.policy_id, op.policy, timeout=timeout):
+                    return DeploymentResult(op.name, POLICY_UPDATED, op.policy_id)
+                return DeploymentResult(op.name, POLICY_FAILED, 'Update failed')
+            if client.delete_policy(op.policy_id):
+                return DeploymentResult(op.name, POLICY_DELETED, op.policy_id)
+            return DeploymentResult(op.name, POLICY_FAILED, 'Delete failed')
+        except Exception as e:
+            logger.error(f"Failed to {op.action} policy {op.name}: {e}")
+            return DeploymentResult(op.name, POLICY_FAILED, str(e))
+
+    changes = len(plan.changes)
+    if changes:
+        logger.info(f"Applying {changes} policy changes with {max(1, min(max_workers, changes))} concurrent workers")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, changes or 1))) as executor:
+        return DeploymentSummary(list(executor.map(_apply, plan.operations)))
+
+
+def sync_policies(client: RHACSClient, policies: List[Dict[str, Any]],
+                  managed_prefixes: Iterable[str] = (), prune: bool = False,
+                  max_workers: int = DEFAULT_MAX_WORKERS, timeout=None,
+                  validate: bool = True, allow_unknown_fields: bool = False) -> DeploymentSummary:
+    """Plan, log and apply a sync of ``policies`` in one call (used by the policy creators)."""
+    plan = plan_sync(client, policies, managed_prefixes, prune)
+    log_plan(plan)
+    return apply_sync(client, plan, max_workers=max_workers, timeout=timeout, validate=validate,
+                      allow_unknown_fields=allow_unknown_fields)
+
+
+def log_plan(plan: SyncPlan):
+    """Log the planned changes and a one-line summary."""
+    for op in plan.changes:
+        symbol = {SYNC_CREATE: '+', SYNC_UPDATE: '~', SYNC_DELETE: '-'}[op.action]
+        logger.info(f"  {symbol} {op.action:<7} {op.name}" + (f" ({op.reason})" if op.reason else ''))
+    logger.info(f"Plan: {len(plan.creates)} to create, {len(plan.updates)} to update, "
+                f"{len(plan.deletes)} to delete, {len(plan.unchanged)} unchanged")
+
+
+def log_drift(drift: Dict[str, List[str]]):
+    """Log out-of-sync policies and a one-line summary."""
+    for key, label in (('drifted', 'drifted'), ('unstamped', 'no hash'), ('missing', 'missing')):
+        for name in drift[key]:
+            logger.info(f"  {label:<9} {name}")
+    logger.info(f"Drift: {len(drift['in_sync'])} in sync, {len(drift['drifted'])} drifted, "
+                f"{len(drift['unstamped'])} without content hash, {len(drift['missing'])} missing")
+
+
+def log_summary(summary: DeploymentSummary):
+    """Log the outcome of an applied plan."""
+    logger.info("=" * 50)
+    logger.info("RHACS Policy Sync Summary")
+    logger.info("=" * 50)
+    logger.info(f"Total policies processed: {summary.total}")
+    logger.info(f"Created: {summary.created}")
+    logger.info(f"Updated: {summary.updated}")
+    logger.info(f"Deleted: {summary.deleted}")
+    logger.info(f"Unchanged: {summary.skipped}")
+    logger.info(f"Failed: {summary.failed}")
+    logger.info("=" * 50)
+
+
+def load_configuration(config_file: str = "config.json") -> Dict[str, Any]:
+    """Load application configuration from JSON file."""
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"ERROR: Configuration file '{config_file}' not found")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"ERROR: Invalid JSON in configuration file: {e}")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Plan and apply incremental RHACS policy changes from policy catalogs'
+    )
+    parser.add_argument('command', choices=['plan', 'apply', 'drift'],
+                        help="'plan' shows the changes, 'apply' makes them, "
+                             "'drift' compares content hashes only")
+    parser.add_argument('--catalog', action='append', required=True,
+                        help='Policy catalog JSON file (repeatable)')
+    parser.add_argument('--prune', action='store_true',
+                        help='Delete managed policies that are no longer in the catalogs')
+    parser.add_argument('--managed-prefix', action='append', default=[],
+                        help='Policy name prefix owned by the catalogs, required for --prune (repeatable)')
+    parser.add_argument('--full', action='store_true',
+                        help='Compare full definitions of every matching policy, not just content hashes')
+    parser.add_argument('--allow-unknown-fields', action='store_true',
+                        help='Accept fields missing from the local policy schema in new policies too, '
+                             'e.g. for catalogs exported from Central')
+    parser.add_argument('--config', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json'),
+                        help='Path to config.json with RHACS connection settings')
+    args = parser.parse_args()
+
+    config = load_configuration(args.config)
+    logging.basicConfig(
+        level=getattr(logging, config.get('logging', {}).get('level', 'INFO')),
+        format=config.get('logging', {}).get('format', '%(asctime)s - %(levelname)s - %(message)s')
+    )
+
+    rhacs_config = config.get('rhacs', {})
+    central_url = rhacs_config.get('central_url')
+    api_token = rhacs_config.get('api_token')
+    if not central_url or not api_token:
+        logger.error("RHACS central_url and api_token must be provided in config.json")
+        sys.exit(1)
+
+    policies_config = config.get('policies', {})
+    client = RHACSClient(central_url, api_token, rate_limit=rhacs_config.get('rate_limit'))
+
+    desired = []
+    for catalog in args.catalog:
+        policies = load_catalog(catalog)
+        logger.info(f"Loaded {len(policies)} policies from {catalog}")
+        desired.extend(policies)
+
+    if args.command == 'drift':
+        drift = check_drift(client, desired)
+        log_drift(drift)
+        if drift['drifted'] or drift['unstamped'] or drift['missing']:
+            sys.exit(1)
+        return
+
+    plan = plan_sync(client, desired, args.managed_prefix, args.prune, args.full)
+    log_plan(plan)
+
+    if args.command == 'plan':
+        return
+
+    summary = apply_sync(
+        client,
+        plan,
+        max_workers=policies_config.get('max_workers', DEFAULT_MAX_WORKERS),
+        timeout=policies_config.get('request_timeout'),
+        allow_unknown_fields=args.allow_unknown_fields
+    )
+    log_summary(summary)
+
+    if summary.failed > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
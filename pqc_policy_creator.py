@@ -12,55 +12,12 @@ This script creates policies to:
 import os
 import json
 import logging
-import requests
 from typing import Dict, Any, List
 
-# Disable SSL warnings for demo environments
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-class RHACSClient:
-    """Client for interacting with RHACS API"""
-    
-    def __init__(self, central_url: str, api_token: str):
-        self.central_url = central_url.rstrip('/')
-        self.api_token = api_token
-        self.headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json"
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-        self.session.verify = False  # Consider using proper certificate validation in production
-
-    def get_existing_policies(self) -> List[Dict[str, Any]]:
-        """Fetches existing policies from RHACS"""
-        url = f"{self.central_url}/v1/policies"
-        try:
-            response = self.session.get(url)
-            response.raise_for_status()
-            return response.json().get('policies', [])
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Failed to get existing policies: {e}")
-            return []
-
-    def create_policy(self, policy: Dict[str, Any]) -> bool:
-        """Creates a single policy in RHACS"""
-        url = f"{self.central_url}/v1/policies"
-        try:
-            response = self.session.post(url, json=policy)
-            if response.status_code == 200:
-                policy_data = response.json()
-                logging.info(f"✅ Successfully created policy: {policy['name']} (ID: {policy_data.get('id', 'Unknown')})")
-                return True
-            else:
-                logging.error(f"❌ Failed to create policy: {policy['name']}")
-                logging.error(f"   Status Code: {response.status_code}")
-                logging.error(f"   Response: {response.text}")
-                return False
-        except requests.exceptions.RequestException as e:
-            logging.error(f"❌ Exception while creating policy {policy['name']}: {e}")
-            return False
+from rhacs_client import RHACSClient
+from policy_deployer import deploy_policies, DEFAULT_MAX_WORKERS, DEFAULT_IMPORT_BATCH_SIZE
+from async_rhacs_client import deploy_policies_concurrently
+from policy_catalog import PolicyCatalog
 
 class PQCPolicyGenerator:
     """Generates and manages Post-Quantum Cryptography policies"""
@@ -76,9 +33,8 @@ class PQCPolicyGenerator:
             return []
         
         try:
-            with open(self.policy_file, 'r') as f:
-                data = json.load(f)
-                return data.get('pqc_policies', [])
+            catalog = PolicyCatalog.load([os.path.abspath(self.policy_file)])
+            return catalog.section('pqc_policies')
         except json.JSONDecodeError as e:
             logging.error(f"Error parsing policy file: {e}")
             return []
@@ -86,43 +42,47 @@ class PQCPolicyGenerator:
             logging.error(f"Error loading policy file: {e}")
             return []
 
-    def create_all_policies(self, client: RHACSClient, skip_existing: bool = True) -> None:
+    def create_all_policies(self, client: RHACSClient, skip_existing: bool = True,
+                            max_workers: int = DEFAULT_MAX_WORKERS,
+                            import_batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+                            use_async: bool = False) -> None:
         """Creates all PQC policies in RHACS"""
         if not self.policies:
             logging.warning("No PQC policies found to create.")
             return
 
-        existing_policies = []
+        existing_names = set()
         if skip_existing:
-            existing_policies = client.get_existing_policies()
-            existing_names = {policy['name'] for policy in existing_policies}
-
-        created_count = 0
-        skipped_count = 0
-        failed_count = 0
+            existing_names = {policy['name'] for policy in client.get_existing_policies()}
 
         logging.info(f"📋 Processing {len(self.policies)} PQC policies...")
-        
-        for policy in self.policies:
-            policy_name = policy['name']
-            
-            if skip_existing and policy_name in existing_names:
-                logging.info(f"⏭️  Skipping existing policy: {policy_name}")
-                skipped_count += 1
-                continue
-            
-            logging.info(f"🔐 Creating PQC policy: {policy_name}")
-            if client.create_policy(policy):
-                created_count += 1
-            else:
-                failed_count += 1
+
+        if use_async:
+            # One event loop overlaps every create, bounded by max_workers
+            summary = deploy_policies_concurrently(
+                client,
+                self.policies,
+                existing_names=existing_names,
+                skip_existing=skip_existing,
+                max_concurrency=max_workers,
+                batch_size=import_batch_size
+            )
+        else:
+            summary = deploy_policies(
+                client,
+                self.policies,
+                existing_names=existing_names,
+                skip_existing=skip_existing,
+                max_workers=max_workers,
+                batch_size=import_batch_size
+            )
 
         # Summary
         logging.info(f"\n📊 PQC Policy Creation Summary:")
-        logging.info(f"   ✅ Created: {created_count}")
-        logging.info(f"   ⏭️  Skipped: {skipped_count}")
-        logging.info(f"   ❌ Failed: {failed_count}")
-        logging.info(f"   📋 Total: {len(self.policies)}")
+        logging.info(f"   ✅ Created: {summary.created}")
+        logging.info(f"   ⏭️  Skipped: {summary.skipped}")
+        logging.info(f"   ❌ Failed: {summary.failed}")
+        logging.info(f"   📋 Total: {summary.total}")
 
 def load_configuration(config_file: str = "config.json") -> Dict[str, Any]:
     """Loads configuration from JSON file"""
@@ -165,17 +125,20 @@ def main():
     # Extract policy configuration
     policy_config = config.get('policies', {})
     skip_existing = policy_config.get('skip_existing', True)
+    max_workers = policy_config.get('max_workers', DEFAULT_MAX_WORKERS)
+    import_batch_size = policy_config.get('import_batch_size', DEFAULT_IMPORT_BATCH_SIZE)
+    use_async = policy_config.get('async', False)
 
     logging.info("🚀 Starting Post-Quantum Cryptography Policy Creation")
     logging.info(f"   🎯 RHACS URL: {central_url}")
     logging.info(f"   ⏭️  Skip Existing: {skip_existing}")
 
     # Initialize clients
-    rhacs_client = RHACSClient(central_url, api_token)
+    rhacs_client = RHACSClient(central_url, api_token, rate_limit=rhacs_config.get('rate_limit'))
     pqc_generator = PQCPolicyGenerator()
 
     # Create policies
-    pqc_generator.create_all_policies(rhacs_client, skip_existing)
+    pqc_generator.create_all_policies(rhacs_client, skip_existing, max_workers, import_batch_size, use_async)
 
     logging.info("🏁 Post-Quantum Cryptography policy creation completed!")
 
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Rate Limiting and Throttling Backoff for Central API Calls
+
+Building blocks shared by RHACSClient and AsyncRHACSClient:
+
+- TokenBucket: caps the request rate (requests per second with a burst
+  allowance) across every thread or task using a client
+- AdaptiveConcurrency: an in-flight request limit that halves when Central
+  answers 429/503 and grows back by one after a window of successful
+  requests (additive increase, multiplicative decrease)
+- backoff_delay: retry delay honouring ``Retry-After`` or, without it,
+  exponential backoff with full jitter so throttled workers do not retry in
+  lockstep
+"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Responses meaning "slow down": the request was not processed
+THROTTLE_STATUS_CODES = (429, 503)
+
+# Retries of a throttled request before its response is returned to the caller
+DEFAULT_THROTTLE_RETRIES = 5
+
+# Exponential backoff base and ceiling in seconds
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_CAP = 30.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None,
+                  base: float = DEFAULT_BACKOFF_BASE, cap: float = DEFAULT_BACKOFF_CAP) -> float:
+    """Delay before retry number ``attempt`` (0-based) of a throttled request."""
+    delay = parse_retry_after(retry_after)
+    if delay is not None:
+        # Honour the server's delay, spread so waiting workers do not return together
+        return min(cap, delay + random.uniform(0, base))
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``rate`` tokens per second up to ``burst``."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent."""
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    """
+    In-flight request limit adjusted from Central's responses.
+
+    ``throttled()`` halves the limit, at most once per generation: requests
+    sent before the last decrease cannot lower it again, so one burst of
+    429s counts once. Every ``limit`` consecutive successes raise the limit
+    by one, up to ``max_limit``.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self.generation = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+        self._async_waiters = []
+
+    def acquire(self) -> int:
+        """Block until fewer than ``limit`` requests are in flight; returns the generation."""
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+            return self.generation
+
+    async def acquire_async(self) -> int:
+        """Async acquire for callers sharing one event loop."""
+        while True:
+            with self._condition:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return self.generation
+                waiter = asyncio.get_running_loop().create_future()
+                self._async_waiters.append(waiter)
+            await waiter
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._wake()
+
+    def _wake(self):
+        self._condition.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.get_loop().call_soon_threadsafe(self._resolve, waiter)
+
+    @staticmethod
+    def _resolve(waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def succeeded(self):
+        """Record a request Central accepted; ramps the limit back up."""
+        with self._condition:
+            self._successes += 1
+            if self.limit < self.max_limit and self._successes >= self.limit:
+                self.limit += 1
+                self._successes = 0
+                self._wake()
+
+    def throttled(self, generation: int) -> bool:
+        """Record a 429/503 for a request acquired in ``generation``; True if the limit was lowered."""
+        with self._condition:
+            self._successes = 0
+            if generation != self.generation or self.limit <= self.min_limit:
+                return False
+            self.limit = max(self.min_limit, self.limit // 2)
+            self.generation += 1
+            return True
@@ -7,16 +7,16 @@ security policies based on CIS benchmarks for both Kubernetes and Docker.
 """
 
 import json
-import requests
 import logging
 import sys
 import os
 from typing import Dict, List, Any
-from urllib.parse import urljoin
-import urllib3
 
-# Disable SSL warnings for demo environments
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from rhacs_client import RHACSClient
+from policy_catalog import PolicyCatalog
+from policy_deployer import deploy_policies, DEFAULT_MAX_WORKERS, DEFAULT_IMPORT_BATCH_SIZE
+from policy_sync import sync_policies
+from async_rhacs_client import deploy_policies_concurrently
 
 # Global logger (will be configured after loading config)
 logger = logging.getLogger(__name__)
@@ -55,84 +55,20 @@ def load_configuration(config_file: str = "config.json") -> Dict[str, Any]:
         sys.exit(1)
 
 
-class RHACSClient:
-    """RHACS API client for managing security policies."""
-    
-    def __init__(self, central_url: str, api_token: str):
-        self.central_url = central_url.rstrip('/')
-        self.api_token = api_token
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.api_token}',
-            'Content-Type': 'application/json'
-        })
-        
-    def _make_request(self, method: str, endpoint: str, data: Dict = None) -> requests.Response:
-        """Make HTTP request to RHACS API."""
-        url = urljoin(self.central_url, endpoint)
-        try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                json=data,
-                verify=False  # For demo environments
-            )
-            response.raise_for_status()
-            return response
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {e}")
-            raise
-    
-    def test_connection(self) -> bool:
-        """Test connection to RHACS Central."""
-        try:
-            response = self._make_request('GET', '/v1/metadata')
-            logger.info("Successfully connected to RHACS Central")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to connect to RHACS Central: {e}")
-            return False
-    
-    def create_policy(self, policy: Dict[str, Any]) -> bool:
-        """Create a security policy in RHACS."""
-        try:
-            response = self._make_request('POST', '/v1/policies', policy)
-            policy_id = response.json().get('id', 'unknown')
-            logger.info(f"Successfully created policy: {policy['name']} (ID: {policy_id})")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to create policy {policy['name']}: {e}")
-            return False
-    
-    def get_existing_policies(self) -> List[Dict]:
-        """Get list of existing policies."""
-        try:
-            response = self._make_request('GET', '/v1/policies')
-            return response.json().get('policies', [])
-        except Exception as e:
-            logger.error(f"Failed to fetch existing policies: {e}")
-            return []
-
-
 class CISPolicyGenerator:
     """Generator for CIS benchmark-based security policies."""
     
     def __init__(self, policies_config_file: str = "cis_policies.json"):
         """Initialize the generator with a policies configuration file path."""
         self.config_file = policies_config_file
-        self._policies_data = None
+        self._catalog = None
     
-    def _load_policies(self) -> Dict[str, Any]:
-        """Load policies from the JSON configuration file."""
-        if self._policies_data is None:
+    def _load_policies(self) -> PolicyCatalog:
+        """Load policies from the JSON configuration file into an indexed catalog."""
+        if self._catalog is None:
             try:
-                # Get the directory where the script is located
-                script_dir = os.path.dirname(os.path.abspath(__file__))
-                config_path = os.path.join(script_dir, self.config_file)
-                
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    self._policies_data = json.load(f)
-                logger.info(f"Successfully loaded policy configurations from {config_path}")
+                self._catalog = PolicyCatalog.load([self.config_file])
+                logger.info(f"Successfully loaded {len(self._catalog)} policy configurations from {self.config_file}")
             except FileNotFoundError:
                 logger.error(f"Policy configuration file '{self.config_file}' not found")
                 raise
@@ -143,32 +79,27 @@ class CISPolicyGenerator:
                 logger.error(f"Error loading policy configuration file: {e}")
                 raise
         
-        return self._policies_data
+        return self._catalog
     
     def get_kubernetes_cis_policies(self) -> List[Dict[str, Any]]:
         """Load Kubernetes CIS benchmark policies from configuration file."""
-        policies_data = self._load_policies()
-        return policies_data.get('kubernetes_policies', [])
+        return self._load_policies().section('kubernetes_policies')
     
     def get_docker_cis_policies(self) -> List[Dict[str, Any]]:
         """Load Docker CIS benchmark policies from configuration file."""
-        policies_data = self._load_policies()
-        return policies_data.get('docker_policies', [])
+        return self._load_policies().section('docker_policies')
     
     def get_runtime_cis_policies(self) -> List[Dict[str, Any]]:
         """Load Runtime CIS benchmark policies from configuration file."""
-        policies_data = self._load_policies()
-        return policies_data.get('runtime_policies', [])
+        return self._load_policies().section('runtime_policies')
     
     def get_pqc_policies(self) -> List[Dict[str, Any]]:
         """Load Post-Quantum Cryptography policies from configuration file."""
-        policies_data = self._load_policies()
-        return policies_data.get('pqc_policies', [])
+        return self._load_policies().section('pqc_policies')
     
     def get_data_sovereignty_policies(self) -> List[Dict[str, Any]]:
         """Load Data Sovereignty policies from configuration file."""
-        policies_data = self._load_policies()
-        return policies_data.get('data_sovereignty_policies', [])
+        return self._load_policies().section('data_sovereignty_policies')
 
 
 def main():
@@ -188,22 +119,26 @@ def main():
         sys.exit(1)
     
     # Initialize RHACS client
-    client = RHACSClient(central_url, api_token)
+    client = RHACSClient(central_url, api_token, rate_limit=rhacs_config.get('rate_limit'))
     
     # Test connection
     if not client.test_connection():
         logger.error("Failed to connect to RHACS. Exiting.")
         sys.exit(1)
     
-    # Get existing policies to avoid duplicates
-    existing_policies = client.get_existing_policies()
-    existing_policy_names = {policy.get('name', '') for policy in existing_policies}
-    
     # Generate CIS policies
     try:
         policies_config = config.get('policies', {})
         policies_config_file = policies_config.get('config_file', 'cis_policies.json')
         skip_existing = policies_config.get('skip_existing', True)
+        max_workers = policies_config.get('max_workers', DEFAULT_MAX_WORKERS)
+        request_timeout = policies_config.get('request_timeout')
+        import_batch_size = policies_config.get('import_batch_size', DEFAULT_IMPORT_BATCH_SIZE)
+        use_async = policies_config.get('async', False)
+        validate_schema = policies_config.get('validate_schema', True)
+        sync = policies_config.get('sync', False)
+        prune = policies_config.get('prune', False)
+        managed_prefixes = policies_config.get('managed_prefixes', ['CIS-'])
         
         generator = CISPolicyGenerator(policies_config_file)
         
@@ -233,25 +168,49 @@ def main():
     # Combine all policies
     all_policies = k8s_policies + docker_policies + runtime_policies + pqc_policies + data_sovereignty_policies
     
-    # Create policies
-    created_count = 0
-    skipped_count = 0
-    failed_count = 0
-    
-    for policy in all_policies:
-        policy_name = policy['name']
-        
-        # Skip if policy already exists and skip_existing is enabled
-        if skip_existing and policy_name in existing_policy_names:
-            logger.info(f"Policy '{policy_name}' already exists, skipping")
-            skipped_count += 1
-            continue
+    # Create policies concurrently
+    if sync:
+        # Create new, update changed and optionally prune removed policies
+        summary = sync_policies(
+            client,
+            all_policies,
+            managed_prefixes=managed_prefixes,
+            prune=prune,
+            max_workers=max_workers,
+            timeout=request_timeout,
+            validate=validate_schema
+        )
+    else:
+        # Get existing policies to avoid duplicates
+        existing_policies = client.get_existing_policies()
+        existing_policy_names = {policy.get('name', '') for policy in existing_policies}
         
-        # Create the policy
-        if client.create_policy(policy):
-            created_count += 1
+        if use_async:
+            # One event loop overlaps every create, bounded by max_workers
+            summary = deploy_policies_concurrently(
+                client,
+                all_policies,
+                existing_names=existing_policy_names,
+                skip_existing=skip_existing,
+                max_concurrency=max_workers,
+                timeout=request_timeout,
+                batch_size=import_batch_size,
+                validate=validate_schema
+            )
         else:
-            failed_count += 1
+            summary = deploy_policies(
+                client,
+                all_policies,
+                existing_names=existing_policy_names,
+                skip_existing=skip_existing,
+                max_workers=max_workers,
+                timeout=request_timeout,
+                batch_size=import_batch_size,
+                validate=validate_schema
+            )
+    created_count = summary.created
+    skipped_count = summary.skipped
+    failed_count = summary.failed
     
     # Summary
     logger.info("=" * 50)
@@ -259,7 +218,12 @@ def main():
     logger.info("=" * 50)
     logger.info(f"Total policies processed: {len(all_policies)}")
     logger.info(f"Successfully created: {created_count}")
-    logger.info(f"Skipped (already exist): {skipped_count}")
+    if sync:
+        logger.info(f"Updated: {summary.updated}")
+        logger.info(f"Deleted: {summary.deleted}")
+        logger.info(f"Unchanged: {skipped_count}")
+    else:
+        logger.info(f"Skipped (already exist): {skipped_count}")
     logger.info(f"Failed to create: {failed_count}")
     logger.info("=" * 50)
     
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Shared RHACS API Client
+
+Single RHACS Central client used by the policy creators and the compliance
+reporting scripts. It wraps one pooled, keep-alive ``requests.Session`` so that
+every entry point shares the same connection reuse, retry/backoff and timeout
+behaviour instead of paying a fresh TLS handshake per request.
+
+Requests pass through an optional token-bucket rate limit and an adaptive
+in-flight limit (see rate_limiter.py): 429/503 responses are retried after
+``Retry-After`` or a jittered exponential backoff and halve the number of
+concurrent requests, which then ramps back up as Central accepts requests.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import (
+    AdaptiveConcurrency, TokenBucket, backoff_delay,
+    THROTTLE_STATUS_CODES, DEFAULT_THROTTLE_RETRIES
+)
+
+# Disable SSL warnings for demo environments
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeout in seconds applied to every request
+DEFAULT_TIMEOUT = (10, 60)
+
+# Number of pooled keep-alive connections kept open to Central
+DEFAULT_POOL_SIZE = 32
+
+# Records requested per page from paginated list endpoints
+DEFAULT_PAGE_SIZE = 1000
+
+# Retry policy for transient failures (connection errors and gateway errors);
+# throttling responses (429/503) are retried by RHACSClient._send instead
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (502, 504)
+
+# POST is intentionally excluded so a retried create never duplicates a policy
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'])
+
+# Outcomes reported by RHACSClient.submit_policy
+POLICY_CREATED = 'created'
+POLICY_EXISTS = 'exists'
+POLICY_FAILED = 'failed'
+
+
+def import_outcomes(policies: List[Dict[str, Any]], body: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(status, detail) per input policy, in input order, from a /v1/policies/import response body."""
+    by_name = {}
+    for entry in body.get('responses', []):
+        name = entry.get('policy', {}).get('name')
+        if entry.get('succeeded'):
+            by_name[name] = (POLICY_CREATED, entry['policy'].get('id', 'unknown'))
+            continue
+        errors = entry.get('errors', [])
+        if any(error.get('type') in ('duplicate_name', 'duplicate_id') for error in errors):
+            by_name[name] = (POLICY_EXISTS, 'Policy already exists')
+        else:
+            message = '; '.join(error.get('message', '') for error in errors) or 'Import failed'
+            by_name[name] = (POLICY_FAILED, message)
+
+    return [by_name.get(policy['name'], (POLICY_FAILED, 'Missing from import response'))
+            for policy in policies]
+
+
+class RHACSClient:
+    """RHACS API client backed by a tuned, pooled HTTP session."""
+
+    def __init__(self, central_url: str, api_token: str, verify_ssl: bool = False,
+                 timeout=DEFAULT_TIMEOUT, pool_size: int = DEFAULT_POOL_SIZE,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 page_size: int = DEFAULT_PAGE_SIZE,
+                 rate_limit: Optional[float] = None,
+                 throttle_retries: int = DEFAULT_THROTTLE_RETRIES):
+        self.central_url = central_url.rstrip('/')
+        self.api_token = api_token
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self.page_size = page_size
+        self.rate_limit = rate_limit
+        self.throttle_retries = throttle_retries
+        self.session = self._build_session(pool_size, max_retries)
+        self.bucket = TokenBucket(rate_limit) if rate_limit else None
+        self.concurrency = AdaptiveConcurrency(pool_size)
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'RHACSClient':
+        """Build a client from RHACS_URL, RHACS_API_TOKEN, RHACS_VERIFY_SSL, RHACS_PAGE_SIZE and RHACS_RATE_LIMIT."""
+        kwargs.setdefault('page_size', int(os.getenv('RHACS_PAGE_SIZE', DEFAULT_PAGE_SIZE)))
+        if os.getenv('RHACS_RATE_LIMIT'):
+            kwargs.setdefault('rate_limit', float(os.getenv('RHACS_RATE_LIMIT')))
+        return cls(
+            os.getenv('RHACS_URL', ''),
+            os.getenv('RHACS_API_TOKEN', ''),
+            verify_ssl=os.getenv('RHACS_VERIFY_SSL', 'false').lower() == 'true',
+            **kwargs
+        )
+
+    def _build_session(self, pool_size: int, max_retries: int) -> requests.Session:
+        """Create the shared session with sized connection pools and retries."""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=DEFAULT_BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=RETRY_METHODS,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.verify = self.verify_ssl
+        session.headers.update({
+            'Authorization': f'Bearer {self.api_token}',
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+        return session
+
+    def close(self):
+        """Release pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send one request through the rate limit and adaptive concurrency limit.
+
+        Throttled responses are retried up to ``throttle_retries`` times; a
+        POST is only retried on 429, which guarantees it was not processed.
+        The last response is returned unchecked.
+        """
+        attempt = 0
+        while True:
+            if self.bucket:
+                self.bucket.acquire()
+            generation = self.concurrency.acquire()
+            try:
+                response = self.session.request(method=method, url=url, **kwargs)
+            finally:
+                self.concurrency.release()
+
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                self.concurrency.succeeded()
+                return response
+
+            if self.concurrency.throttled(generation):
+                logger.warning(f"RHACS Central is throttling requests, reducing concurrency to {self.concurrency.limit}")
+            retryable = response.status_code == 429 or method.upper() in RETRY_METHODS
+            if not retryable or attempt >= self.throttle_retries:
+                return response
+
+            delay = backoff_delay(attempt, response.headers.get('Retry-After'))
+            logger.debug(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def _make_request(self, method: str, endpoint: str, data: Dict = None,
+                      params: Dict = None, timeout=None) -> requests.Response:
+        """Make HTTP request to RHACS API."""
+        url = urljoin(self.central_url, endpoint)
+        try:
+            response = self._send(
+                method,
+                url,
+                json=data,
+                params=params,
+                timeout=timeout or self.timeout
+            )
+            response.raise_for_status()
+            return response
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API request failed: {e}")
+            if getattr(e, 'response', None) is not None:
+                logger.error(f"Response: {e.response.text[:500]}")
+            raise
+
+    def get_json(self, endpoint: str, params: Dict = None) -> Optional[Dict[str, Any]]:
+        """GET an endpoint and return the decoded JSON body, or None on error."""
+        try:
+            return self._make_request('GET', endpoint, params=params).json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error making API request to {endpoint}: {e}")
+            return None
+
+    def paginate(self, endpoint: str, key: str, params: Dict = None,
+                 page_size: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield records from a list endpoint one page at a time.
+
+        Pages are requested with ``pagination.limit``/``pagination.offset`` until
+        a short page is returned, so only one page is held in memory at once.
+        Request errors are raised rather than silently truncating the results.
+        """
+        page_size = page_size or self.page_size
+        offset = 0
+        first = None
+        while True:
+            page_params = dict(params or {})
+            page_params['pagination.limit'] = page_size
+            page_params['pagination.offset'] = offset
+            records = self._make_request('GET', endpoint, params=page_params).json().get(key, [])
+            # An endpoint ignoring the offset returns the previous page again
+            if offset and records and records[0] == first:
+                logger.warning(f"{endpoint} ignored pagination.offset; stopping after {offset} records")
+                return
+            first = records[0] if records else None
+            yield from records
+
+            # A short page is the last one; an oversized page means the
+            # endpoint ignored pagination and already returned everything.
+            if len(records) != page_size:
+                return
+            offset += page_size
+
+    def iter_deployments(self, query: str = None, page_size: int = None) -> Iterator[Dict[str, Any]]:
+        """Stream deployments, optionally filtered by a search query."""
+        params = {'query': query} if query else None
+        return self.paginate('/v1/deployments', 'deployments', params, page_size)
+
+    def iter_alerts(self, query: str = None, page_size: int = None) -> Iterator[Dict[str, Any]]:
+        """Stream alerts, optionally filtered by a search query."""
+        params = {'query': query} if query else None
+        return self.paginate('/v1/alerts', 'alerts', params, page_size)
+
+    def iter_policies(self, query: str = None, page_size: int = None) -> Iterator[Dict[str, Any]]:
+        """Stream policies, optionally filtered by a search query."""
+        params = {'query': query} if query else None
+        return self.paginate('/v1/policies', 'policies', params, page_size)
+
+    def test_connection(self) -> bool:
+        """Test connection to RHACS Central."""
+        try:
+            response = self._make_request('GET', '/v1/metadata')
+            metadata = response.json()
+            logger.info(f"Successfully connected to RHACS Central (version: {metadata.get('version', 'unknown')})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to connect to RHACS Central: {e}")
+            return False
+
+    def submit_policy(self, policy: Dict[str, Any], timeout=None) -> Tuple[str, str]:
+        """
+        Create a security policy and report the outcome.
+
+        Returns a (status, detail) tuple where status is one of POLICY_CREATED,
+        POLICY_EXISTS or POLICY_FAILED and detail is the new policy ID or the
+        error message.
+        """
+        url = urljoin(self.central_url, '/v1/policies')
+        try:
+            response = self._send('POST', url, json=policy, timeout=timeout or self.timeout)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to create policy {policy['name']}: {e}")
+            return POLICY_FAILED, str(e)
+
+        if response.status_code == 200:
+            policy_id = response.json().get('id', 'unknown')
+            logger.info(f"Successfully created policy: {policy['name']} (ID: {policy_id})")
+            return POLICY_CREATED, policy_id
+        if response.status_code == 409 or 'already exists' in response.text:
+            logger.warning(f"Policy '{policy['name']}' already exists in RHACS")
+            return POLICY_EXISTS, 'Policy already exists'
+
+        logger.error(f"Failed to create policy {policy['name']}. Status: {response.status_code}, Response: {response.text[:500]}")
+        return POLICY_FAILED, f"Error: {response.status_code} - {response.text}"
+
+    def import_policies(self, policies: List[Dict[str, Any]], timeout=None) -> List[Tuple[str, str]]:
+        """
+        Create many policies with one /v1/policies/import request.
+
+        Returns a (status, detail) tuple per input policy, in input order, as
+        submit_policy does. Raises if the import request itself fails.
+        """
+        response = self._make_request('POST', '/v1/policies/import',
+                                      {'policies': policies, 'metadata': {'overwrite': False}},
+                                      timeout=timeout)
+        return import_outcomes(policies, response.json())
+
+    def create_policy(self, policy: Dict[str, Any]) -> bool:
+        """Create a security policy in RHACS."""
+        status, _ = self.submit_policy(policy)
+        return status == POLICY_CREATED
+
+    def update_policy(self, policy_id: str, policy: Dict[str, Any], timeout=None) -> bool:
+        """Replace an existing policy's definition."""
+        body = dict(policy, id=policy_id)
+        try:
+            self._make_request('PUT', f'/v1/policies/{policy_id}', body, timeout=timeout)
+            logger.info(f"Successfully updated policy: {policy['name']} (ID: {policy_id})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update policy {policy['name']}: {e}")
+            return False
+
+    def delete_policy(self, policy_id: str) -> bool:
+        """Delete a single policy by its ID."""
+        try:
+            self._make_request('DELETE', f'/v1/policies/{policy_id}')
+            logger.info(f"Successfully deleted policy with ID: {policy_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete policy {policy_id}: {e}")
+            return False
+
+    def export_policies(self, policy_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch full policy definitions for many policies in one request."""
+        if not policy_ids:
+            return []
+        response = self._make_request('POST', '/v1/policies/export', {'policyIds': list(policy_ids)})
+        return response.json().get('policies', [])
+
+    def get_existing_policies(self, query: str = None) -> List[Dict]:
+        """Get list of existing policies, optionally filtered by a search query."""
+        try:
+            return list(self.iter_policies(query))
+        except Exception as e:
+            logger.error(f"Failed to fetch existing policies: {e}")
+            return []
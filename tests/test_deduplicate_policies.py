@@ -0,0 +1,150 @@
+import copy
+from datetime import datetime, timezone
+
+from deduplicate_policies import (
+    DEDUP_BY_CONTENT, DEDUP_BY_CVE, PolicyDeduplicator, enforces_more, parse_timestamp
+)
+
+
+class FakeCentral:
+    """In-memory stand-in for the RHACSClient calls used by the deduplicator."""
+
+    def __init__(self, policies):
+        self.policies = {policy['id']: copy.deepcopy(policy) for policy in policies}
+        self.deleted = []
+
+    def get_existing_policies(self, query=None):
+        return [{key: value for key, value in policy.items() if key != 'policySections'}
+                for policy in self.policies.values()]
+
+    def export_policies(self, policy_ids):
+        return [copy.deepcopy(self.policies[policy_id]) for policy_id in policy_ids]
+
+    def delete_policy(self, policy_id):
+        self.deleted.append(self.policies.pop(policy_id)['name'])
+        return True
+
+
+def cve_policy(policy_id, cves, created, **extra):
+    policy = {
+        'id': policy_id,
+        'name': f'CISA KEV: {policy_id}',
+        'createdAt': created,
+        'severity': 'CRITICAL_SEVERITY',
+        'lifecycleStages': ['DEPLOY'],
+        'policySections': [{'policyGroups': [
+            {'fieldName': 'CVE', 'values': [{'value': cve} for cve in cves]}]}],
+    }
+    policy.update(extra)
+    return policy
+
+
+def privileged_policy(policy_id, **extra):
+    policy = {
+        'id': policy_id,
+        'name': policy_id,
+        'createdAt': '2026-01-01T00:00:00Z',
+        'severity': 'HIGH_SEVERITY',
+        'lifecycleStages': ['DEPLOY'],
+        'disabled': False,
+        'policySections': [{'sectionName': policy_id, 'policyGroups': [
+            {'fieldName': 'Privileged Container', 'values': [{'value': 'true'}]}]}],
+    }
+    policy.update(extra)
+    return policy
+
+
+def planned(plan):
+    return [(keep['name'], sorted(policy['name'] for policy in delete)) for _, keep, delete in plan.groups]
+
+
+def test_parse_timestamp_handles_nanoseconds_and_bad_values():
+    assert parse_timestamp('2026-10-16T03:04:05.123456789Z') == \
+        datetime(2026, 10, 16, 3, 4, 5, 123456, tzinfo=timezone.utc)
+    assert parse_timestamp('2026-10-16T03:04:05') == datetime(2026, 10, 16, 3, 4, 5, tzinfo=timezone.utc)
+    assert parse_timestamp(None) == parse_timestamp('not a date') == datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def test_cve_mode_keeps_the_newest_of_identical_cve_sets():
+    central = FakeCentral([
+        cve_policy('old', ['CVE-1', 'CVE-2'], '2024-01-01T00:00:00Z'),
+        cve_policy('new', ['CVE-2', 'CVE-1'], '2025-01-01T00:00:00.5Z'),
+        cve_policy('other', ['CVE-1'], '2025-06-01T00:00:00Z'),
+    ])
+    plan = PolicyDeduplicator(mode=DEDUP_BY_CVE).plan(central)
+    assert planned(plan) == [('CISA KEV: new', ['CISA KEV: old'])]
+
+
+def test_cve_mode_prefers_enabled_policies_and_keeps_stricter_copies():
+    central = FakeCentral([
+        cve_policy('newest-disabled', ['CVE-1'], '2026-01-01T00:00:00Z', disabled=True),
+        cve_policy('enabled', ['CVE-1'], '2024-01-01T00:00:00Z'),
+        cve_policy('older', ['CVE-1'], '2023-01-01T00:00:00Z'),
+        cve_policy('enforcing', ['CVE-1'], '2022-01-01T00:00:00Z',
+                   enforcementActions=['FAIL_DEPLOYMENT_CREATE_ENFORCEMENT']),
+    ])
+    plan = PolicyDeduplicator(mode=DEDUP_BY_CVE).plan(central)
+    assert planned(plan) == [('CISA KEV: enabled', ['CISA KEV: newest-disabled', 'CISA KEV: older'])]
+
+
+def test_cve_mode_ignores_policies_without_cves_and_defaults():
+    central = FakeCentral([
+        cve_policy('default', ['CVE-1'], '2024-01-01T00:00:00Z', isDefault=True),
+        cve_policy('custom', ['CVE-1'], '2025-01-01T00:00:00Z'),
+        privileged_policy('no-cves-a'),
+        privileged_policy('no-cves-b'),
+    ])
+    assert PolicyDeduplicator(mode=DEDUP_BY_CVE).plan(central).groups == []
+
+
+def test_enforces_more():
+    keep = {'disabled': False, 'enforcementActions': ['SCALE_TO_ZERO_ENFORCEMENT']}
+    assert not enforces_more({'enforcementActions': ['SCALE_TO_ZERO_ENFORCEMENT']}, keep)
+    assert enforces_more({'enforcementActions': ['KILL_POD_ENFORCEMENT']}, keep)
+    assert enforces_more({'disabled': False}, {'disabled': True})
+    assert not enforces_more({'disabled': True}, {'disabled': False})
+
+
+def test_content_mode_never_deletes_defaults_or_stricter_copies():
+    central = FakeCentral([
+        privileged_policy('Default privileged', isDefault=True, disabled=True),
+        privileged_policy('Clone', disabled=True),
+        privileged_policy('Renamed clone', disabled=True, description='different words'),
+        privileged_policy('Enforcing clone', disabled=True,
+                          enforcementActions=['FAIL_DEPLOYMENT_CREATE_ENFORCEMENT']),
+        privileged_policy('Enabled clone'),
+    ])
+    plan = PolicyDeduplicator(mode=DEDUP_BY_CONTENT).plan(central)
+    assert planned(plan) == [('Default privileged', ['Clone', 'Renamed clone'])]
+    clusters = [sorted(policy['name'] for policy in cluster) for cluster in plan.near_duplicates]
+    assert clusters == [['Default privileged', 'Enabled clone', 'Enforcing clone']]
+
+
+def test_content_mode_keeps_policies_with_different_scope():
+    central = FakeCentral([
+        privileged_policy('All namespaces'),
+        privileged_policy('Payments only', scope=[{'namespace': 'payments'}]),
+    ])
+    plan = PolicyDeduplicator(mode=DEDUP_BY_CONTENT).plan(central)
+    assert plan.groups == []
+    assert len(plan.near_duplicates) == 1
+
+
+def test_content_mode_reports_only_unless_delete_is_set():
+    policies = [privileged_policy('A'), privileged_policy('B', createdAt='2025-01-01T00:00:00Z')]
+    central = FakeCentral(policies)
+    PolicyDeduplicator(mode=DEDUP_BY_CONTENT).find_and_remove_duplicates(central)
+    assert central.deleted == []
+
+    PolicyDeduplicator(mode=DEDUP_BY_CONTENT, delete_content_duplicates=True).find_and_remove_duplicates(central)
+    assert central.deleted == ['B']
+
+
+def test_dry_run_deletes_nothing():
+    central = FakeCentral([
+        cve_policy('a', ['CVE-1'], '2024-01-01T00:00:00Z'),
+        cve_policy('b', ['CVE-1'], '2025-01-01T00:00:00Z'),
+    ])
+    plan = PolicyDeduplicator(mode=DEDUP_BY_CVE).find_and_remove_duplicates(central, dry_run=True)
+    assert len(plan.deletes) == 1
+    assert central.deleted == []
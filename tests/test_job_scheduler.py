@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from job_scheduler import (
+    CronSchedule, IntervalSchedule, JobScheduler, RunRecord, RUN_FAILED, RUN_SUCCEEDED
+)
+
+
+def test_daily_run_later_today_and_next_day():
+    schedule = CronSchedule('0 3 * * *')
+    assert schedule.next_after(datetime(2026, 10, 16, 2, 59, 30)) == datetime(2026, 10, 16, 3, 0)
+    assert schedule.next_after(datetime(2026, 10, 16, 3, 0)) == datetime(2026, 10, 17, 3, 0)
+
+
+def test_next_after_crosses_month_and_year_boundaries():
+    assert CronSchedule('30 23 * * *').next_after(datetime(2026, 10, 31, 23, 45)) == datetime(2026, 11, 1, 23, 30)
+    assert CronSchedule('0 0 1 * *').next_after(datetime(2026, 12, 15, 8, 0)) == datetime(2027, 1, 1, 0, 0)
+    assert CronSchedule('*/15 * * * *').next_after(datetime(2026, 12, 31, 23, 59)) == datetime(2027, 1, 1, 0, 0)
+
+
+def test_day_of_month_missing_from_short_months_is_skipped():
+    schedule = CronSchedule('0 12 31 * *')
+    assert schedule.next_after(datetime(2026, 4, 1)) == datetime(2026, 5, 31, 12, 0)
+    assert CronSchedule('0 0 29 2 *').next_after(datetime(2026, 3, 1)) == datetime(2028, 2, 29, 0, 0)
+
+
+def test_lists_ranges_and_steps():
+    schedule = CronSchedule('5,35 8-10/2 * * *')
+    assert schedule.minutes == frozenset([5, 35])
+    assert schedule.hours == frozenset([8, 10])
+    assert schedule.next_after(datetime(2026, 10, 16, 8, 40)) == datetime(2026, 10, 16, 10, 5)
+    assert CronSchedule('10/20 * * * *').minutes == frozenset([10, 30, 50])
+
+
+def test_seven_is_sunday():
+    assert CronSchedule('0 0 * * 7').weekdays == frozenset([0])
+    assert CronSchedule('0 0 * * 5-7').weekdays == frozenset([0, 5, 6])
+    # 2026-10-16 is a Friday
+    assert CronSchedule('0 6 * * 7').next_after(datetime(2026, 10, 16)) == datetime(2026, 10, 18, 6, 0)
+
+
+def test_restricted_day_fields_match_either_day():
+    # The 1st of the month or any Monday
+    schedule = CronSchedule('0 9 1 * 1')
+    assert schedule.next_after(datetime(2026, 10, 16)) == datetime(2026, 10, 19, 9, 0)
+    assert schedule.next_after(datetime(2026, 10, 27)) == datetime(2026, 11, 1, 9, 0)
+
+
+@pytest.mark.parametrize('expression', ['0 9 * * 1', '0 9 */1 * 1'])
+def test_day_field_starting_with_star_is_unrestricted(expression):
+    # Only Mondays, even when the day-of-month field is '*/1'
+    schedule = CronSchedule(expression)
+    assert schedule.next_after(datetime(2026, 10, 16)) == datetime(2026, 10, 19, 9, 0)
+    assert schedule.next_after(datetime(2026, 10, 19, 9, 0)) == datetime(2026, 10, 26, 9, 0)
+
+
+@pytest.mark.parametrize('expression', [
+    '0 3 * *', '60 * * * *', '* 24 * * *', '* * 0 * *', '* * * 13 *', '* * * * 8',
+    '*/0 * * * *', 'a * * * *', '5-1 * * * *',
+])
+def test_invalid_expressions_are_rejected(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_expression_that_never_matches():
+    with pytest.raises(ValueError):
+        CronSchedule('0 0 30 2 *').next_after(datetime(2026, 1, 1))
+
+
+def test_interval_schedule():
+    assert IntervalSchedule(90).next_after(datetime(2026, 10, 16, 12, 0)) == datetime(2026, 10, 16, 12, 1, 30)
+    with pytest.raises(ValueError):
+        IntervalSchedule(0)
+
+
+@pytest.mark.parametrize('result, outcome', [(None, RUN_SUCCEEDED), (True, RUN_SUCCEEDED), (False, RUN_FAILED)])
+def test_run_outcome_follows_job_result(result, outcome):
+    scheduler = JobScheduler(lambda: result, IntervalSchedule(60))
+    record = RunRecord(1, 'manual', datetime.now())
+    scheduler._execute(record)
+    assert record.outcome == outcome
+    assert scheduler.status()['lastRun']['outcome'] == outcome
+
+
+def test_job_exception_is_recorded_as_failure():
+    def job():
+        raise RuntimeError('feed down')
+
+    scheduler = JobScheduler(job, IntervalSchedule(60))
+    record = RunRecord(1, 'manual', datetime.now())
+    scheduler._execute(record)
+    assert (record.outcome, record.error) == (RUN_FAILED, 'feed down')
+    assert scheduler.status()['lastSuccess'] is None
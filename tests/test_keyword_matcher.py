@@ -0,0 +1,56 @@
+from cisa_kev_policy_creator import CONTAINER_KEYWORDS, KeywordMatcher, filter_vulnerabilities
+
+
+def test_single_word_keywords_match_whole_words_only():
+    matcher = KeywordMatcher(['helm', 'runc'])
+    assert matcher.find('Helm chart injection') == ['helm']
+    assert matcher.find('overwhelm the runtime') == []
+    assert matcher.find('runc-based escape') == ['runc']
+
+
+def test_multi_word_keywords_match_consecutive_words():
+    matcher = KeywordMatcher(['api server', 'controller manager'])
+    assert matcher.find('Kubernetes API Server privilege escalation') == ['api server']
+    assert matcher.find('the api of the server') == []
+    assert matcher.find('Controller-Manager SSRF') == ['controller manager']
+
+
+def test_trailing_star_matches_word_prefixes():
+    matcher = KeywordMatcher(['container*'])
+    assert matcher.find('containerized workloads') == ['container*']
+    assert matcher.find('Containers and container') == ['container*', 'container*']
+    assert matcher.find('a contained issue') == []
+
+
+def test_prefix_after_leading_words():
+    matcher = KeywordMatcher(['docker engine*'])
+    assert matcher.find('Docker Engines before 20.10') == ['docker engine*']
+    assert matcher.find('docker daemon') == []
+
+
+def test_keywords_sharing_a_prefix_all_match():
+    matcher = KeywordMatcher(['cri', 'cri-o', 'cri o runtime'])
+    assert sorted(matcher.find('CRI-O runtime flaw')) == ['cri', 'cri o runtime', 'cri-o']
+
+
+def test_keywords_are_normalized_and_deduplicated():
+    matcher = KeywordMatcher(['  Docker ', 'docker', '', '   '])
+    assert matcher.keywords == ['docker']
+    assert matcher.find('DOCKER') == ['docker']
+
+
+def test_empty_and_missing_text():
+    matcher = KeywordMatcher(CONTAINER_KEYWORDS)
+    assert matcher.find('') == []
+    assert matcher.find(None) == []
+
+
+def test_filter_vulnerabilities_checks_each_field():
+    vulnerabilities = [
+        {'cveID': 'CVE-1', 'vulnerabilityName': 'Kubernetes kubelet flaw'},
+        {'cveID': 'CVE-2', 'shortDescription': 'Affects containerd shims'},
+        {'cveID': 'CVE-3', 'vulnerabilityName': 'Windows SMB flaw', 'notes': 'docker'},
+        {'cveID': 'CVE-4', 'vulnerabilityName': 'An overwhelming flood'},
+    ]
+    matched = filter_vulnerabilities(vulnerabilities, KeywordMatcher(CONTAINER_KEYWORDS))
+    assert [vuln['cveID'] for vuln in matched] == ['CVE-1', 'CVE-2']
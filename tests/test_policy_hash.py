@@ -0,0 +1,117 @@
+import copy
+
+from policy_hash import (
+    DUPLICATE_FIELDS, STAMP_LENGTH, content_hash, policy_cves, policy_fingerprint,
+    policy_stamp, read_stamp, stamp_policy, strip_stamp
+)
+
+
+def make_policy(**overrides):
+    policy = {
+        'name': 'CIS-5.1.1 - Privileged containers',
+        'description': 'Do not run privileged containers.',
+        'severity': 'HIGH_SEVERITY',
+        'lifecycleStages': ['DEPLOY'],
+        'categories': ['CIS'],
+        'exclusions': [],
+        'policySections': [{
+            'sectionName': 'Section 1',
+            'policyGroups': [{'fieldName': 'Privileged Container', 'booleanOperator': 'OR',
+                              'negate': False, 'values': [{'value': 'true'}]}],
+        }],
+    }
+    policy.update(overrides)
+    return policy
+
+
+def test_stamp_round_trip():
+    policy = make_policy()
+    stamped = stamp_policy(policy)
+    stamp = read_stamp(stamped['description'])
+    assert stamp == policy_stamp(policy)
+    assert len(stamp) == STAMP_LENGTH
+    assert stamped['description'] == f"Do not run privileged containers. [content-hash:{stamp}]"
+    assert strip_stamp(stamped['description']) == policy['description']
+    assert 'content-hash' not in policy['description']
+
+
+def test_restamping_replaces_the_stamp():
+    stamped = stamp_policy(make_policy())
+    restamped = stamp_policy(stamped, '0123456789abcdef')
+    assert restamped['description'].count('[content-hash:') == 1
+    assert read_stamp(restamped['description']) == '0123456789abcdef'
+    assert stamp_policy(stamped) == stamped
+
+
+def test_stamp_on_empty_description():
+    stamped = stamp_policy(make_policy(description=''))
+    assert stamped['description'] == f"[content-hash:{policy_stamp(make_policy(description=''))}]"
+    assert read_stamp(None) is None
+    assert strip_stamp(None) == ''
+
+
+def test_content_hash_ignores_stamp_server_fields_and_empty_values():
+    policy = make_policy()
+    assert content_hash(stamp_policy(policy)) == content_hash(policy)
+    assert content_hash(dict(policy, id='abc', lastUpdated='2026-01-01T00:00:00Z',
+                             policyVersion='1.1', SORTName='x')) == content_hash(policy)
+    without_empty = {key: value for key, value in policy.items() if key != 'exclusions'}
+    assert content_hash(dict(without_empty, notifiers=[], disabled=False)) == content_hash(policy)
+
+
+def test_content_hash_detects_changes():
+    policy = make_policy()
+    assert content_hash(dict(policy, severity='LOW_SEVERITY')) != content_hash(policy)
+    assert content_hash(dict(policy, description='Changed.')) != content_hash(policy)
+
+
+def test_content_hash_on_selected_fields():
+    desired = make_policy()
+    central = dict(copy.deepcopy(desired), id='abc', notifiers=['slack'], criteriaLocked=True)
+    assert content_hash(central, desired.keys()) == content_hash(desired)
+    assert content_hash(central) != content_hash(desired)
+
+
+def test_fingerprint_ignores_names_order_and_cosmetics():
+    policy = make_policy(policySections=[
+        {'sectionName': 'A', 'policyGroups': [
+            {'fieldName': 'Image Tag', 'values': [{'value': 'latest'}, {'value': 'dev'}]},
+            {'fieldName': 'Privileged Container', 'values': [{'value': 'true'}]},
+        ]},
+    ], lifecycleStages=['DEPLOY', 'BUILD'])
+    reordered = make_policy(name='Other name', description='Other words', policySections=[
+        {'sectionName': 'B', 'policyGroups': [
+            {'fieldName': 'Privileged Container', 'booleanOperator': 'OR', 'negate': False,
+             'values': [{'value': 'true'}]},
+            {'fieldName': 'Image Tag', 'values': [{'value': 'dev'}, {'value': 'latest'}]},
+        ]},
+    ], lifecycleStages=['BUILD', 'DEPLOY'])
+    assert policy_fingerprint(policy) == policy_fingerprint(reordered)
+
+
+def test_fingerprint_detects_criteria_and_enforcement_changes():
+    policy = make_policy()
+    negated = copy.deepcopy(policy)
+    negated['policySections'][0]['policyGroups'][0]['negate'] = True
+    assert policy_fingerprint(negated) != policy_fingerprint(policy)
+
+    enforcing = dict(policy, enforcementActions=['FAIL_DEPLOYMENT_CREATE_ENFORCEMENT'])
+    assert policy_fingerprint(enforcing) == policy_fingerprint(policy)
+    assert policy_fingerprint(enforcing, DUPLICATE_FIELDS) != policy_fingerprint(policy, DUPLICATE_FIELDS)
+
+
+def test_fingerprint_ignores_exclusion_names():
+    exclusion = {'name': 'skip kube-system', 'deployment': {'scope': {'namespace': 'kube-system'}}}
+    renamed = dict(exclusion, name='system namespaces')
+    assert policy_fingerprint(make_policy(exclusions=[exclusion])) == \
+        policy_fingerprint(make_policy(exclusions=[renamed]))
+
+
+def test_policy_cves_lists_each_cve_once():
+    policy = make_policy(policySections=[
+        {'policyGroups': [{'fieldName': 'CVE', 'values': [{'value': 'CVE-2024-1'}, {'value': 'CVE-2024-2'}]}]},
+        {'policyGroups': [{'fieldName': 'CVE', 'values': [{'value': 'CVE-2024-1'}, {'value': ''}]},
+                          {'fieldName': 'Image Tag', 'values': [{'value': 'latest'}]}]},
+    ])
+    assert policy_cves(policy) == ['CVE-2024-1', 'CVE-2024-2']
+    assert policy_cves({}) == []
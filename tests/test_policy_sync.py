@@ -0,0 +1,165 @@
+import copy
+
+from policy_hash import policy_stamp, read_stamp, stamp_policy
+from policy_sync import (
+    SYNC_CREATE, SYNC_DELETE, SYNC_UNCHANGED, SYNC_UPDATE, apply_sync, plan_sync
+)
+from rhacs_client import POLICY_CREATED
+
+
+class FakeCentral:
+    """In-memory stand-in for the RHACSClient calls used by the sync engine."""
+
+    def __init__(self, policies):
+        self.policies = {policy['id']: copy.deepcopy(policy) for policy in policies}
+        self.exported = []
+        self.calls = []
+
+    def iter_policies(self, query=None):
+        # Like /v1/policies, the listing carries descriptions but no sections
+        return iter([{key: value for key, value in policy.items() if key != 'policySections'}
+                     for policy in self.policies.values()])
+
+    def export_policies(self, policy_ids):
+        self.exported.extend(policy_ids)
+        return [copy.deepcopy(self.policies[policy_id]) for policy_id in policy_ids]
+
+    def submit_policy(self, policy, timeout=None):
+        self.calls.append(('create', policy['name']))
+        return POLICY_CREATED, 'new-id'
+
+    def update_policy(self, policy_id, policy, timeout=None):
+        self.calls.append(('update', policy['name']))
+        self.policies[policy_id] = dict(policy, id=policy_id)
+        return True
+
+    def delete_policy(self, policy_id):
+        self.calls.append(('delete', self.policies.pop(policy_id)['name']))
+        return True
+
+
+def make_policy(name, severity='HIGH_SEVERITY', **extra):
+    policy = {
+        'name': name,
+        'description': f'{name} description',
+        'severity': severity,
+        'lifecycleStages': ['DEPLOY'],
+        'categories': ['CIS'],
+        'policySections': [{'policyGroups': [
+            {'fieldName': 'Privileged Container', 'values': [{'value': 'true'}]}]}],
+    }
+    policy.update(extra)
+    return policy
+
+
+def deployed(policy, policy_id, **central_fields):
+    """A policy as Central returns it after it was created from ``policy``."""
+    return dict(stamp_policy(policy), id=policy_id, **central_fields)
+
+
+def actions(plan):
+    return {op.name: (op.action, op.reason) for op in plan.operations}
+
+
+def test_missing_policies_are_created_with_a_stamp():
+    desired = make_policy('CIS-1')
+    plan = plan_sync(FakeCentral([]), [desired])
+    assert actions(plan) == {'CIS-1': (SYNC_CREATE, '')}
+    assert read_stamp(plan.creates[0].policy['description']) == policy_stamp(desired)
+
+
+def test_stamped_unchanged_policies_cost_no_export():
+    desired = make_policy('CIS-1')
+    central = FakeCentral([deployed(desired, 'id-1')])
+    plan = plan_sync(central, [desired])
+    assert actions(plan) == {'CIS-1': (SYNC_UNCHANGED, '')}
+    assert central.exported == []
+
+
+def test_changed_policy_is_updated_and_keeps_central_fields():
+    central = FakeCentral([deployed(make_policy('CIS-1'), 'id-1', notifiers=['slack'])])
+    desired = make_policy('CIS-1', severity='LOW_SEVERITY')
+    plan = plan_sync(central, [desired])
+    assert actions(plan) == {'CIS-1': (SYNC_UPDATE, 'content changed')}
+    assert central.exported == ['id-1']
+    body = plan.updates[0].policy
+    assert body['severity'] == 'LOW_SEVERITY'
+    assert body['notifiers'] == ['slack']
+    assert read_stamp(body['description']) == policy_stamp(desired)
+
+
+def test_unstamped_policy_with_same_content_only_gets_a_stamp():
+    desired = make_policy('CIS-1')
+    central = FakeCentral([dict(desired, id='id-1')])
+    plan = plan_sync(central, [desired])
+    assert actions(plan) == {'CIS-1': (SYNC_UPDATE, 'add content hash')}
+    assert central.exported == ['id-1']
+
+
+def test_unstamped_policy_with_different_content_is_updated():
+    central = FakeCentral([dict(make_policy('CIS-1'), id='id-1')])
+    plan = plan_sync(central, [make_policy('CIS-1', severity='LOW_SEVERITY')])
+    assert actions(plan) == {'CIS-1': (SYNC_UPDATE, 'content changed')}
+
+
+def test_full_compare_catches_edits_that_keep_the_stamp():
+    desired = make_policy('CIS-1')
+    central = FakeCentral([dict(deployed(desired, 'id-1'), severity='LOW_SEVERITY')])
+    assert actions(plan_sync(central, [desired])) == {'CIS-1': (SYNC_UNCHANGED, '')}
+    assert actions(plan_sync(central, [desired], full_compare=True)) == {'CIS-1': (SYNC_UPDATE, 'content changed')}
+
+
+def test_default_policies_are_never_modified():
+    central = FakeCentral([dict(make_policy('CIS-1'), id='id-1', isDefault=True)])
+    plan = plan_sync(central, [make_policy('CIS-1', severity='LOW_SEVERITY')], ['CIS-'], prune=True)
+    assert actions(plan) == {'CIS-1': (SYNC_UNCHANGED, 'default policy, not modified')}
+    assert central.exported == []
+
+
+def test_prune_only_deletes_managed_non_default_policies():
+    kept = make_policy('CIS-1')
+    central = FakeCentral([
+        deployed(kept, 'id-1'),
+        deployed(make_policy('CIS-2'), 'id-2'),
+        deployed(make_policy('CIS-3'), 'id-3', isDefault=True),
+        deployed(make_policy('Custom-1'), 'id-4'),
+    ])
+    plan = plan_sync(central, [kept], ['CIS-'], prune=True)
+    assert [(op.name, op.action) for op in plan.changes] == [('CIS-2', SYNC_DELETE)]
+    assert plan_sync(central, [kept], [], prune=True).changes == []
+    assert plan_sync(central, [kept], ['CIS-']).changes == []
+
+
+def test_duplicate_desired_policies_keep_the_first():
+    plan = plan_sync(FakeCentral([]), [make_policy('CIS-1'), make_policy('CIS-1', severity='LOW_SEVERITY')])
+    assert len(plan.creates) == 1
+    assert plan.creates[0].policy['severity'] == 'HIGH_SEVERITY'
+
+
+def test_apply_sync_runs_only_the_changes():
+    unchanged = make_policy('CIS-1')
+    central = FakeCentral([
+        deployed(unchanged, 'id-1'),
+        deployed(make_policy('CIS-2'), 'id-2'),
+        deployed(make_policy('CIS-3'), 'id-3'),
+    ])
+    desired = [unchanged, make_policy('CIS-2', severity='LOW_SEVERITY'), make_policy('CIS-4')]
+    summary = apply_sync(central, plan_sync(central, desired, ['CIS-'], prune=True))
+    assert sorted(central.calls) == [('create', 'CIS-4'), ('delete', 'CIS-3'), ('update', 'CIS-2')]
+    assert (summary.created, summary.updated, summary.deleted, summary.skipped, summary.failed) == (1, 1, 1, 1, 0)
+    assert plan_sync(central, desired[:2], ['CIS-']).changes == []
+
+
+def test_apply_sync_rejects_invalid_creates_without_calling_central():
+    central = FakeCentral([])
+    invalid = make_policy('CIS-1', severity='URGENT')
+    summary = apply_sync(central, plan_sync(central, [invalid]))
+    assert summary.failed == 1
+    assert central.calls == []
+
+
+def test_apply_sync_accepts_unknown_fields_when_allowed():
+    central = FakeCentral([])
+    exported = make_policy('CIS-1', newerField={'enabled': True})
+    assert apply_sync(central, plan_sync(central, [exported])).failed == 1
+    assert apply_sync(central, plan_sync(central, [exported]), allow_unknown_fields=True).created == 1